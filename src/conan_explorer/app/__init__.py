@@ -22,7 +22,12 @@ from .logger import Logger
 from .system import check_for_wayland
 
 if TYPE_CHECKING:
-    from conan_explorer.conan_wrapper import ConanUnifiedApi, ConanWorker
+    from conan_explorer.conan_wrapper import (
+        ConanLocalPkgIndex,
+        ConanRemoteQueryCache,
+        ConanUnifiedApi,
+        ConanWorker,
+    )
 
 ### Global variables ###
 
@@ -31,6 +36,8 @@ active_settings = settings_factory(
 )
 conan_api: "ConanUnifiedApi"  # initialized by load_conan
 conan_worker: "ConanWorker"  # initialized by load_conan
+remote_query_cache: "ConanRemoteQueryCache"  # initialized by load_conan
+local_pkg_index: "ConanLocalPkgIndex"  # initialized by load_conan
 qt_platform = ""
 
 
@@ -67,6 +74,7 @@ def run_application():
     qt_app.exec()
 
     main_window.save_window_state()
+    active_settings.flush()
     # cancel conan worker tasks on exit
     if conan_worker:
         conan_worker.finish_working(10)
@@ -101,11 +109,19 @@ def init_platform():
 
 
 def load_conan(loader: LoaderGui):
-    global conan_api, conan_worker
-    from conan_explorer.conan_wrapper import ConanApiFactory, ConanWorker, conan_version
+    global conan_api, conan_worker, remote_query_cache, local_pkg_index
+    from conan_explorer.conan_wrapper import (
+        ConanApiFactory,
+        ConanLocalPkgIndex,
+        ConanRemoteQueryCache,
+        ConanWorker,
+        conan_version,
+    )
 
     conan_api = ConanApiFactory(init=False, logger=Logger())  # type: ignore
     conan_worker = ConanWorker(conan_api, active_settings)
+    remote_query_cache = ConanRemoteQueryCache(conan_api, active_settings, user_save_path)
+    local_pkg_index = ConanLocalPkgIndex(conan_api)
     loader.loading_string_signal.emit("Initializing Conan " + str(conan_version))
     conan_api.init_api()
 
@@ -6,9 +6,12 @@ import shutil
 import stat
 import subprocess
 import tempfile
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from shutil import rmtree
-from typing import List
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from jinja2 import Template
 
@@ -16,6 +19,12 @@ from conan_explorer import INVALID_PATH, PKG_NAME, asset_path
 from conan_explorer.app.logger import Logger
 
 WIN_EXE_FILE_TYPES = [".cmd", ".com", ".bat", ".ps1", ".exe"]
+FOLDER_SIZE_MAX_WORKERS = 8
+FOLDER_SIZE_CACHE_MAX_ENTRIES = 4096
+
+# folder path -> (mtime of the folder, size in bytes) of already calculated folder sizes
+_folder_size_cache: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+_folder_size_cache_lock = Lock()
 
 
 def str2bool(value: str) -> bool:
@@ -220,13 +229,152 @@ def delete_path(dst: Path):
         Logger().warning(f"Can't delete {str(dst)}: {str(e)}")
 
 
-def get_folder_size_mb(folder_path: Path):
-    if not folder_path.exists():
-        return 0
-    # exists check is needed for soft links under windows
-    return sum(file.stat().st_size for file in folder_path.rglob("*") if file.exists()) / pow(
-        1024, 2
+def write_file_atomically(file_path: Path, content: Union[str, bytes], encoding="utf-8"):
+    """
+    Write a temporary file next to the file and rename it to the file,
+    so the file is never left half written. Keeps the permissions of an existing file.
+    """
+    temp_fd, temp_path_str = tempfile.mkstemp(
+        suffix=".tmp", prefix=file_path.name, dir=file_path.parent
     )
+    try:
+        if isinstance(content, bytes):
+            with os.fdopen(temp_fd, "wb") as temp_file:
+                temp_file.write(content)
+        else:
+            with os.fdopen(temp_fd, "w", encoding=encoding) as temp_file:
+                temp_file.write(content)
+        if file_path.exists():
+            os.chmod(temp_path_str, stat.S_IMODE(file_path.stat().st_mode))
+        os.replace(temp_path_str, file_path)
+    except Exception:
+        delete_path(Path(temp_path_str))
+        raise
+
+
+def get_folder_size(folder_path: Path) -> int:
+    """
+    Size of all files in a folder in bytes. Uses scandir, which already knows the
+    type of an entry, so every file is stat-ed only once. Symlinks are not followed
+    and files with multiple hard links are only counted once.
+    """
+    size = 0
+    seen_inodes: Set[Tuple[int, int]] = set()
+    folders = [str(folder_path)]
+    while folders:
+        try:
+            with os.scandir(folders.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            folders.append(entry.path)
+                            continue
+                        if entry.is_symlink():
+                            continue
+                        entry_stat = entry.stat(follow_symlinks=False)
+                    except OSError:  # vanished or no permission
+                        continue
+                    # inode is only available on Windows with an extra stat - skip it there
+                    if entry_stat.st_nlink > 1:
+                        inode = (entry_stat.st_dev, entry_stat.st_ino)
+                        if inode in seen_inodes:
+                            continue
+                        seen_inodes.add(inode)
+                    size += entry_stat.st_size
+        except OSError:
+            continue
+    return size
+
+
+def get_folder_size_mb(folder_path: Path, cached=True) -> float:
+    """
+    Size of a folder in MB. If cached, the result is reused as long as the modification
+    time of the folder does not change. Changes only in subfolders are not detected -
+    so only use it for package folders, which are not modified after creation.
+    """
+    if not cached:
+        return get_folder_size(folder_path) / pow(1024, 2)
+    try:
+        mtime = folder_path.stat().st_mtime_ns
+    except OSError:
+        return 0
+    folder_key = str(folder_path)
+    with _folder_size_cache_lock:
+        cached_entry = _folder_size_cache.get(folder_key)
+        if cached_entry:
+            _folder_size_cache.move_to_end(folder_key)
+    if cached_entry and cached_entry[0] == mtime:
+        size = cached_entry[1]
+    else:
+        size = get_folder_size(folder_path)
+        with _folder_size_cache_lock:
+            _folder_size_cache[folder_key] = (mtime, size)
+            _folder_size_cache.move_to_end(folder_key)
+            while len(_folder_size_cache) > FOLDER_SIZE_CACHE_MAX_ENTRIES:
+                _folder_size_cache.popitem(last=False)
+    return size / pow(1024, 2)
+
+
+def get_folder_sizes_mb(
+    folder_paths: List[Path],
+    progress_callback: Optional[Callable[[Path, float], None]] = None,
+    max_workers=FOLDER_SIZE_MAX_WORKERS,
+    cached=True,
+) -> Dict[Path, float]:
+    """
+    Calculate the size of multiple folders in MB concurrently.
+    The progress callback is called with the folder and its size for every finished folder.
+    For cached see get_folder_size_mb.
+    """
+    folder_sizes: Dict[Path, float] = {}
+    if not folder_paths:
+        return folder_sizes
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="folder_size") as executor:
+        futures = {
+            executor.submit(get_folder_size_mb, folder_path, cached): folder_path
+            for folder_path in set(folder_paths)
+        }
+        for future in as_completed(futures):
+            folder_path = futures[future]
+            try:
+                folder_sizes[folder_path] = future.result()
+            except Exception as e:
+                Logger().debug(f"Can't get size of {str(folder_path)}: {str(e)}")
+                folder_sizes[folder_path] = 0
+            if progress_callback:
+                progress_callback(folder_path, folder_sizes[folder_path])
+    return folder_sizes
+
+
+def submit_to_daemon_threads(
+    function: Callable[[Any], Any], args: List[Any], max_workers: int, thread_name: str
+) -> List[Future]:
+    """
+    Call the function with every arg concurrently in at most max_workers daemon threads.
+    Returns the futures in the order of the args. Cancel the not needed futures instead
+    of waiting for them. Unlike the threads of a ThreadPoolExecutor, the threads don't keep
+    the interpreter alive at exit, e.g. while a remote does not answer.
+    """
+    futures: List[Future] = [Future() for _ in args]
+    pending = list(zip(futures, args))
+    pending_lock = Lock()
+
+    def work():
+        while True:
+            with pending_lock:
+                if not pending:
+                    return
+                future, arg = pending.pop(0)
+            if not future.set_running_or_notify_cancel():  # cancelled meanwhile
+                continue
+            try:
+                future.set_result(function(arg))
+            except Exception as e:
+                future.set_exception(e)
+
+    for i in range(min(max_workers, len(args))):
+        Thread(target=work, name=f"{thread_name}_{i}", daemon=True).start()
+    return futures
 
 
 def copy_path_with_overwrite(src: Path, dst: Path):
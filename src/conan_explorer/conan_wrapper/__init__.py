@@ -9,6 +9,9 @@ from conan_unified_api import ConanApiFactory, ConanInfoCache, ConanUnifiedApi
 from conan_explorer import Version, conan_version
 
 from .conan_worker import ConanWorker
+from .local_pkg_index import ConanLocalPkgIndex
+from .pkg_path_cache import ConanPkgPathCache
+from .remote_query_cache import ConanRemoteQueryCache
 
 __all__ = [
     "conan_version",
@@ -17,5 +20,8 @@ __all__ = [
     "ConanUnifiedApi",
     "ConanInfoCache",
     "ConanWorker",
+    "ConanLocalPkgIndex",
+    "ConanPkgPathCache",
+    "ConanRemoteQueryCache",
     "ConanUnifiedApi",
 ]
@@ -1,115 +1,316 @@
+import json
 import platform
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Set
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
-from conan_unified_api.types import ConanRef
+from conan_unified_api.types import ConanPkgRef, ConanRef
 
 import conan_explorer.app as app
-from conan_explorer import conan_version
+from conan_explorer import conan_version, user_save_path
 from conan_explorer.app.logger import Logger
+from conan_explorer.app.system import (
+    delete_path,
+    submit_to_daemon_threads,
+    write_file_atomically,
+)
+from conan_explorer.conan_wrapper.local_pkg_index import query_cache_database_v2
+
+# conan ref, paths by type - called for every ref with findings
+CleanupInfoCallback = Callable[[str, Dict[str, str]], None]
+TEMPORARY_REF = "Temporary"  # for findings not belonging to a ref
 
 
 class ConanCleanup:
-    def __init__(self) -> None:
+    """
+    Finds folders in the conan cache, which are not needed anymore: orphaned packages and
+    temporary folders like source, build and download folders.
+    The refs are scanned and the folders are deleted concurrently.
+    The folders, which are still to be deleted, are saved in a journal,
+    so an interrupted cleanup is found again on the next scan.
+    Also finds and repairs refs, whose metadata points to a remote, which does not exist.
+    """
+
+    JOURNAL_FILE_NAME = "cleanup_journal.json"
+    if conan_version.major == 2:
+        JOURNAL_FILE_NAME = "cleanup_journalV2.json"
+    MAX_WORKERS = 8
+    # unfinished builds, which changed more recently, could still be running from the CLI
+    BUILD_MIN_AGE_S = 3600
+    # the journal is written at most this often while deleting and once at the end
+    JOURNAL_WRITE_INTERVAL_S = 1.0
+    # conan ref -> (mtime of metadata file, remote) - shared, as it is created for every use
+    _metadata_remotes: Dict[str, Tuple[int, Optional[str]]] = {}
+    _metadata_lock = Lock()
+
+    def __init__(self, journal_dir: Optional[Path] = None) -> None:
         self.cleanup_refs_info: Dict[str, Dict[str, str]] = {}
         self.invalid_metadata_refs: Set[str] = set()
+        self._journal_file = (journal_dir or user_save_path) / self.JOURNAL_FILE_NAME
+        self._info_lock = Lock()
 
     def gather_invalid_remote_metadata(self) -> List[str]:
-        """Gather all references with invalid remotes"""
-        invalid_refs = []
+        """
+        Gather all references with invalid remotes.
+        The metadata of the refs is read concurrently and only, if it has changed.
+        """
         remotes = app.conan_api.get_remotes(include_disabled=True)
         remote_names = [r.name for r in remotes]
-        for ref in app.conan_api.get_all_local_refs():
-            # This will not updated to the unified API - only V1 relevant
-            ref_cache = app.conan_api._client_cache.package_layout(ref)  # type: ignore
-            ref_remote = ""
+        conan_refs = app.conan_api.get_all_local_refs()
+
+        def is_invalid(conan_ref: ConanRef) -> bool:
             try:
-                ref_remote = ref_cache.load_metadata().recipe.remote  # type: ignore
+                return self._get_metadata_remote(conan_ref) not in remote_names
             except Exception:
-                Logger().debug("Can't load metadata for %s", str(ref), exc_info=True)
-                continue
-            if ref_remote not in remote_names:
-                invalid_refs.append(str(ref))
+                Logger().debug("Can't load metadata for %s", str(conan_ref), exc_info=True)
+                return False
+
+        invalid_refs = []
+        if conan_refs:
+            with ThreadPoolExecutor(self.MAX_WORKERS, "conan_metadata") as executor:
+                invalid = executor.map(is_invalid, conan_refs)
+                invalid_refs = [str(ref) for ref, inv in zip(conan_refs, invalid) if inv]
+        with self._metadata_lock:  # forget removed refs
+            for ref in set(self._metadata_remotes) - {str(ref) for ref in conan_refs}:
+                self._metadata_remotes.pop(ref)
         self.invalid_metadata_refs = set(invalid_refs)
         return invalid_refs
 
-    def repair_invalid_remote_metadata(self, invalid_ref):
-        """Repair all references with invalid remotes"""
+    def _get_metadata_remote(self, conan_ref: ConanRef) -> Optional[str]:
+        """Remote of the recipe from the metadata, which is cached by its modification time"""
+        # This will not updated to the unified API - only V1 relevant
+        ref_cache = app.conan_api._client_cache.package_layout(conan_ref)  # type: ignore
+        try:
+            mtime_ns = (Path(ref_cache.base_folder()) / "metadata.json").stat().st_mtime_ns
+        except Exception:
+            mtime_ns = None  # can't be cached
+        with self._metadata_lock:
+            cached = self._metadata_remotes.get(str(conan_ref))
+        if mtime_ns is not None and cached and cached[0] == mtime_ns:
+            return cached[1]
+        ref_remote = ref_cache.load_metadata().recipe.remote  # type: ignore
+        if mtime_ns is not None:
+            with self._metadata_lock:
+                self._metadata_remotes[str(conan_ref)] = (mtime_ns, ref_remote)
+        return ref_remote
+
+    def repair_invalid_remote_metadata(self, invalid_ref) -> Optional[str]:
+        """
+        Repair all references with invalid remotes.
+        All remotes are probed concurrently - returns the first one with the ref.
+        """
+
         # calling inspect with a correct remote repairs the metadata
-        for remote in app.conan_api.get_remotes():
+        def inspect(remote_name: str) -> str:
+            app.conan_api._conan.inspect(invalid_ref, None, remote_name)  # type: ignore
+            return remote_name
+
+        remotes = app.conan_api.get_remotes()
+        if not remotes:
+            return None
+        futures = submit_to_daemon_threads(
+            inspect, [remote.name for remote in remotes], self.MAX_WORKERS, "conan_repair"
+        )
+        try:
+            for future in as_completed(futures):
+                try:
+                    return future.result()
+                except Exception:
+                    continue
+            return None
+        finally:  # don't wait for slower remotes
+            for future in futures:
+                future.cancel()
+
+    def get_cleanup_cache_info(
+        self, found_callback: Optional[CleanupInfoCallback] = None
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Get a list of orphaned and temporary folders by ref.
+        The found folders of every ref are passed to the callback as soon as they are found.
+        It is called from the scanning threads.
+        """
+        self.cleanup_refs_info = {}
+        editables = [str(ref) for ref in app.conan_api.get_editable_references()]
+        conan_refs = [
+            ref for ref in app.conan_api.get_all_local_refs() if str(ref) not in editables
+        ]
+        get_ref_cleanup_info = self.get_ref_cleanup_info
+        if conan_version.major == 2:
+            get_ref_cleanup_info = self.get_ref_cleanup_info_v2
+
+        def scan_ref(conan_ref: ConanRef):
             try:
-                app.conan_api._conan.inspect(invalid_ref, None, remote.name)  # type: ignore
-                break
-            except Exception:
-                continue
+                self._add_info(str(conan_ref), get_ref_cleanup_info(conan_ref), found_callback)
+            except Exception as e:
+                Logger().debug("Cannot check %s: %s", str(conan_ref), str(e), exc_info=True)
 
-    def get_cleanup_cache_info(self) -> Dict[str, Dict[str, str]]:
-        """Get a list of orphaned short path and cache folders"""
-        if platform.system() != "Windows" or conan_version.major == 2:
-            return {}  # TODO: Update for linux
-        from conan_unified_api.types import CONAN_LINK
+        if conan_refs:
+            with ThreadPoolExecutor(self.MAX_WORKERS, "conan_cleanup") as executor:
+                futures = [executor.submit(scan_ref, conan_ref) for conan_ref in conan_refs]
+                for future in as_completed(futures):
+                    future.result()
+        if conan_version.major == 2:
+            self._add_info(TEMPORARY_REF, self.get_temporary_folders_v2(), found_callback)
+        self.find_orphaned_packages(found_callback)
+        self.find_interrupted_cleanup(found_callback)
+        self.cleanup_refs_info = dict(sorted(self.cleanup_refs_info.items()))
+        return self.cleanup_refs_info
 
-        editables = app.conan_api.get_editable_references()
+    def _add_info(
+        self,
+        conan_ref: str,
+        ref_info: Dict[str, str],
+        found_callback: Optional[CleanupInfoCallback] = None,
+    ):
+        if not ref_info:
+            return
+        with self._info_lock:
+            current_ref_info = self.cleanup_refs_info.setdefault(conan_ref, {})
+            new_ref_info = {
+                path_type: path
+                for path_type, path in ref_info.items()
+                if path not in current_ref_info.values()
+            }
+            current_ref_info.update(new_ref_info)
+        if new_ref_info and found_callback:
+            found_callback(conan_ref, new_ref_info)
 
-        for conan_ref in app.conan_api.get_all_local_refs():
-            if conan_ref in editables:
-                continue
-            current_ref_info = {}
+    def get_ref_cleanup_info(self, conan_ref: ConanRef) -> Dict[str, str]:
+        """Orphaned packages and temporary folders of a ref for Conan V1"""
+        from conan_unified_api.types import CONAN_LINK
+
+        current_ref_info = {}
 
-            # this will not updated to the unified API - only V1 relevant
-            ref_cache = app.conan_api._client_cache.package_layout(conan_ref)  # type: ignore
+        # this will not updated to the unified API - only V1 relevant
+        ref_cache = app.conan_api._client_cache.package_layout(conan_ref)  # type: ignore
 
-            # get orphaned refs
-            package_ids = []
+        # get orphaned refs
+        package_ids = []
+        try:
+            package_ids = ref_cache.package_ids()
+        except Exception:
             try:
-                package_ids = ref_cache.package_ids()
+                # old API of Conan
+                package_ids = ref_cache.packages_ids()  # type: ignore
+            except Exception as e:
+                Logger().debug(
+                    "Cannot check pkg id for %s: %s", str(conan_ref), str(e), exc_info=True
+                )
+
+        for pkg_id in package_ids:
+            short_path_dir = app.conan_api.get_package_folder(conan_ref, pkg_id)
+            if not short_path_dir.exists():
+                current_ref_info[str(pkg_id)] = str(Path(ref_cache.packages()) / pkg_id)
+
+        # get temporary dirs
+        source_path = Path(ref_cache.source())
+        if source_path.exists():
+            # check for .conan_link
+            if (source_path / CONAN_LINK).is_file():
+                path = (source_path / CONAN_LINK).read_text()
+                current_ref_info["source"] = path.strip()
+            else:
+                current_ref_info["source"] = ref_cache.source()
+
+        if Path(ref_cache.builds()).exists():
+            current_ref_info["build"] = ref_cache.builds()
+
+        scm_source_path = Path(ref_cache.scm_sources())
+        if scm_source_path.exists():
+            # check for .conan_link
+            if (scm_source_path / CONAN_LINK).is_file():
+                path = (scm_source_path / CONAN_LINK).read_text()
+                current_ref_info["scm_source"] = path.strip()
+            else:
+                current_ref_info["scm_source"] = ref_cache.scm_sources()
+        download_folder = Path(ref_cache.base_folder()) / "dl"
+        if download_folder.exists():
+            current_ref_info["download"] = str(download_folder)
+        return current_ref_info
+
+    def get_ref_cleanup_info_v2(self, conan_ref: ConanRef) -> Dict[str, str]:
+        """
+        Temporary folders of the latest revision of a ref for Conan V2 -
+        the same folders as "conan cache clean" removes.
+        """
+        current_ref_info = {}
+        # not in the unified API - only V2 relevant
+        cache_api = app.conan_api._conan.cache  # type: ignore
+        try:  # raises, if it does not exist
+            current_ref_info["source"] = cache_api.source_path(ConanRef.loads(str(conan_ref)))
+        except Exception:
+            pass
+        # download folder is next to the export folder
+        download_folder = app.conan_api.get_export_folder(conan_ref).parent / "d"
+        if download_folder.exists():
+            current_ref_info["download"] = str(download_folder)
+        for pkg in app.conan_api.get_local_pkgs_from_ref(conan_ref):
+            pkg_id = pkg.get("id", "")
+            try:  # raises, if it does not exist
+                pkg_ref = ConanPkgRef(ConanRef.loads(str(conan_ref)), pkg_id)
+                current_ref_info[f"build {pkg_id}"] = cache_api.build_path(pkg_ref)
             except Exception:
-                try:
-                    # old API of Conan
-                    package_ids = ref_cache.packages_ids()  # type: ignore
-                except Exception as e:
-                    Logger().debug(
-                        "Cannot check pkg id for %s: %s", str(conan_ref), str(e), exc_info=True
-                    )
+                pass
+            pkg_folder = app.conan_api.get_package_folder(conan_ref, pkg_id)
+            download_folder = pkg_folder.parent / "d"
+            if pkg_folder.exists() and download_folder.exists():
+                current_ref_info[f"download {pkg_id}"] = str(download_folder)
+        return current_ref_info
 
-            for pkg_id in package_ids:
-                short_path_dir = app.conan_api.get_package_folder(conan_ref, pkg_id)
-                if not short_path_dir.exists():
-                    current_ref_info[str(pkg_id)] = str(Path(ref_cache.packages()) / pkg_id)
-
-            # get temporary dirs
-            source_path = Path(ref_cache.source())
-            if source_path.exists():
-                # check for .conan_link
-                if (source_path / CONAN_LINK).is_file():
-                    path = (source_path / CONAN_LINK).read_text()
-                    current_ref_info["source"] = path.strip()
-                else:
-                    current_ref_info["source"] = ref_cache.source()
-
-            if Path(ref_cache.builds()).exists():
-                current_ref_info["build"] = ref_cache.builds()
-
-            scm_source_path = Path(ref_cache.scm_sources())
-            if scm_source_path.exists():
-                # check for .conan_link
-                if (scm_source_path / CONAN_LINK).is_file():
-                    path = (scm_source_path / CONAN_LINK).read_text()
-                    current_ref_info["scm_source"] = path.strip()
-                else:
-                    current_ref_info["scm_source"] = ref_cache.scm_sources()
-            download_folder = Path(ref_cache.base_folder()) / "dl"
-            if download_folder.exists():
-                current_ref_info["download"] = str(download_folder)
-
-            if current_ref_info:
-                self.cleanup_refs_info[str(conan_ref)] = current_ref_info
-
-        self.find_orphaned_packages()
-        self.cleanup_refs_info = dict(sorted(self.cleanup_refs_info.items()))
-        return self.cleanup_refs_info
+    def get_temporary_folders_v2(self) -> Dict[str, str]:
+        """
+        Temporary folder of the cache and build folders of failed builds for Conan V2.
+        Package layouts, which are known to the cache database are never touched and
+        of the others only the build folder is removed - the layout itself is kept.
+        """
+        temp_info = {}
+        storage_path = app.conan_api.get_storage_path()
+        temp_folder = storage_path / "t"
+        if temp_folder.is_dir() and any(temp_folder.iterdir()):
+            temp_info["temp"] = str(temp_folder)
+        builds_folder = storage_path / "b"
+        if not builds_folder.is_dir():
+            return temp_info
+        known_layouts = self._get_known_package_layouts_v2(storage_path)
+        if known_layouts is None:  # without the database nothing is safe to remove
+            return temp_info
+        for layout_folder in builds_folder.iterdir():
+            build_folder = layout_folder / "b"
+            if f"b/{layout_folder.name}" in known_layouts or not build_folder.is_dir():
+                continue
+            pkg_folder = layout_folder / "p"
+            # finished build - has a package, which will be registered soon
+            if (pkg_folder / "conanmanifest.txt").exists() and (
+                pkg_folder / "conaninfo.txt"
+            ).exists():
+                continue
+            if self._is_recently_changed(layout_folder):
+                continue
+            temp_info[f"build {layout_folder.name}"] = str(build_folder)
+        return temp_info
+
+    @staticmethod
+    def _get_known_package_layouts_v2(storage_path: Path) -> Optional[Set[str]]:
+        """Paths of all package layouts in the cache database, relative to the storage"""
+        rows = query_cache_database_v2(storage_path, "SELECT path FROM packages")
+        if rows is None:
+            return None
+        return {str(row[0]).replace("\\", "/") for row in rows}
+
+    def _is_recently_changed(self, layout_folder: Path) -> bool:
+        min_mtime = time.time() - self.BUILD_MIN_AGE_S
+        try:
+            return any(
+                path.stat().st_mtime > min_mtime
+                for path in [layout_folder, *layout_folder.iterdir()]
+            )
+        except OSError:  # removed meanwhile
+            return True
 
-    def find_orphaned_packages(self):
+    def find_orphaned_packages(self, found_callback: Optional[CleanupInfoCallback] = None):
         """Reverse search for orphaned packages on windows short paths"""
         if platform.system() != "Windows" or conan_version.major == 2:
             return {}
@@ -143,6 +344,76 @@ class ConanCleanup:
 
             except Exception:
                 Logger().error(f"Can't read {CONAN_REAL_PATH} in {str(short_path)}")
-            if not self.cleanup_refs_info.get(conan_ref):
-                self.cleanup_refs_info[conan_ref] = {}
-            self.cleanup_refs_info[conan_ref][info_type] = str(short_path)
+            self._add_info(conan_ref, {info_type: str(short_path)}, found_callback)
+
+    def find_interrupted_cleanup(self, found_callback: Optional[CleanupInfoCallback] = None):
+        """Add the still existing folders of an interrupted cleanup from the journal"""
+        for conan_ref, paths in self._read_journal().items():
+            self._add_info(
+                conan_ref,
+                {path_type: path for path_type, path in paths.items() if Path(path).exists()},
+                found_callback,
+            )
+
+    def delete_cleanup_paths(
+        self,
+        cleanup_refs_info: Dict[str, Dict[str, str]],
+        progress_callback: Optional[Callable[[str], None]] = None,
+    ) -> int:
+        """
+        Delete all folders concurrently. The not yet deleted folders are kept in the journal,
+        until all are deleted. Returns the number of deleted folders.
+        """
+        remaining = {conan_ref: dict(paths) for conan_ref, paths in cleanup_refs_info.items()}
+        total = sum(len(paths) for paths in remaining.values())
+        deleted = 0
+        journal_lock = Lock()
+        self._write_journal(remaining)
+        last_journal_write = time.monotonic()
+
+        def delete_folder(conan_ref: str, path_type: str, path: str):
+            nonlocal deleted, last_journal_write
+            delete_path(Path(path))
+            with journal_lock:
+                if Path(path).exists():  # could not be deleted - is logged already
+                    return
+                remaining[conan_ref].pop(path_type, None)
+                deleted += 1
+                # already deleted folders in an outdated journal are skipped, when it is read
+                if time.monotonic() - last_journal_write >= self.JOURNAL_WRITE_INTERVAL_S:
+                    self._write_journal(remaining)
+                    last_journal_write = time.monotonic()
+                if progress_callback:
+                    progress_callback(f"Deleted {deleted}/{total} folders\n{path}")
+
+        with ThreadPoolExecutor(self.MAX_WORKERS, "conan_cleanup_delete") as executor:
+            futures = [
+                executor.submit(delete_folder, conan_ref, path_type, path)
+                for conan_ref, paths in cleanup_refs_info.items()
+                for path_type, path in paths.items()
+            ]
+            for future in as_completed(futures):
+                future.result()
+        if deleted == total:
+            delete_path(self._journal_file)
+        else:
+            self._write_journal(remaining)
+        return deleted
+
+    def _read_journal(self) -> Dict[str, Dict[str, str]]:
+        if not self._journal_file.exists():
+            return {}
+        try:
+            return json.loads(self._journal_file.read_text()).get("paths", {})
+        except Exception:  # possibly corrupt - it will be overwritten by the next cleanup
+            Logger().debug("Can't read cleanup journal.")
+            return {}
+
+    def _write_journal(self, refs_info: Dict[str, Dict[str, str]]):
+        try:
+            write_file_atomically(
+                self._journal_file,
+                json.dumps({"paths": {ref: paths for ref, paths in refs_info.items() if paths}})
+            )
+        except Exception as e:
+            Logger().debug(f"Can't write cleanup journal: {str(e)}")
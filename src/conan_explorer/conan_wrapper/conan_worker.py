@@ -1,10 +1,26 @@
-from queue import Queue
-from threading import Thread
+import heapq
+import time
+from enum import Enum
+from itertools import count
+from queue import Empty, PriorityQueue
+from threading import Event, Lock, Thread, Timer, current_thread
 
 # this allows to use forward declarations to avoid circular imports
-from typing import TYPE_CHECKING, Any, List, Optional, Protocol, Tuple, TypedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+    TypedDict,
+)
 
-from conan_explorer.settings import SettingsInterface
+from conan_explorer.settings import CONAN_WORKER_THREADS, SettingsInterface
 
 if TYPE_CHECKING:
     from ..conan_wrapper import ConanUnifiedApi
@@ -29,111 +45,537 @@ class ConanWorkerResultCallback(Protocol):
     def __call__(self, conan_ref: str, pkg_id: str) -> Any: ...
 
 
+ConanWorkerElementKey = Tuple[str, Tuple, Tuple, str, bool, bool]
+# priority, sequence nr., task
+ConanWorkerQueueEntry = Tuple[int, int, "ConanWorkerTask"]
+
+
+class ConanWorkerTaskStage(Enum):
+    queued = 0
+    resolve = 1  # find the package to install
+    install = 2  # download and unpack the package
+    finished = 3
+    cancelled = 4
+    timed_out = 5
+
+
+class ConanWorkerTask:
+    """
+    Future-like handle of a queued request for one unique ConanWorkerElement.
+    Identical requests are coalesced into one task, which notifies every registered callback.
+    A task can be cancelled, has an optional deadline and reports its progress stages.
+    """
+
+    def __init__(
+        self,
+        key: ConanWorkerElementKey,
+        conan_element: ConanWorkerElement,
+        priority: int,
+        timeout_s: Optional[float] = None,
+    ):
+        self.key = key
+        self.conan_element = conan_element
+        self.priority = priority  # lower value is worked on first
+        self.queue_seq = 0  # sequence nr. of the valid queue entry, others are outdated
+        self.callbacks: List[ConanWorkerResultCallback] = []
+        self.stage = ConanWorkerTaskStage.queued
+        self.pkg_id = ""  # result
+        self.deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self._progress_callbacks: List[Callable[["ConanWorkerTask"], Any]] = []
+        self._stage_lock = Lock()
+        self._done_event = Event()
+
+    @property
+    def ref_pkg_id(self) -> str:
+        return self.conan_element.get("ref_pkg_id", "")
+
+    @property
+    def started(self) -> bool:
+        return self.start_time is not None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.stage == ConanWorkerTaskStage.cancelled
+
+    @property
+    def timed_out(self) -> bool:
+        return self.stage == ConanWorkerTaskStage.timed_out
+
+    @property
+    def duration_s(self) -> float:
+        """Time since the start of the work on the task until it is done"""
+        if self.start_time is None:
+            return 0.0
+        end_time = self.end_time if self.end_time is not None else time.monotonic()
+        return end_time - self.start_time
+
+    def done(self) -> bool:
+        return self._done_event.is_set()
+
+    def wait(self, timeout_s: Optional[float] = None) -> bool:
+        """Block until the task is done. Returns False on timeout."""
+        return self._done_event.wait(timeout_s)
+
+    def is_expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    def cancel(self) -> bool:
+        """
+        Cancel the task. A running conan command can't be interrupted,
+        but the next stage is not started, its result will be discarded
+        and no callback will be notified. Returns False, if the task was already done.
+        """
+        return self._finish(ConanWorkerTaskStage.cancelled)
+
+    def add_callback(self, info_callback: Optional[ConanWorkerResultCallback]):
+        if info_callback and info_callback not in self.callbacks:
+            self.callbacks.append(info_callback)
+
+    def add_progress_callback(self, progress_callback: Callable[["ConanWorkerTask"], Any]):
+        """The callback is called with the task on every stage change"""
+        self._progress_callbacks.append(progress_callback)
+
+    def _start(self) -> bool:
+        """Mark as started. Returns False, if the task is already started or done."""
+        with self._stage_lock:
+            if self.start_time is not None or self.done():
+                return False
+            self.start_time = time.monotonic()
+        return True
+
+    def _set_stage(self, stage: ConanWorkerTaskStage):
+        with self._stage_lock:
+            if self.done():
+                return
+            self.stage = stage
+        self._notify_progress()
+
+    def _finish(self, stage: ConanWorkerTaskStage, pkg_id="") -> bool:
+        with self._stage_lock:
+            if self.done():
+                return False
+            self.stage = stage
+            self.pkg_id = pkg_id
+            self.end_time = time.monotonic()
+            self._done_event.set()
+        self._notify_progress()
+        return True
+
+    def _notify_progress(self):
+        for progress_callback in self._progress_callbacks:
+            try:
+                progress_callback(self)
+            except Exception as e:
+                Logger().error(str(e))
+
+
 class ConanWorker:
     """
-    Sequential worker with a queue to execute conan install/version alternatives commands
+    Worker pool with a priority queue to execute conan install/version alternatives commands.
+    Elements with the same priority are worked on in FIFO order.
+    Elements of the same reference are never worked on concurrently - they are set aside
+    without occupying a worker, until the running element of the reference is finished.
     """
 
-    def __init__(self, conan_api: "ConanUnifiedApi", settings: SettingsInterface):
+    DEFAULT_MAX_WORKERS = 4
+    FINISH_TIMEOUT_S = 10  # default for finish_working
+    # lower value means higher priority
+    PRIORITY_HIGH = 0
+    PRIORITY_DEFAULT = 10
+    PRIORITY_LOW = 20
+
+    def __init__(
+        self,
+        conan_api: "ConanUnifiedApi",
+        settings: SettingsInterface,
+        max_workers: Optional[int] = None,
+    ):
         self._conan_api = conan_api
-        self._conan_install_queue: Queue[
-            Tuple[ConanWorkerElement, Optional[ConanWorkerResultCallback]]
-        ] = Queue(maxsize=0)
-        self._install_worker: Optional[Thread] = None
+        self._conan_install_queue: PriorityQueue[ConanWorkerQueueEntry] = PriorityQueue(
+            maxsize=0
+        )
+        self._queue_seq = count()  # tie breaker for FIFO order in the same priority
+        # queued or running tasks by element key - used to coalesce identical requests
+        self._pending_tasks: Dict[ConanWorkerElementKey, ConanWorkerTask] = {}
+        self._pending_tasks_lock = Lock()
+        self._install_workers: List[Thread] = []
         self._shutdown_requested = False  # internal flag to cancel worker on shutdown
+        # workers of a previous generation exit after their current task
+        self._worker_generation = 0
         self._settings = settings
+        # the number of threads is also the limit of concurrently running installs
+        self._max_workers = max(1, max_workers or self._get_max_workers_from_settings())
+        self._workers_lock = Lock()
+        # references with a running task and the set aside queue entries of them
+        self._running_refs: Set[str] = set()
+        self._deferred_entries: Dict[str, List[ConanWorkerQueueEntry]] = {}
+        self._running_refs_lock = Lock()
+
+    def _get_max_workers_from_settings(self) -> int:
+        try:
+            return self._settings.get_int(CONAN_WORKER_THREADS)
+        except Exception:
+            return self.DEFAULT_MAX_WORKERS
+
+    @staticmethod
+    def get_element_key(conan_element: ConanWorkerElement) -> ConanWorkerElementKey:
+        """Hashable key of an element. Elements with the same key have the same result."""
+        return (
+            conan_element.get("ref_pkg_id", ""),
+            tuple(sorted(conan_element.get("options", {}).items())),
+            tuple(sorted(conan_element.get("settings", {}).items())),
+            conan_element.get("profile", ""),
+            conan_element.get("update", False),
+            conan_element.get("auto_install", True),
+        )
 
     def update_all_info(
         self,
         conan_elements: List[ConanWorkerElement],
         info_callback: Optional[ConanWorkerResultCallback],
-    ):
+        priority: int = PRIORITY_DEFAULT,
+        timeout_s: Optional[float] = None,
+    ) -> List[ConanWorkerTask]:
         """
         Starts the worker for all given elements. Should be called at start.
         info_signal is used to notify the caller that the worker has finished
         for a given element. To be able to identify, which package has been finished
         the signal will send this info: tuple(conan_ref, pkg_id)
+        With a timeout, tasks are timed out after it has passed - also while running.
+        The callback is not notified for timed out tasks.
         """
         # fill up queue
+        tasks = []
         for worker_element in conan_elements:
             if USE_CONAN_WORKER_FOR_LOCAL_PKG_PATH_AND_INSTALL:
-                self._conan_install_queue.put((worker_element, info_callback))
+                tasks.append(self._enqueue(worker_element, info_callback, priority, timeout_s))
 
-        # start getting versions info in a separate thread in a bundled way
+        # start getting versions info in separate threads in a bundled way
         # to get better performance
-        self._start_install_worker()
+        self._start_install_workers()
+        return tasks
 
     def put_ref_in_install_queue(
         self,
         conan_element: ConanWorkerElement,
         info_callback: Optional[ConanWorkerResultCallback],
+        priority: int = PRIORITY_DEFAULT,
+        timeout_s: Optional[float] = None,
+    ) -> ConanWorkerTask:
+        """
+        Add a new entry to work on. If an identical entry is already queued or running,
+        the callback is registered on it instead. Returns the task of the entry.
+        """
+        task = self._enqueue(conan_element, info_callback, priority, timeout_s)
+        self._start_install_workers()
+        return task
+
+    def cancel_request(
+        self, task: ConanWorkerTask, info_callback: Optional[ConanWorkerResultCallback]
     ):
-        """Add a new entry to work on"""
-        self._conan_install_queue.put((conan_element, info_callback))
-        self._start_install_worker()
-
-    def _start_install_worker(self):
-        """Start worker, if it is not already started (can be called multiple times)"""
-        if not self._install_worker or not self._install_worker.is_alive():
-            self._install_worker = Thread(
-                target=self._work_on_conan_install_queue, name="ConanInstallWorker", daemon=True
+        """
+        Withdraw the request of a caller, e.g. when it was superseded by a newer one.
+        The task is cancelled, if no other caller waits for it and it has not started yet.
+        """
+        with self._pending_tasks_lock:
+            if info_callback in task.callbacks:
+                task.callbacks.remove(info_callback)
+            if task.callbacks or task.started:
+                return
+            task.cancel()
+            self._remove_pending_task(task)
+        Logger().debug("Cancelled request for " + task.ref_pkg_id)
+
+    def get_tasks(self, ref_pkg_id: str) -> List[ConanWorkerTask]:
+        """Get all queued or running tasks of a ref"""
+        with self._pending_tasks_lock:
+            return [
+                task for task in self._pending_tasks.values() if task.ref_pkg_id == ref_pkg_id
+            ]
+
+    def _remove_pending_task(self, task: ConanWorkerTask):
+        """Pending tasks lock must be held"""
+        if self._pending_tasks.get(task.key) is task:
+            self._pending_tasks.pop(task.key)
+
+    def set_priority(self, ref_pkg_ids: Iterable[str], priority: int):
+        """Change the priority of all queued elements with the given refs, e.g. visible ones"""
+        ref_pkg_ids = set(ref_pkg_ids)
+        with self._pending_tasks_lock:
+            for task in self._pending_tasks.values():
+                if task.ref_pkg_id not in ref_pkg_ids:
+                    continue
+                if task.started or task.priority == priority:
+                    continue
+                self._put_in_queue(task, priority)
+
+    def _put_in_queue(self, task: ConanWorkerTask, priority: int):
+        """
+        Queue a task with a priority. An entry of a requeued task stays in the queue,
+        but is outdated and will be skipped. Pending tasks lock must be held.
+        """
+        task.priority = priority
+        task.queue_seq = next(self._queue_seq)
+        self._conan_install_queue.put((priority, task.queue_seq, task))
+
+    def _enqueue(
+        self,
+        conan_element: ConanWorkerElement,
+        info_callback: Optional[ConanWorkerResultCallback],
+        priority: int,
+        timeout_s: Optional[float],
+    ) -> ConanWorkerTask:
+        """Put an element into the queue or coalesce it with an identical pending one"""
+        key = self.get_element_key(conan_element)
+        with self._pending_tasks_lock:
+            task = self._pending_tasks.get(key)
+            if task is None or task.cancelled or task.timed_out:
+                task = ConanWorkerTask(key, conan_element, priority, timeout_s)
+                self._pending_tasks[key] = task
+                self._put_in_queue(task, priority)
+            elif priority < task.priority and not task.started:
+                self._put_in_queue(task, priority)
+            task.add_callback(info_callback)
+        return task
+
+    def _start_install_workers(self):
+        """
+        Start workers up to the configured limit, if they are not already started
+        (can be called multiple times)
+        """
+        with self._workers_lock:
+            needed_workers = min(
+                self._max_workers - len(self._install_workers),
+                self._conan_install_queue.qsize(),
             )
-            self._install_worker.start()
+            for _ in range(needed_workers):
+                worker = Thread(
+                    target=self._work_on_conan_install_queue,
+                    args=(self._worker_generation,),
+                    name="ConanInstallWorker",
+                    daemon=True,
+                )
+                self._install_workers.append(worker)
+                worker.start()
+
+    def _acquire_ref(self, entry: ConanWorkerQueueEntry) -> bool:
+        """
+        Reserve the reference of a queue entry for this worker. If another task of it
+        is running, the entry is set aside and False is returned.
+        """
+        conan_ref = entry[2].ref_pkg_id.split(":")[0]
+        with self._running_refs_lock:
+            if conan_ref in self._running_refs:
+                heapq.heappush(self._deferred_entries.setdefault(conan_ref, []), entry)
+                return False
+            self._running_refs.add(conan_ref)
+        return True
 
-    def _work_on_conan_install_queue(self):
+    def _release_ref(self, task: ConanWorkerTask):
+        """
+        Release the reference of a task and queue the next set aside entry of it.
+        Outdated entries and entries of cancelled tasks are dropped.
+        """
+        conan_ref = task.ref_pkg_id.split(":")[0]
+        entry = None
+        with self._running_refs_lock:
+            self._running_refs.discard(conan_ref)
+            deferred_entries = self._deferred_entries.get(conan_ref, [])
+            while deferred_entries and entry is None:
+                entry = heapq.heappop(deferred_entries)
+                if entry[1] != entry[2].queue_seq or entry[2].done():
+                    entry = None
+            if not deferred_entries:
+                self._deferred_entries.pop(conan_ref, None)
+        if entry:
+            self._conan_install_queue.put(entry)
+
+    def _work_on_conan_install_queue(self, generation: int):
         """Call conan install from queue"""
-        info_callback = None
-        pkg_id = ""
-        while not self._shutdown_requested and not self._conan_install_queue.empty():
-            worker_element, info_callback = self._conan_install_queue.get()
-            ref_pkg_id = worker_element.get("ref_pkg_id", "")
-            conan_options = worker_element.get("options", {})
-            conan_settings = worker_element.get("settings", {})
-            conan_profile = worker_element.get("profile", "")
-            pkg_id = ""
-            update = worker_element.get("update", False)
-            auto_install = worker_element.get("auto_install", True)
-            # package path will be updated in conan cache
+        while not self._shutdown_requested and generation == self._worker_generation:
             try:
-                conan_ref: ConanRef
-                if ":" in ref_pkg_id:  # pkg ref
-                    pkg_ref: ConanPkgRef = ConanPkgRef.loads(ref_pkg_id)  # type: ignore
-                    conan_ref = pkg_ref.ref  # type: ignore
-                    package = self._conan_api.get_remote_pkg_from_id(pkg_ref)
-                    pkg_id, _ = self._conan_api.install_package(pkg_ref.ref, package, update)
-                else:
-                    conan_ref = ConanRef.loads(ref_pkg_id)  # type: ignore
-
-                    if auto_install:
-                        pkg_id, _ = self._conan_api.get_path_with_auto_install(
-                            conan_ref, conan_options, update
-                        )
-                    else:
-                        pkg_id, _ = self._conan_api.install_reference(
-                            conan_ref, conan_settings, conan_options, conan_profile, update
-                        )
-            except Exception:
-                pass
-            Logger().debug("Finish working on " + ref_pkg_id)
+                entry = self._conan_install_queue.get_nowait()
+            except Empty:
+                # deregister under lock, so a concurrent put always finds a running worker
+                with self._workers_lock:
+                    if not self._conan_install_queue.empty():
+                        continue
+                    if current_thread() in self._install_workers:
+                        self._install_workers.remove(current_thread())
+                return
+            _, queue_seq, task = entry
+            # skip outdated entries of requeued tasks and cancelled tasks
+            if queue_seq != task.queue_seq or task.done() or not self._acquire_ref(entry):
+                self._conan_install_queue.task_done()
+                continue
+            if not task._start():  # cancelled meanwhile
+                self._release_ref(task)
+                self._conan_install_queue.task_done()
+                continue
+            self._run_task(task)
+            self._release_ref(task)
+            self._on_task_done(task)
             try:
                 self._conan_install_queue.task_done()
             except ValueError:
                 pass  # don't care about calling too many times
-            if USE_CONAN_WORKER_FOR_LOCAL_PKG_PATH_AND_INSTALL:
-                if info_callback and not self._shutdown_requested:
-                    try:
-                        info_callback(self._conan_api.generate_canonical_ref(conan_ref), pkg_id)
-                    except Exception as e:
-                        Logger().error(str(e))
+            with self._workers_lock:
+                if current_thread() not in self._install_workers:
+                    return  # was replaced, because its task timed out
 
-    def finish_working(self, timeout_s: Optional[float] = None):
-        """Cancel, if worker is still not finished"""
-        self._shutdown_requested = True
+    def _run_task(self, task: ConanWorkerTask):
+        """
+        Run the conan commands of a task on this worker, so that the worker
+        is occupied until they return. Cancellation, timeout and shutdown
+        are checked before each stage. A running conan command can't be interrupted,
+        so a task with a deadline is timed out by a watchdog while it runs.
+        """
+        watchdog = None
+        if task.deadline is not None and task.deadline > time.monotonic():
+            watchdog = Timer(
+                task.deadline - time.monotonic(),
+                self._on_running_task_expired,
+                (task, current_thread()),
+            )
+            watchdog.daemon = True
+            watchdog.start()
+        try:
+            pkg_id = self._work_on_element(task)
+        finally:
+            if watchdog:
+                watchdog.cancel()
+        task._finish(ConanWorkerTaskStage.finished, pkg_id)
+
+    def _on_running_task_expired(self, task: ConanWorkerTask, worker: Thread):
+        """
+        Time out the task and replace its worker, so that the queue does not wait for
+        the hanging conan command. The worker exits, when the command returns.
+        """
+        if not self._time_out(task):
+            return
+        with self._workers_lock:
+            if worker in self._install_workers:
+                self._install_workers.remove(worker)
+        self._start_install_workers()
+
+    @staticmethod
+    def _time_out(task: ConanWorkerTask) -> bool:
+        if not task._finish(ConanWorkerTaskStage.timed_out):
+            return False
+        Logger().warning(
+            "Timeout while working on %s after %.1f s", task.ref_pkg_id, task.duration_s
+        )
+        return True
+
+    def _enter_stage(self, task: ConanWorkerTask, stage: ConanWorkerTaskStage) -> bool:
+        """Returns False, if the task must not continue with the stage"""
+        if self._shutdown_requested:
+            task.cancel()
+        elif task.is_expired():
+            self._time_out(task)
+        task._set_stage(stage)
+        return not task.done()
+
+    def _on_task_done(self, task: ConanWorkerTask):
+        """Log the outcome and notify all callbacks - not for cancelled or timed out tasks"""
+        Logger().debug(
+            "Finish working on %s (%s, %.2f s)",
+            task.ref_pkg_id,
+            task.stage.name,
+            task.duration_s,
+        )
+        # late identical requests can still register, until the task is removed
+        with self._pending_tasks_lock:
+            self._remove_pending_task(task)
+            info_callbacks = list(task.callbacks)
+        if not USE_CONAN_WORKER_FOR_LOCAL_PKG_PATH_AND_INSTALL:
+            return
+        conan_ref = self._get_conan_ref(task.ref_pkg_id)
+        if not conan_ref or task.cancelled or task.timed_out or self._shutdown_requested:
+            return
+        for info_callback in info_callbacks:
+            try:
+                info_callback(self._conan_api.generate_canonical_ref(conan_ref), task.pkg_id)
+            except Exception as e:
+                Logger().error(str(e))
+
+    @staticmethod
+    def _get_conan_ref(ref_pkg_id: str) -> Optional[ConanRef]:
         try:
-            if self._install_worker and self._install_worker.is_alive():
-                self._install_worker.join(timeout_s)
+            if ":" in ref_pkg_id:  # pkg ref
+                return ConanPkgRef.loads(ref_pkg_id).ref  # type: ignore
+            return ConanRef.loads(ref_pkg_id)  # type: ignore
         except Exception:
-            return  # Conan threads can crash on join
-        self._conan_install_queue = Queue(maxsize=0)
-        self._install_worker = None  # reset thread for later instantiation
+            return None
+
+    def _work_on_element(self, task: ConanWorkerTask) -> str:
+        """Install or get the path of the element of a task. Returns the pkg id."""
+        worker_element = task.conan_element
+        ref_pkg_id = worker_element.get("ref_pkg_id", "")
+        conan_options = worker_element.get("options", {})
+        conan_settings = worker_element.get("settings", {})
+        conan_profile = worker_element.get("profile", "")
+        update = worker_element.get("update", False)
+        auto_install = worker_element.get("auto_install", True)
+        pkg_id = ""
+        # package path will be updated in conan cache
+        try:
+            if ":" in ref_pkg_id:  # pkg ref
+                if not self._enter_stage(task, ConanWorkerTaskStage.resolve):
+                    return ""
+                pkg_ref: ConanPkgRef = ConanPkgRef.loads(ref_pkg_id)  # type: ignore
+                package = self._conan_api.get_remote_pkg_from_id(pkg_ref)
+                if not self._enter_stage(task, ConanWorkerTaskStage.install):
+                    return ""
+                pkg_id, _ = self._conan_api.install_package(pkg_ref.ref, package, update)
+            else:
+                conan_ref = ConanRef.loads(ref_pkg_id)  # type: ignore
+                # resolving the best package and installing is done in one step
+                if not self._enter_stage(task, ConanWorkerTaskStage.install):
+                    return ""
+                if auto_install:
+                    pkg_id, _ = self._conan_api.get_path_with_auto_install(
+                        conan_ref, conan_options, update
+                    )
+                else:
+                    pkg_id, _ = self._conan_api.install_reference(
+                        conan_ref, conan_settings, conan_options, conan_profile, update
+                    )
+        except Exception:
+            pass
+        return pkg_id
+
+    def finish_working(self, timeout_s: Optional[float] = None):
+        """
+        Cancel, if worker is still not finished. Workers, which are still
+        running a conan command after the timeout (default FINISH_TIMEOUT_S),
+        exit when it returns.
+        """
+        self._shutdown_requested = True
+        with self._workers_lock:
+            workers = list(self._install_workers)
+        # the timeout is valid for all workers together
+        if timeout_s is None:
+            timeout_s = self.FINISH_TIMEOUT_S
+        deadline = time.monotonic() + timeout_s
+        for worker in workers:
+            remaining_s = max(0, deadline - time.monotonic())
+            try:
+                if worker.is_alive():
+                    worker.join(remaining_s)
+            except Exception:
+                return  # Conan threads can crash on join
+        self._conan_install_queue = PriorityQueue(maxsize=0)
+        with self._running_refs_lock:
+            self._running_refs = set()
+            self._deferred_entries = {}
+        with self._pending_tasks_lock:
+            for task in self._pending_tasks.values():
+                task.cancel()
+            self._pending_tasks = {}
+        with self._workers_lock:
+            self._worker_generation += 1
+            self._install_workers = []  # reset threads for later instantiation
         self._shutdown_requested = False
@@ -0,0 +1,137 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import RLock
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from conan_unified_api.types import ConanPkg, ConanRef
+
+from conan_explorer.app.logger import Logger
+
+if TYPE_CHECKING:
+    from ..conan_wrapper import ConanUnifiedApi
+
+
+def query_cache_database_v2(storage_path: Path, query: str) -> Optional[List[Tuple[Any, ...]]]:
+    """Read from the cache database of Conan V2 - returns None, if it can't be read"""
+    db_file = storage_path / "cache.sqlite3"
+    try:
+        connection = sqlite3.connect(f"{db_file.as_uri()}?mode=ro", uri=True)
+        try:
+            return connection.execute(query).fetchall()
+        finally:
+            connection.close()
+    except Exception as e:
+        Logger().debug("Can't read the cache database %s: %s", str(db_file), str(e))
+        return None
+
+
+class ConanLocalPkgIndex:
+    """
+    In-memory index of the local conan cache: ref -> installed packages.
+    Can be built in one pass for all refs, so that views do not need to query
+    the cache for every single ref. Refs, which are not yet indexed, are
+    looked up on demand. Must be invalidated, when packages are installed or removed.
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, conan_api: "ConanUnifiedApi", max_workers=DEFAULT_MAX_WORKERS):
+        self._conan_api = conan_api
+        self._max_workers = max_workers
+        self._refs: Optional[List[ConanRef]] = None
+        self._pkgs: Dict[str, List[ConanPkg]] = {}
+        self._access_lock = RLock()
+
+    def build(self):
+        """Read all local refs and their packages. Refs are read concurrently."""
+        conan_refs = self._conan_api.get_all_local_refs()
+        pkgs: Dict[str, List[ConanPkg]] = {}
+        if conan_refs:
+            with ThreadPoolExecutor(self._max_workers, "local_pkg_index") as executor:
+                for conan_ref, ref_pkgs in zip(
+                    conan_refs, executor.map(self._read_local_pkgs, conan_refs)
+                ):
+                    pkgs[str(conan_ref)] = ref_pkgs
+        with self._access_lock:
+            self._refs = conan_refs
+            self._pkgs = pkgs
+        Logger().debug(f"LocalPkgIndex: Indexed {len(conan_refs)} refs.")
+
+    def refresh(self, conan_refs: Iterable[Union[ConanRef, str]]):
+        """
+        Read all local refs again, but only the packages of the given refs and of the refs,
+        which are not indexed yet - e.g. after the cache has changed.
+        """
+        changed_refs = {str(conan_ref) for conan_ref in conan_refs}
+        all_refs = self._conan_api.get_all_local_refs()
+        with self._access_lock:
+            refs_to_read = [
+                conan_ref
+                for conan_ref in all_refs
+                if str(conan_ref) in changed_refs or str(conan_ref) not in self._pkgs
+            ]
+        pkgs: Dict[str, List[ConanPkg]] = {}
+        if refs_to_read:
+            with ThreadPoolExecutor(self._max_workers, "local_pkg_index") as executor:
+                for conan_ref, ref_pkgs in zip(
+                    refs_to_read, executor.map(self._read_local_pkgs, refs_to_read)
+                ):
+                    pkgs[str(conan_ref)] = ref_pkgs
+        with self._access_lock:
+            all_ref_strs = {str(conan_ref) for conan_ref in all_refs}
+            self._pkgs = {
+                conan_ref: ref_pkgs
+                for conan_ref, ref_pkgs in self._pkgs.items()
+                if conan_ref in all_ref_strs
+            }
+            self._pkgs.update(pkgs)
+            self._refs = all_refs
+        Logger().debug(f"LocalPkgIndex: Refreshed {len(refs_to_read)} refs.")
+
+    def _read_local_pkgs(self, conan_ref: ConanRef) -> List[ConanPkg]:
+        try:
+            return self._conan_api.get_local_pkgs_from_ref(conan_ref)
+        except Exception as e:
+            Logger().debug(f"LocalPkgIndex: Can't read packages of {str(conan_ref)}: {str(e)}")
+            return []
+
+    def get_all_local_refs(self) -> List[ConanRef]:
+        with self._access_lock:
+            if self._refs is not None:
+                return list(self._refs)
+        conan_refs = self._conan_api.get_all_local_refs()
+        with self._access_lock:
+            self._refs = conan_refs
+        return list(conan_refs)
+
+    def get_local_pkgs_from_ref(self, conan_ref: Union[ConanRef, str]) -> List[ConanPkg]:
+        with self._access_lock:
+            pkgs = self._pkgs.get(str(conan_ref))
+            if pkgs is not None:
+                return list(pkgs)
+        if isinstance(conan_ref, str):
+            conan_ref = ConanRef.loads(conan_ref)
+        pkgs = self._read_local_pkgs(conan_ref)
+        with self._access_lock:
+            self._pkgs[str(conan_ref)] = pkgs
+        return list(pkgs)
+
+    def has_local_pkg(self, conan_ref: Union[ConanRef, str], pkg_id: str) -> bool:
+        """
+        Is the package of the ref installed - the packages are looked up on demand,
+        if they are not indexed yet, but a ref missing in the indexed refs is not installed.
+        """
+        with self._access_lock:
+            if self._refs is not None and str(conan_ref) not in map(str, self._refs):
+                return False
+        return any(pkg.get("id") == pkg_id for pkg in self.get_local_pkgs_from_ref(conan_ref))
+
+    def invalidate(self, conan_ref: Optional[Union[ConanRef, str]] = None):
+        """Forget the packages of a ref (with or without package id) or of all refs"""
+        with self._access_lock:
+            self._refs = None  # refs can be added or removed
+            if conan_ref is None:
+                self._pkgs = {}
+                return
+            self._pkgs.pop(str(conan_ref).split(":")[0], None)
@@ -0,0 +1,179 @@
+import json
+from pathlib import Path
+from threading import RLock
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from conan_unified_api.types import ConanOptions
+
+from conan_explorer import conan_version
+from conan_explorer.app.logger import Logger
+from conan_explorer.app.system import delete_path, write_file_atomically
+
+if TYPE_CHECKING:
+    from ..conan_wrapper import ConanUnifiedApi
+
+
+class ConanPkgPathCache:
+    """
+    Persistent index of already resolved local packages, so that
+    the quicklaunch can show the correct paths without querying the conan cache.
+    Maps (ref, options) to package id, package folder and resolved executable paths.
+    An entry is only valid, as long as the modification time of the package folder
+    is unchanged. A newer matching package is only detected by revalidate.
+    """
+
+    CACHE_FILE_NAME = "pkg_path_cache.json"
+    if conan_version.major == 2:
+        CACHE_FILE_NAME = "pkg_path_cacheV2.json"
+    VERSION = 1  # increment, if the format changes - old files will be discarded
+
+    def __init__(self, cache_dir: Path):
+        self._cache_file = cache_dir / self.CACHE_FILE_NAME
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._access_lock = RLock()
+        self._dirty = False
+        if self._cache_file.exists():
+            self._load()
+
+    @staticmethod
+    def _get_key(conan_ref: str, conan_options: ConanOptions) -> str:
+        options = ",".join(f"{name}={value}" for name, value in sorted(conan_options.items()))
+        return f"{conan_ref}|{options}"
+
+    @staticmethod
+    def _get_mtime(package_folder: Path) -> int:
+        try:
+            return package_folder.stat().st_mtime_ns
+        except OSError:
+            return -1
+
+    def _get_valid_entry(
+        self, conan_ref: str, conan_options: ConanOptions
+    ) -> Optional[Dict[str, Any]]:
+        """Get an entry, if the package folder was not modified since it was stored"""
+        key = self._get_key(conan_ref, conan_options)
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        if self._get_mtime(Path(entry["package_folder"])) != entry["mtime"]:
+            self._entries.pop(key)
+            self._dirty = True
+            return None
+        return entry
+
+    def get_package(
+        self, conan_ref: str, conan_options: ConanOptions
+    ) -> Optional[Tuple[str, Path]]:
+        """Return pkg id and package folder of a still valid entry"""
+        with self._access_lock:
+            entry = self._get_valid_entry(conan_ref, conan_options)
+            if not entry:
+                return None
+            return entry["pkg_id"], Path(entry["package_folder"])
+
+    def set_package(
+        self, conan_ref: str, conan_options: ConanOptions, pkg_id: str, package_folder: Path
+    ):
+        mtime = self._get_mtime(package_folder)
+        if mtime < 0:  # not existing - nothing to cache
+            return
+        key = self._get_key(conan_ref, conan_options)
+        with self._access_lock:
+            entry = self._entries.get(key, {})
+            if (
+                entry.get("package_folder") == str(package_folder)
+                and entry.get("mtime") == mtime
+                and (not pkg_id or entry.get("pkg_id") == pkg_id)
+            ):
+                return
+            self._entries[key] = {
+                "pkg_id": pkg_id or entry.get("pkg_id", ""),
+                "package_folder": str(package_folder),
+                "mtime": mtime,
+                "executables": {},
+            }
+            self._dirty = True
+
+    def get_executable_path(
+        self, conan_ref: str, conan_options: ConanOptions, package_folder: Path, executable: str
+    ) -> Optional[Path]:
+        with self._access_lock:
+            entry = self._get_valid_entry(conan_ref, conan_options)
+            if not entry or entry["package_folder"] != str(package_folder):
+                return None
+            executable_path = entry["executables"].get(executable)
+            return Path(executable_path) if executable_path else None
+
+    def set_executable_path(
+        self,
+        conan_ref: str,
+        conan_options: ConanOptions,
+        package_folder: Path,
+        executable: str,
+        executable_path: Path,
+    ):
+        with self._access_lock:
+            entry = self._get_valid_entry(conan_ref, conan_options)
+            if not entry or entry["package_folder"] != str(package_folder):
+                return
+            if entry["executables"].get(executable) == str(executable_path):
+                return
+            entry["executables"][executable] = str(executable_path)
+            self._dirty = True
+
+    def invalidate(self, conan_ref: str, conan_options: ConanOptions):
+        with self._access_lock:
+            if self._entries.pop(self._get_key(conan_ref, conan_options), None):
+                self._dirty = True
+
+    def revalidate(
+        self,
+        conan_api: "ConanUnifiedApi",
+        links: List[Tuple[str, ConanOptions]],
+        changed_callback: Callable[[str, str], Any],
+    ):
+        """
+        Compare the cached packages of (ref, options) with the best matching local package
+        now, e.g. after a newer revision was installed. Changed entries are removed and
+        the callback is called with ref and the new pkg id. Can take a while for many refs.
+        """
+        for conan_ref, conan_options in links:
+            cached_pkg = self.get_package(conan_ref, conan_options)
+            if not cached_pkg:
+                continue
+            try:
+                pkg_id, package_folder = conan_api.get_best_matching_local_package_path(
+                    conan_ref, conan_options
+                )
+            except Exception as e:
+                Logger().debug(f"PkgPathCache: Can't revalidate {conan_ref}: {str(e)}")
+                continue
+            if package_folder == cached_pkg[1]:
+                continue
+            Logger().debug(f"PkgPathCache: Package of {conan_ref} has changed.")
+            self.invalidate(conan_ref, conan_options)
+            changed_callback(conan_ref, pkg_id)
+
+    def _load(self):
+        """Load the cache. Discard it, if it is from another version or corrupt."""
+        try:
+            json_data = json.loads(self._cache_file.read_text())
+            if json_data.get("version") != self.VERSION:
+                Logger().debug("PkgPathCache: Discarding cache file of an older version.")
+                return
+            self._entries = json_data.get("entries", {})
+        except Exception:  # possibly corrupt, delete cache file
+            Logger().debug("PkgPathCache: Can't read cache file, deleting it.")
+            delete_path(self._cache_file)
+
+    def save(self):
+        """Write the cache to file, if something changed."""
+        with self._access_lock:
+            if not self._dirty:
+                return
+            json_data = {"version": self.VERSION, "entries": self._entries}
+            try:
+                write_file_atomically(self._cache_file, json.dumps(json_data))
+                self._dirty = False
+            except Exception:
+                Logger().debug("PkgPathCache: Can't save cache file.")
@@ -0,0 +1,192 @@
+import json
+import time
+from copy import deepcopy
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from pathlib import Path
+from threading import RLock
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple, Union
+
+from conan_unified_api.types import ConanAvailableOptions, ConanOptions, ConanPkg, ConanRef
+
+from conan_explorer import conan_version
+from conan_explorer.app.logger import Logger
+from conan_explorer.app.system import delete_path, write_file_atomically
+from conan_explorer.settings import (
+    REMOTE_QUERY_CACHE_PERSISTENT,
+    REMOTE_QUERY_CACHE_TTL,
+    SettingsInterface,
+)
+
+if TYPE_CHECKING:
+    from ..conan_wrapper import ConanUnifiedApi
+
+SEARCH_QUERY = "search"
+PKGS_QUERY = "pkgs"
+OPTIONS_QUERY = "options"
+
+
+class ConanRemoteQueryCache:
+    """
+    Short lived cache in front of the remote queries of the conan api,
+    so that repeating the same search, expansion or options query does not hit
+    the remote again. Entries are keyed by (query type, remote, query or ref),
+    expire after a configurable time and the least recently used ones
+    are dropped, if the cache is full.
+    Failed or empty results are not cached, because the api reports errors with them.
+    """
+
+    CACHE_FILE_NAME = "remote_query_cache.json"
+    if conan_version.major == 2:
+        CACHE_FILE_NAME = "remote_query_cacheV2.json"
+    VERSION = 1  # increment, if the format changes - old files will be discarded
+    DEFAULT_TTL_S = 300.0
+    DEFAULT_MAX_ENTRIES = 512
+
+    def __init__(
+        self,
+        conan_api: "ConanUnifiedApi",
+        settings: SettingsInterface,
+        cache_dir: Optional[Path] = None,
+        max_entries=DEFAULT_MAX_ENTRIES,
+    ):
+        self._conan_api = conan_api
+        self._settings = settings
+        self._max_entries = max_entries
+        self.ttl_s = self._get_ttl_from_settings()
+        self._cache_file: Optional[Path] = None
+        if cache_dir and self._get_persistent_from_settings():
+            self._cache_file = cache_dir / self.CACHE_FILE_NAME
+        # key -> (timestamp, serialized result)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._access_lock = RLock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if self._cache_file and self._cache_file.exists():
+            self._load()
+
+    def _get_ttl_from_settings(self) -> float:
+        try:
+            return self._settings.get_float(REMOTE_QUERY_CACHE_TTL)
+        except Exception:
+            return self.DEFAULT_TTL_S
+
+    def _get_persistent_from_settings(self) -> bool:
+        try:
+            return self._settings.get_bool(REMOTE_QUERY_CACHE_PERSISTENT)
+        except Exception:
+            return False
+
+    @staticmethod
+    def _get_key(query_type: str, remote: str, query: str) -> str:
+        return f"{query_type}|{remote}|{query}"
+
+    def search_recipes_in_remotes(self, query: str, remote_name: str = "all") -> List[ConanRef]:
+        recipes = self._get_or_query(
+            self._get_key(SEARCH_QUERY, remote_name, query),
+            lambda: [
+                str(ref)
+                for ref in self._conan_api.search_recipes_in_remotes(query, remote_name)
+            ],
+        )
+        return [ConanRef.loads(recipe) for recipe in recipes]
+
+    def get_remote_pkgs_from_ref(
+        self, conan_ref: Union[ConanRef, str], remote: Optional[str]
+    ) -> List[ConanPkg]:
+        if isinstance(conan_ref, str):
+            conan_ref = ConanRef.loads(conan_ref)
+        return self._get_or_query(
+            self._get_key(PKGS_QUERY, str(remote), str(conan_ref)),
+            lambda: self._conan_api.get_remote_pkgs_from_ref(conan_ref, remote),
+        )
+
+    def get_options_with_default_values(
+        self, conan_ref: Union[ConanRef, str]
+    ) -> Tuple[ConanAvailableOptions, ConanOptions]:
+        available_options, default_options = self._get_or_query(
+            self._get_key(OPTIONS_QUERY, "", str(conan_ref)),
+            lambda: list(self._conan_api.get_options_with_default_values(conan_ref)),
+        )
+        return available_options, default_options
+
+    def _get_or_query(self, key: str, query: Callable[[], Any]) -> Any:
+        """
+        Return a copy of the cached result or query it. Must return a json serializable result.
+        Callers get copies, so that changing a result does not change the cached one.
+        """
+        with self._access_lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry[0] < self.ttl_s:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                Logger().debug(
+                    f"RemoteQueryCache hit for {key} ({self.hits} hits, {self.misses} misses)"
+                )
+                return deepcopy(entry[1])
+            self.misses += 1
+        # query outside of the lock, so that different queries can run concurrently
+        result = query()
+        if self.ttl_s <= 0 or not any(result):
+            return result
+        with self._access_lock:
+            self._entries[key] = (time.time(), deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+        return result
+
+    def invalidate(self, conan_ref: Optional[Union[ConanRef, str]] = None):
+        """
+        Remove all entries for a reference (with or without package id),
+        which includes searches matching its name. Remove everything without a reference.
+        """
+        with self._access_lock:
+            if conan_ref is None:
+                self._entries.clear()
+                self._dirty = True
+                return
+            recipe_ref = str(conan_ref).split(":")[0]
+            recipe_name = recipe_ref.split("/")[0].lower()
+            for key in list(self._entries.keys()):
+                query_type, _, query = key.split("|", 2)
+                if query == recipe_ref or (
+                    query_type == SEARCH_QUERY
+                    and (
+                        fnmatchcase(recipe_name, query.lower())
+                        or fnmatchcase(recipe_ref.lower(), query.lower())
+                    )
+                ):
+                    self._entries.pop(key)
+                    self._dirty = True
+
+    def _load(self):
+        """Load the cache. Discard it, if it is from another version or corrupt."""
+        if not self._cache_file:
+            return
+        try:
+            json_data = json.loads(self._cache_file.read_text())
+            if json_data.get("version") != self.VERSION:
+                Logger().debug("RemoteQueryCache: Discarding cache file of an older version.")
+                return
+            for key, (timestamp, result) in json_data.get("entries", {}).items():
+                if time.time() - timestamp < self.ttl_s:  # drop already expired entries
+                    self._entries[key] = (timestamp, result)
+        except Exception:  # possibly corrupt, delete cache file
+            Logger().debug("RemoteQueryCache: Can't read cache file, deleting it.")
+            delete_path(self._cache_file)
+
+    def save(self):
+        """Write the cache to file, if persistence is enabled and something changed."""
+        Logger().debug(f"RemoteQueryCache: {self.hits} hits, {self.misses} misses")
+        with self._access_lock:
+            if not self._cache_file or not self._dirty:
+                return
+            json_data = {"version": self.VERSION, "entries": self._entries}
+            try:
+                write_file_atomically(self._cache_file, json.dumps(json_data))
+                self._dirty = False
+            except Exception:
+                Logger().debug("RemoteQueryCache: Can't save cache file.")
@@ -15,6 +15,9 @@ LAST_CONFIG_FILE = "last_config_file"
 FILE_EDITOR_EXECUTABLE = "file_editor"
 AUTO_INSTALL_QUICKLAUNCH_REFS = "auto_install_quicklaunch"
 DEFAULT_INSTALL_PROFILE = "default_install_profile"
+CONAN_WORKER_THREADS = "conan_worker_threads"
+REMOTE_QUERY_CACHE_TTL = "remote_query_cache_ttl"  # in seconds, 0 disables the cache
+REMOTE_QUERY_CACHE_PERSISTENT = "remote_query_cache_persistent"
 
 ### View
 FONT_SIZE = "font_size"
@@ -42,7 +45,7 @@ def settings_factory(type: str, source: PathLike) -> "SettingsInterface":
     if type == SETTINGS_INI_TYPE:
         from conan_explorer.settings.ini_file import IniSettings
 
-        implementation = IniSettings(source)
+        implementation = IniSettings(source, save_delay_s=IniSettings.SAVE_DELAY_S)
     elif type == SETTINGS_QT_TYPE:
         raise NotImplementedError
     else:
@@ -69,6 +72,11 @@ class SettingsInterface:
         """Save all user modifiable settings."""
         raise NotImplementedError
 
+    @abstractmethod
+    def flush(self):
+        """Write pending changes, if saving is delayed. Must be called before exiting."""
+        raise NotImplementedError
+
     @abstractmethod
     def get_settings_from_node(self, node: str) -> List[str]:
         """Get all settings names from a hierachical node.
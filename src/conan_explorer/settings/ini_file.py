@@ -1,18 +1,27 @@
+import atexit
 import configparser
 import os
 from copy import deepcopy
+from io import StringIO
 from pathlib import Path
+from threading import RLock, Timer
 from typing import Any, Dict, List, Optional
+from weakref import WeakSet
 
 from typing_extensions import override
 
 from conan_explorer import BUILT_IN_PLUGIN, PathLike, base_path
 from conan_explorer.app.logger import Logger
-from conan_explorer.app.system import get_default_file_editor
+from conan_explorer.app.system import (
+    get_default_file_editor,
+    str2bool,
+    write_file_atomically,
+)
 
 from . import (
     AUTO_INSTALL_QUICKLAUNCH_REFS,
     AUTO_OPEN_LAST_VIEW,
+    CONAN_WORKER_THREADS,
     CONSOLE_SPLIT_SIZES,
     DEFAULT_INSTALL_PROFILE,
     FILE_EDITOR_EXECUTABLE,
@@ -25,6 +34,8 @@ from . import (
     LAST_CONFIG_FILE,
     LAST_VIEW,
     PLUGINS_SECTION_NAME,
+    REMOTE_QUERY_CACHE_PERSISTENT,
+    REMOTE_QUERY_CACHE_TTL,
     VIEW_SECTION_NAME,
     WINDOW_SIZE,
     SettingsInterface,
@@ -38,6 +49,9 @@ def application_settings_spec() -> Dict[str, Dict[str, Any]]:
             FILE_EDITOR_EXECUTABLE: get_default_file_editor(),
             AUTO_INSTALL_QUICKLAUNCH_REFS: False,
             DEFAULT_INSTALL_PROFILE: "",
+            CONAN_WORKER_THREADS: 4,
+            REMOTE_QUERY_CACHE_TTL: 300.0,
+            REMOTE_QUERY_CACHE_PERSISTENT: False,
         },
         VIEW_SECTION_NAME: {
             FONT_SIZE: 13,
@@ -52,25 +66,41 @@ def application_settings_spec() -> Dict[str, Dict[str, Any]]:
     }
 
 
+# settings with a save delay, which must write their pending changes on exit
+_delayed_save_settings: "WeakSet[IniSettings]" = WeakSet()
+
+
+@atexit.register
+def _flush_delayed_save_settings():
+    for settings in list(_delayed_save_settings):
+        settings.flush()
+
+
 class IniSettings(SettingsInterface):
     """
     Settings mechanism with an ini file to use as a storage.
     File and entries are automatically created from the default value of the class.
     User defined keys are now allowed for nodes specified incustom_key_enabled_sections.
     Settings should be accessed via their constant name.
+    With a save delay, changes are written behind: all changes within the delay
+    are coalesced into one write, which happens in a background thread.
     """
 
+    SAVE_DELAY_S = 0.5
+
     def __init__(
         self,
         ini_file_path: Optional[PathLike],
         auto_save=True,
         default_values: Dict[str, Dict[str, Any]] = application_settings_spec(),
         custom_key_enabled_sections: List[str] = [PLUGINS_SECTION_NAME],
+        save_delay_s=0.0,
     ):
         """
         Read config.ini file to load settings.
         Create, if not existing, but the directory must already exist!
         Default path is current working dir / settings.ini
+        A save delay of 0 writes every change immediately.
         """
         if not ini_file_path:
             self._ini_file_path = Path().cwd() / "settings.ini"
@@ -80,6 +110,12 @@ class IniSettings(SettingsInterface):
         self._custom_key_enabled_sections = custom_key_enabled_sections
         self._logger = Logger()
         self._parser = configparser.ConfigParser()
+        self._save_delay_s = save_delay_s
+        self._save_timer: Optional[Timer] = None
+        self._values_lock = RLock()  # guards values and parser
+        self._write_lock = RLock()  # keeps the order of the writes
+        if save_delay_s > 0:
+            _delayed_save_settings.add(self)
 
         ### default setting values ###
         self._values: Dict[str, Dict[str, Any]] = deepcopy(default_values)
@@ -134,48 +170,86 @@ class IniSettings(SettingsInterface):
     def set(self, name: str, value: "str|int|float|bool|dict"):
         """Set the value of a specific setting.
         Does not write to file, if value is already set."""
-        if name in self._values.keys() and isinstance(value, dict):  # dict type setting
-            if self._values[name] == value:
-                return
-            self._values[name].update(value)
-        else:
-            for section in self._values.keys():
-                if name in self._values[section]:
-                    if self._values[section][name] == value:
-                        return
-                    self._values[section][name] = value
-                    break
+        with self._values_lock:
+            if name in self._values.keys() and isinstance(value, dict):  # dict type setting
+                if self._values[name] == value:
+                    return
+                self._values[name].update(value)
+            else:
+                for section in self._values.keys():
+                    if name in self._values[section]:
+                        if self._values[section][name] == value:
+                            return
+                        self._values[section][name] = value
+                        break
         if self._auto_save:
-            self.save()
+            self._schedule_save()
 
     @override
     def add(self, name: str, value: "str|int|float|bool", node: Optional[str] = None):
         if node is None:
             node = GENERAL_SECTION_NAME
-        if not self._values.get(node):
-            self._values[node] = {}
-        self._values[node][name] = value
-        self.save()
+        with self._values_lock:
+            if not self._values.get(node):
+                self._values[node] = {}
+            self._values[node][name] = value
+        self._schedule_save()
 
     @override
     def remove(self, name: str):
-        for node_name, node in self._values.items():
-            if name in node:
-                node.pop(name)
-                del self._parser[node_name][name]
-                break
-        self.save()
+        with self._values_lock:
+            for node_name, node in self._values.items():
+                if name in node:
+                    node.pop(name)
+                    del self._parser[node_name][name]
+                    break
+        self._schedule_save()
 
     @override
     def save(self):
         """Save all user modifiable settings to file."""
-        # save all default values
-        for section in self._values.keys():
-            for setting in self._values[section]:
-                self._write_setting(setting, section)
+        with self._write_lock:
+            with self._values_lock:
+                # save all default values
+                for section in self._values.keys():
+                    for setting in self._values[section]:
+                        self._write_setting(setting, section)
+                content = StringIO()
+                self._parser.write(content)
+            write_file_atomically(self._ini_file_path, content.getvalue())
+
+    @override
+    def flush(self):
+        """Write a pending delayed save now or wait for a running one."""
+        with self._values_lock:
+            save_timer = self._save_timer
+            self._save_timer = None
+        if save_timer is None:
+            with self._write_lock:  # a delayed save holds it, until it is written
+                return
+        save_timer.cancel()
+        self.save()
 
-        with self._ini_file_path.open("w", encoding="utf-8") as ini_file:
-            self._parser.write(ini_file)
+    def _schedule_save(self):
+        """Save now or start the delay, in which all further changes are collected."""
+        if self._save_delay_s <= 0 or str2bool(os.getenv("DISABLE_ASYNC_LOADER", "")):
+            self.save()
+            return
+        with self._values_lock:
+            if self._save_timer is not None:  # already pending
+                return
+            self._save_timer = Timer(self._save_delay_s, self._save_delayed)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _save_delayed(self):
+        with self._write_lock:
+            with self._values_lock:
+                self._save_timer = None
+            try:
+                self.save()
+            except Exception as e:
+                self._logger.error("Settings: Can't save ini file: %s", str(e))
 
     def _read_ini(self):
         """Read settings ini with configparser."""
@@ -208,8 +282,10 @@ class IniSettings(SettingsInterface):
         # write file - to record defaults, if missing
         if not update_needed:
             return
-        with self._ini_file_path.open("w", encoding="utf8") as ini_file:
-            self._parser.write(ini_file)
+        content = StringIO()
+        self._parser.write(content)
+        with self._write_lock:
+            write_file_atomically(self._ini_file_path, content.getvalue())
 
     def _get_section(self, node: str) -> configparser.SectionProxy:
         """Get a section from ini, or create it, if it does not exist."""
@@ -16,8 +16,11 @@ from .icon import (
     extract_icon,
     get_icon_from_image_file,
     get_inverted_asset_image,
+    get_inverted_image,
     get_platform_icon,
+    get_svg_icon_with_color,
 )
+from .icon_loader import IconLoader, get_icon_loader
 from .logger import init_qt_logger, remove_qt_logger
 from .model import FileSystemModel, TreeModel, TreeModelItem, re_register_signal
 from .syntax_highlighting import ConfigHighlighter
@@ -29,8 +32,38 @@ from .theming import (
     get_gui_dark_mode,
     get_gui_style,
     get_themed_asset_icon,
+    preload_themed_icons,
 )
 
+__all__ = [
+    "draw_svg_with_color",
+    "extract_icon",
+    "get_icon_from_image_file",
+    "get_inverted_asset_image",
+    "get_inverted_image",
+    "get_platform_icon",
+    "get_svg_icon_with_color",
+    "IconLoader",
+    "get_icon_loader",
+    "init_qt_logger",
+    "remove_qt_logger",
+    "FileSystemModel",
+    "TreeModel",
+    "TreeModelItem",
+    "re_register_signal",
+    "ConfigHighlighter",
+    "CanSetIconWidgetProtocol",
+    "CanSetPixmapWidgetProtocol",
+    "ThemedWidget",
+    "get_asset_image_path",
+    "get_gui_dark_mode",
+    "get_gui_style",
+    "get_themed_asset_icon",
+    "preload_themed_icons",
+    "measure_font_width",
+    "show_conanfile",
+]
+
 
 def measure_font_width(text: str) -> int:
     """Return the width of a text in pixels with the current font and default fontsize"""
@@ -1,9 +1,12 @@
 import xml.dom.minidom as dom
+from collections import OrderedDict
 from pathlib import Path
+from typing import Tuple
 
-from PySide6.QtCore import QFileInfo
-from PySide6.QtGui import QIcon, QImage
-from PySide6.QtWidgets import QFileIconProvider
+from PySide6.QtCore import QByteArray, QFileInfo, QPoint, QRect, QSize, Qt
+from PySide6.QtGui import QIcon, QIconEngine, QImage, QPainter, QPixmap
+from PySide6.QtSvg import QSvgRenderer
+from PySide6.QtWidgets import QApplication, QFileIconProvider, QStyleOption
 
 from conan_explorer import INVALID_PATH
 from conan_explorer.app.logger import Logger
@@ -23,20 +26,70 @@ def get_inverted_asset_image(image_path: Path) -> Path:
     return inverted_img_path
 
 
+def get_inverted_image(image_path: Path) -> QImage:
+    """Inverts a given image in memory. To be used like get_inverted_asset_image."""
+    img = QImage(str(image_path))
+    img.invertPixels()
+    return img
+
+
 def get_icon_from_image_file(image_path: Path) -> QIcon:
     return QIcon(str(image_path))
 
 
-def draw_svg_with_color(svg_path: Path, color="white") -> Path:
+class SvgIconEngine(QIconEngine):
     """
-    Sets an svg in the desired color for a QtWidget.
-    :param color: the disired color as a string in html compatible name
-    :param shadow: draws a drop shadow
+    Renders an icon from svg content in memory, so a recolored svg
+    does not need to be written to disk. The rendered pixmaps are cached by size,
+    mode and state, so repainting does not render the svg again.
     """
-    if not svg_path or not svg_path.exists():
-        Logger().error("Cannot draw invalid SVG file: %s", repr(svg_path))
-        return Path(INVALID_PATH)
 
+    MAX_CACHED_PIXMAPS = 8
+
+    def __init__(self, svg_content: bytes):
+        super().__init__()
+        self._svg_content = svg_content
+        self._renderer = QSvgRenderer(QByteArray(svg_content))
+        self._pixmaps: "OrderedDict[Tuple[int, int, int, int], QPixmap]" = OrderedDict()
+
+    def paint(self, painter: QPainter, rect: QRect, mode: QIcon.Mode, state: QIcon.State):
+        painter.drawPixmap(rect, self.pixmap(rect.size(), mode, state))
+
+    def actualSize(self, size: QSize, mode: QIcon.Mode, state: QIcon.State) -> QSize:
+        return self._renderer.defaultSize().scaled(size, Qt.AspectRatioMode.KeepAspectRatio)
+
+    def pixmap(self, size: QSize, mode: QIcon.Mode, state: QIcon.State) -> QPixmap:
+        key = (size.width(), size.height(), mode.value, state.value)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+        pixmap = QPixmap(size)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        # keep aspect ratio and center it, like the svg icon engine of Qt
+        actual_size = self.actualSize(size, mode, state)
+        target = QRect(QPoint(0, 0), actual_size)
+        target.moveCenter(pixmap.rect().center())
+        painter = QPainter(pixmap)
+        self._renderer.render(painter, target)
+        painter.end()
+        style = QApplication.style()
+        if mode != QIcon.Mode.Normal and style:
+            pixmap = style.generatedIconPixmap(mode, pixmap, QStyleOption())
+        self._pixmaps[key] = pixmap
+        while len(self._pixmaps) > self.MAX_CACHED_PIXMAPS:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def clone(self) -> QIconEngine:
+        return SvgIconEngine(self._svg_content)
+
+
+def get_svg_with_color(svg_path: Path, color="white") -> bytes:
+    """
+    Returns the content of an svg in the desired color.
+    :param color: the disired color as a string in html compatible name
+    """
     # read svg as xml and get the drawing
     with open(svg_path, "r", encoding="utf-8") as svg:
         svg_content = "".join(svg.readlines())
@@ -49,10 +102,29 @@ def draw_svg_with_color(svg_path: Path, color="white") -> Path:
     # also replace possible css
     xml_text: str = svg_dom.toxml()
     xml_text = xml_text.replace("#000000", "white")
+    return xml_text.encode("utf-8")
+
+
+def get_svg_icon_with_color(svg_path: Path, color="white") -> QIcon:
+    """Sets an svg in the desired color for a QtWidget without writing it to disk"""
+    if not svg_path or not svg_path.exists():
+        Logger().error("Cannot draw invalid SVG file: %s", repr(svg_path))
+        return QIcon()
+    return QIcon(SvgIconEngine(get_svg_with_color(svg_path, color)))
+
+
+def draw_svg_with_color(svg_path: Path, color="white") -> Path:
+    """
+    Sets an svg in the desired color for a QtWidget.
+    The svg is saved beside the original one with the color in the name.
+    :param color: the disired color as a string in html compatible name
+    """
+    if not svg_path or not svg_path.exists():
+        Logger().error("Cannot draw invalid SVG file: %s", repr(svg_path))
+        return Path(INVALID_PATH)
     # create temporary svg and read into pyqt svg graphics object
     new_svg_path = svg_path.parent / Path(svg_path.stem + "_" + color + svg_path.suffix)
-    with open(new_svg_path, "w+", encoding="utf-8") as new_svg:
-        new_svg.write(xml_text)
+    new_svg_path.write_bytes(get_svg_with_color(svg_path, color))
     return new_svg_path
 
 
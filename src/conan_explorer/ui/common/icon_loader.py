@@ -0,0 +1,179 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from PySide6.QtCore import QBuffer, QByteArray, QObject, QSize, Qt, Signal, SignalInstance
+from PySide6.QtGui import QIcon, QImage, QImageReader, QPixmap
+
+from conan_explorer import ICON_SIZE, user_save_path
+from conan_explorer.app.logger import Logger
+from conan_explorer.app.system import delete_path, str2bool, write_file_atomically
+
+from .icon import extract_icon
+
+IconLoadedCallback = Callable[[QIcon], None]
+
+
+class IconLoader(QObject):
+    """
+    Loads the icons of files in the background, because reading them can be slow,
+    e.g. for executables on network shares. Images are decoded into QImages in a worker
+    and are converted to pixmaps in the GUI thread.
+    The icons are saved as thumbnails on disk, keyed by path, modification time and size
+    of the file. Icons of executables can only be extracted in the GUI thread,
+    so that is only done, if they are not in the thumbnail cache yet.
+    """
+
+    CACHE_DIR_NAME = "icon_cache"
+    MAX_WORKERS = 4
+    MAX_THUMBNAILS = 512
+    MAX_THUMBNAIL_SIZE = 4 * ICON_SIZE
+
+    # request id, QImage or None, path, extract
+    _image_loaded: SignalInstance = Signal(int, object, str, bool)  # type: ignore
+
+    def __init__(self, parent: Optional[QObject] = None, cache_dir: Optional[Path] = None):
+        super().__init__(parent)
+        self._cache_dir = cache_dir or (user_save_path / self.CACHE_DIR_NAME)
+        self._executor = ThreadPoolExecutor(self.MAX_WORKERS, "icon_loader")
+        self._callbacks: Dict[int, IconLoadedCallback] = {}
+        self._last_request_id = 0
+        self._image_loaded.connect(self._on_image_loaded)
+        self._run(self.prune_thumbnails)
+
+    def _run(self, func: Callable, *args):
+        # for debug purposes only
+        if str2bool(os.getenv("DISABLE_ASYNC_LOADER", "")):
+            func(*args)
+            return
+        self._executor.submit(func, *args)
+
+    def load_icon(self, path: Path, extract: bool, callback: IconLoadedCallback):
+        """
+        Load the icon of path - extract means, that the icon is embedded in the file
+        (e.g. an executable). Only the file is read and decoded in the worker.
+        The callback is called in the GUI thread - with a null icon, if none can be loaded.
+        """
+        self._last_request_id += 1
+        self._callbacks[self._last_request_id] = callback
+        self._run(self._load_image, self._last_request_id, path, extract)
+
+    def _load_image(self, request_id: int, path: Path, extract: bool):
+        image = None
+        try:
+            image = self.read_thumbnail(path)
+            if image is None and not extract:
+                image = self.decode_image(path)
+                if image is not None:
+                    self.write_thumbnail(path, image)
+        except Exception as e:
+            Logger().debug(f"Can't load icon of {str(path)}: {str(e)}")
+        try:
+            self._image_loaded.emit(request_id, image, str(path), extract)
+        except RuntimeError:  # Qt object is already deleted
+            return
+
+    def _on_image_loaded(
+        self, request_id: int, image: Optional[QImage], path: str, extract: bool
+    ):
+        callback = self._callbacks.pop(request_id, None)
+        if image is None and extract:
+            icon = extract_icon(Path(path))
+            if not icon.isNull():
+                image = self._get_largest_image(icon)
+                self._run(self.write_thumbnail, Path(path), image)
+        icon = QIcon()
+        if image is not None and not image.isNull():
+            icon = QIcon(QPixmap.fromImage(image))
+        if callback:
+            callback(icon)
+
+    @staticmethod
+    def _get_largest_image(icon: QIcon) -> QImage:
+        sizes = icon.availableSizes()
+        size = sizes[-1] if sizes else QSize(ICON_SIZE, ICON_SIZE)
+        return icon.pixmap(size).toImage()
+
+    def decode_image(self, path: Path) -> Optional[QImage]:
+        """Read the largest image of an image file - can be called from any thread"""
+        if not path.is_file():
+            return None
+        reader = QImageReader(str(path))
+        if path.suffix == ".svg":
+            reader.setScaledSize(QSize(ICON_SIZE, ICON_SIZE))
+        largest_image = QImage()
+        for _ in range(max(1, reader.imageCount())):  # e.g. ico files have multiple sizes
+            image = reader.read()
+            if image.width() > largest_image.width():
+                largest_image = image
+            if not reader.jumpToNextImage():
+                break
+        if largest_image.isNull():
+            return None
+        if largest_image.width() > self.MAX_THUMBNAIL_SIZE:
+            largest_image = largest_image.scaled(
+                self.MAX_THUMBNAIL_SIZE,
+                self.MAX_THUMBNAIL_SIZE,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+        return largest_image
+
+    def _get_thumbnail_path(self, path: Path) -> Optional[Path]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        key = f"{str(path)}|{stat.st_mtime_ns}|{stat.st_size}"
+        return self._cache_dir / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+    def read_thumbnail(self, path: Path) -> Optional[QImage]:
+        thumbnail_path = self._get_thumbnail_path(path)
+        if not thumbnail_path or not thumbnail_path.exists():
+            return None
+        image = QImage(str(thumbnail_path))
+        return None if image.isNull() else image
+
+    def write_thumbnail(self, path: Path, image: QImage):
+        """Write atomically, so a concurrent read never gets a partial file"""
+        thumbnail_path = self._get_thumbnail_path(path)
+        if not thumbnail_path:
+            return
+        try:
+            content = QByteArray()
+            buffer = QBuffer(content)
+            buffer.open(QBuffer.OpenModeFlag.WriteOnly)
+            if not image.save(buffer, "PNG"):
+                return
+            buffer.close()
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            write_file_atomically(thumbnail_path, content.data())
+        except Exception as e:
+            Logger().debug(f"Can't write icon thumbnail of {str(path)}: {str(e)}")
+
+    def prune_thumbnails(self):
+        """Delete the oldest thumbnails, if there are too many"""
+        if not self._cache_dir.is_dir():
+            return
+        thumbnails = []
+        for thumbnail_path in self._cache_dir.iterdir():
+            try:
+                thumbnails.append((thumbnail_path.stat().st_mtime, thumbnail_path))
+            except OSError:  # removed meanwhile
+                continue
+        thumbnails.sort()
+        for _, thumbnail_path in thumbnails[: max(0, len(thumbnails) - self.MAX_THUMBNAILS)]:
+            delete_path(thumbnail_path)
+
+
+_icon_loader: Optional[IconLoader] = None
+
+
+def get_icon_loader() -> IconLoader:
+    """The icon loader is shared, so its thumbnails and workers are too"""
+    global _icon_loader
+    if _icon_loader is None:
+        _icon_loader = IconLoader()
+    return _icon_loader
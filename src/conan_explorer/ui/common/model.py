@@ -1,4 +1,4 @@
-from typing import Callable, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Union
 
 from PySide6.QtCore import (
     QAbstractItemModel,
@@ -49,9 +49,13 @@ class FileSystemModel(QFileSystemModel):
 class TreeModelItem:
     """
     Represents a tree item for a model view with lazy loading.
-    Implemented like the default QT example.
+    Implemented like the default QT example, but every item remembers its row,
+    because Qt asks for the parent index (and with it the row) all the time.
     """
 
+    # saves memory for big trees - subclasses need their own slots for this
+    __slots__ = ("parent_item", "item_data", "child_items", "is_loaded", "_row")
+
     def __init__(
         self, data: List[str], parent: Optional["TreeModelItem"] = None, lazy_loading=False
     ):
@@ -59,14 +63,18 @@ class TreeModelItem:
         self.item_data = data
         self.child_items = []
         self.is_loaded = not lazy_loading
+        self._row = 0
 
     def append_child(self, item):
+        item._row = len(self.child_items)
         self.child_items.append(item)
 
     def remove_child(self, item):
         self.child_items.remove(item)
 
     def get_child_item_row(self, item):
+        if item.parent_item is self:
+            return item.row()
         return self.child_items.index(item)
 
     def child(self, row):
@@ -88,9 +96,23 @@ class TreeModelItem:
         return self.parent_item
 
     def row(self):
-        if self.parent_item:
-            return self.parent_item.child_items.index(self)
-        return 0
+        """
+        Return the remembered row, if it is still valid. The child items can be changed
+        directly, so otherwise the rows of all siblings are updated at once.
+        Raises ValueError, if the item is not a child of its parent anymore.
+        """
+        if not self.parent_item:
+            return 0
+        siblings = self.parent_item.child_items
+        if self._row >= len(siblings) or siblings[self._row] is not self:
+            self.parent_item.update_child_rows()
+            if self._row >= len(siblings) or siblings[self._row] is not self:
+                raise ValueError(f"{str(self)} is not in list")
+        return self._row
+
+    def update_child_rows(self):
+        for row, child_item in enumerate(self.child_items):
+            child_item._row = row
 
     def load_children(self):
         self.child_items = []
@@ -99,18 +121,25 @@ class TreeModelItem:
 
 class TreeModel(QAbstractItemModel):
     """Qt tree model to be used with TreeModelItem.
-    Supports lazy loading, if TreeModelItem enables it."""
+    Supports lazy loading, if TreeModelItem enables it.
+    Items can optionally be registered with a unique key (e.g. the conan ref) to find them
+    without searching the whole tree."""
 
     def __init__(self, checkable=False, *args, **kwargs):
         super(TreeModel, self).__init__(*args, **kwargs)
         self.root_item = TreeModelItem([])
         self._checkable = checkable
+        self._items_by_key: Dict[str, TreeModelItem] = {}
 
     def clear_items(self):
         self.beginResetModel()
         self.root_item.child_items.clear()
+        self._items_by_key.clear()
         self.endResetModel()
 
+    def get_item_by_key(self, key: str) -> Optional[TreeModelItem]:
+        return self._items_by_key.get(key)
+
     def add_item(self, item: TreeModelItem):  # to root_item
         child_count = self.root_item.child_count()
         item.parent_item = self.root_item
@@ -122,6 +151,8 @@ class TreeModel(QAbstractItemModel):
         item_index = self.get_index_from_item(item)
         self.beginRemoveRows(item_index.parent(), item_index.row(), item_index.row())
         self.root_item.remove_child(item)
+        for key in [key for key, key_item in self._items_by_key.items() if key_item is item]:
+            self._items_by_key.pop(key)
         self.endRemoveRows()
 
     @override
@@ -182,7 +213,7 @@ class TreeModel(QAbstractItemModel):
             Logger().error("%s has incorrect type:", child_item)
         parent_item = child_item.parent()
 
-        if not parent_item or parent_item == self.root_item:
+        if not parent_item or parent_item is self.root_item:
             return QModelIndex()
 
         return self.createIndex(parent_item.row(), 0, parent_item)
@@ -206,22 +237,16 @@ class TreeModel(QAbstractItemModel):
         item.load_children()
 
     def get_index_from_item(self, item: TreeModelItem) -> QModelIndex:
-        # find the row with the matching reference
-        found_item = False
-        ref_row = 0
-        for ref_row in range(self.root_item.child_count()):
-            current_item = self.root_item.child_items[ref_row]
-            # always has one dummy child count
-            for child_row in range(len(current_item.child_items)):
-                current_child_item = current_item.child_items[child_row]
-                if current_child_item == item:
-                    found_item = True
-                    parent_index = self.index(ref_row, 0, QModelIndex())
-                    return self.index(child_row, 0, parent_index)
-            if current_item == item:
-                found_item = True
-                return self.index(ref_row, 0, QModelIndex())
-        if not found_item:
+        # walk up to the root, so the item is surely part of this model
+        try:
+            current_item = item
+            while current_item.parent_item is not self.root_item:
+                if current_item.parent_item is None:
+                    raise ValueError(f"{str(item)} is not in model")
+                current_item.row()
+                current_item = current_item.parent_item
+            current_item.row()
+            return self.createIndex(item.row(), 0, item)
+        except ValueError:
             Logger().debug("Cannot find %s in model", str(item))
             return QModelIndex()
-        return self.index(ref_row, 0, QModelIndex())
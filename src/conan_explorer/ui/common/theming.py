@@ -1,9 +1,10 @@
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Optional, Protocol, Tuple, TypedDict, Union, runtime_checkable
 
 from PySide6.QtCore import QSize
 from PySide6.QtGui import QIcon, QImage, QPixmap
-from PySide6.QtWidgets import QWidget
+from PySide6.QtWidgets import QApplication, QStyle, QWidget
 
 import conan_explorer.app as app
 
@@ -12,11 +13,16 @@ from conan_explorer.app.base_ui.theming import get_gui_dark_mode
 from conan_explorer.app.logger import Logger
 from conan_explorer.settings import GUI_STYLE, GUI_STYLE_FLUENT, GUI_STYLE_MATERIAL
 from conan_explorer.ui.common import (
-    draw_svg_with_color,
     get_icon_from_image_file,
-    get_inverted_asset_image,
+    get_inverted_image,
+    get_svg_icon_with_color,
 )
 
+DARK_MODE_ICON_COLOR = "white"
+MAX_CACHED_ICONS = 256
+# (image path, gui style, dark mode, color) -> icon
+_themed_icons: "OrderedDict[Tuple[str, str, bool, str], QIcon]" = OrderedDict()
+
 
 @runtime_checkable
 class CanSetIconWidgetProtocol(Protocol):
@@ -56,13 +62,47 @@ def get_asset_image_path(image_path: str) -> Path:
 def get_themed_asset_icon(
     image_path: str, force_light_mode=False, force_dark_mode=False
 ) -> QIcon:
+    """
+    Icons are cached for the current theme, because they are requested on every paint.
+    In dark mode the images are recolored in memory. The icons cache their pixmaps by size.
+    """
+    dark_mode = force_dark_mode or (get_gui_dark_mode() and not force_light_mode)
+    key = (image_path, get_gui_style(), dark_mode, DARK_MODE_ICON_COLOR)
+    icon = _themed_icons.get(key)
+    if icon is not None:
+        _themed_icons.move_to_end(key)
+        return icon
     asset_path = get_asset_image_path(image_path)
-    if force_dark_mode or (get_gui_dark_mode() and not force_light_mode):
-        if asset_path.suffix == ".svg":
-            asset_path = draw_svg_with_color(asset_path)
-        else:
-            asset_path = get_inverted_asset_image(asset_path)
-    return get_icon_from_image_file(asset_path)
+    if not dark_mode:
+        icon = get_icon_from_image_file(asset_path)
+    elif asset_path.suffix == ".svg":
+        icon = get_svg_icon_with_color(asset_path, DARK_MODE_ICON_COLOR)
+    else:
+        icon = QIcon(QPixmap.fromImage(get_inverted_image(asset_path)))
+    _themed_icons[key] = icon
+    while len(_themed_icons) > MAX_CACHED_ICONS:
+        _themed_icons.popitem(last=False)
+    return icon
+
+
+def preload_themed_icons():
+    """
+    Create the icons of all svg assets for the current theme and render them
+    in the default size of item views, so that the first paint does not need to.
+    """
+    icons_path = app.asset_path / "icons"
+    image_paths = [
+        f"icons/global/{svg_path.name}" for svg_path in (icons_path / "global").glob("*.svg")
+    ]
+    image_paths += [
+        f"icons/{svg_path.name}" for svg_path in (icons_path / get_gui_style()).glob("*.svg")
+    ]
+    style = QApplication.style()
+    size = style.pixelMetric(QStyle.PixelMetric.PM_SmallIconSize) if style else 16
+    for image_path in image_paths[:MAX_CACHED_ICONS]:
+        if Path(image_path).stem.endswith(f"_{DARK_MODE_ICON_COLOR}"):
+            continue  # files written by former versions
+        get_themed_asset_icon(image_path).pixmap(size, size)
 
 
 class ThemedWidget(QWidget):
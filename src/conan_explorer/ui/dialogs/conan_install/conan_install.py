@@ -161,7 +161,9 @@ class ConanInstallDialog(QDialog):
 
     def on_options_query(self, conan_ref: str):
         try:
-            return app.conan_api.get_options_with_default_values(ConanRef.loads(conan_ref))
+            return app.remote_query_cache.get_options_with_default_values(
+                ConanRef.loads(conan_ref)
+            )
         except Exception:
             return {}, {}
 
@@ -243,7 +245,7 @@ class ConanInstallDialog(QDialog):
         message_box.close()
 
     def get_all_pkgs(self, conan_ref: str):
-        return app.conan_api.get_remote_pkgs_from_ref(ConanRef.loads(conan_ref), "all")
+        return app.remote_query_cache.get_remote_pkgs_from_ref(ConanRef.loads(conan_ref), "all")
 
     def show_package_diffs(self, conan_ref: str):
         try:
@@ -1,4 +1,6 @@
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
 
 from conan_unified_api.types import ConanRef
 from PySide6.QtCore import Qt, SignalInstance
@@ -14,16 +16,21 @@ StdButton = QDialogButtonBox.StandardButton
 
 
 class ConanRemoveDialog(QuestionWithItemListDialog):
+    REMOVE_MAX_WORKERS = 4
+
     def __init__(
         self,
         parent: Optional[QWidget],
         conan_refs_with_pkg_ids: Dict[str, List[str]],
         conan_pkg_removed: Optional[SignalInstance] = None,
+        known_sizes_mb: Optional[Dict[Tuple[str, str], float]] = None,
     ):
+        """known_sizes_mb: already calculated sizes by (conan_ref, pkg_id) for the freed MB"""
         super().__init__(parent)
         self.setWindowTitle("Remove Package(s)")
         self.set_question_text("Are you sure you want to remove these packages?")
         self._conan_pkg_removed_sig = conan_pkg_removed
+        self._known_sizes_mb = known_sizes_mb or {}
         for conan_ref, pkg_ids in conan_refs_with_pkg_ids.items():
             for pkg_id in pkg_ids:
                 if not pkg_id:
@@ -44,27 +51,66 @@ class ConanRemoveDialog(QuestionWithItemListDialog):
         )
         self.loader.wait_for_finished()
 
-    def remove(self):
-        """Remove the selected ref or pkg. Emit conan_pkg_removed global signal.
-        To be called while loading dialog is active."""
+    def get_checked_refs_with_pkg_ids(self) -> Dict[str, List[str]]:
+        """Checked items grouped by ref. An empty pkg id stands for the whole ref."""
+        conan_refs_with_pkg_ids: Dict[str, List[str]] = {}
         for list_row in range(self.item_list_widget.count()):
             list_item = self.item_list_widget.item(list_row)
             if list_item.checkState() != Qt.CheckState.Checked:
                 continue
-            conan_ref_with_id = list_item.text()
-            pkg_id = ""
-            if ":" in conan_ref_with_id:
-                conan_ref, pkg_id = conan_ref_with_id.split(":")
-            else:
-                conan_ref = conan_ref_with_id
-            try:
-                self.loader.loading_string_signal.emit(f"Removing {conan_ref} {pkg_id}")
-                # can handle multiple pkgs at once, but then we can't log info for the
-                # progress bar
-                app.conan_api.remove_reference(ConanRef.loads(conan_ref), pkg_id)
-            except Exception as e:
-                Logger().error(f"Error while removing package {conan_ref}: {str(e)}")
-                continue
-            if self._conan_pkg_removed_sig:
+            conan_ref, _, pkg_id = list_item.text().partition(":")
+            conan_refs_with_pkg_ids.setdefault(conan_ref, []).append(pkg_id)
+        return conan_refs_with_pkg_ids
+
+    def remove(self) -> Tuple[int, Optional[float]]:
+        """
+        Remove the selected refs and pkgs. The refs are removed concurrently,
+        but the pkgs of one ref one after another. Emit the conan_pkg_removed global
+        signal for all removed items at the end, so the views can update at once.
+        To be called while loading dialog is active.
+        Returns the number of removed items and the freed MB - None, if the size
+        of a removed item is not known.
+        """
+        conan_refs_with_pkg_ids = self.get_checked_refs_with_pkg_ids()
+        total = sum(len(pkg_ids) for pkg_ids in conan_refs_with_pkg_ids.values())
+        removed: List[Tuple[str, str]] = []
+        freed_mb: Optional[float] = 0.0
+        if not conan_refs_with_pkg_ids:
+            return 0, freed_mb
+        progress_lock = Lock()
+
+        def remove_ref_pkgs(conan_ref: str, pkg_ids: List[str]):
+            nonlocal freed_mb
+            for pkg_id in pkg_ids:
+                try:
+                    # can handle multiple pkgs at once, but then we can't log info for the
+                    # progress bar
+                    app.conan_api.remove_reference(ConanRef.loads(conan_ref), pkg_id)
+                except Exception as e:
+                    Logger().error(f"Error while removing package {conan_ref}: {str(e)}")
+                    continue
+                Logger().info(f"Removing package {conan_ref} {pkg_id} finished")
+                size_mb = self._known_sizes_mb.get((conan_ref, pkg_id))
+                with progress_lock:
+                    removed.append((conan_ref, pkg_id))
+                    # a walk of the folders before removing would take as long as the removal
+                    if freed_mb is not None and size_mb is not None:
+                        freed_mb += size_mb
+                    else:
+                        freed_mb = None
+                    progress_text = f"Removed {len(removed)}/{total} packages"
+                    if freed_mb is not None:
+                        progress_text += f" ({freed_mb:.1f} MB freed)"
+                    self.loader.loading_string_signal.emit(progress_text)
+
+        max_workers = min(self.REMOVE_MAX_WORKERS, len(conan_refs_with_pkg_ids))
+        with ThreadPoolExecutor(max_workers, thread_name_prefix="conan_remove") as executor:
+            for future in [
+                executor.submit(remove_ref_pkgs, conan_ref, pkg_ids)
+                for conan_ref, pkg_ids in conan_refs_with_pkg_ids.items()
+            ]:
+                future.result()
+        if self._conan_pkg_removed_sig:
+            for conan_ref, pkg_id in removed:
                 self._conan_pkg_removed_sig.emit(conan_ref, pkg_id)
-            Logger().info(f"Removing package {conan_ref_with_id} finished")
+        return len(removed), freed_mb
@@ -44,7 +44,12 @@ from conan_explorer.settings import (
 
 from . import recompile_ui_files
 from .common import init_qt_logger, remove_qt_logger
-from .common.theming import get_gui_dark_mode, get_gui_style, get_themed_asset_icon
+from .common.theming import (
+    get_gui_dark_mode,
+    get_gui_style,
+    get_themed_asset_icon,
+    preload_themed_icons,
+)
 from .dialogs import FileEditorSelDialog
 from .fluent_window import FluentWindow, SideSubMenu
 from .plugin import PluginHandler, PluginInterfaceV1
@@ -85,11 +90,16 @@ class MainWindow(FluentWindow):
             self.conan_pkg_installed, self.conan_pkg_removed, self.conan_remotes_updated
         )
         self.model = UiApplicationModel(self.conan_pkg_installed)
+        # cached queries can be outdated after these changes
+        self.conan_pkg_installed.connect(self.on_conan_pkg_installed)
+        self.conan_pkg_removed.connect(self.on_conan_pkg_changed)
+        self.conan_remotes_updated.connect(self.on_conan_remotes_updated)
         self._plugin_handler = PluginHandler(self, self.base_signals, self.page_widgets)
         self.setWindowTitle("")  # app display name is already there
         # connect logger to console widget to log possible errors at init
         init_qt_logger(Logger(), self.qt_logger_name, self.log_console_message)
         self.log_console_message.connect(self.write_log)
+        preload_themed_icons()
         # Default pages
         self.about_page = AboutPage(self, self.base_signals)
         self.plugins_page = PluginsPage(self, self._plugin_handler)
@@ -126,6 +136,22 @@ class MainWindow(FluentWindow):
             sleep(0.1)
         return super().close()
 
+    def on_conan_pkg_installed(self, conan_ref: str, pkg_id: str):
+        """
+        Also emitted for packages, which were only resolved, e.g. by the quicklaunch links
+        at startup. Nothing is invalidated for packages, which are already in the index.
+        """
+        if pkg_id and app.local_pkg_index.has_local_pkg(conan_ref, pkg_id):
+            return
+        self.on_conan_pkg_changed(conan_ref, pkg_id)
+
+    def on_conan_pkg_changed(self, conan_ref: str, pkg_id: str):
+        app.remote_query_cache.invalidate(conan_ref)
+        app.local_pkg_index.invalidate(conan_ref)
+
+    def on_conan_remotes_updated(self):
+        app.remote_query_cache.invalidate()
+
     def on_docs_searched(self):
         extra_addr = ""
         if conan_version.major == 1:
@@ -244,6 +270,9 @@ class MainWindow(FluentWindow):
     def closeEvent(self, event):
         """Remove qt logger, so it doesn't log into a non existant object"""
         self.app_grid.setEnabled(False)  # disable app_grid to signal shutdown
+        self.app_grid.save_pkg_path_cache()
+        self.model.flush()
+        app.remote_query_cache.save()
         try:
             self.log_console_message.disconnect(self.write_log)
         except Exception:
@@ -376,6 +405,7 @@ class MainWindow(FluentWindow):
         activate_theme(self._qt_app)
 
         # all icons must be reloaded
+        preload_themed_icons()
         self.apply_theme()
         for page in self.page_widgets.get_all_pages():
             page.reload_themed_icons()
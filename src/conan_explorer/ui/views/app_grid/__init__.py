@@ -1,5 +1,6 @@
+import time
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Type, TypeVar
+from typing import TYPE_CHECKING, List, Optional, Type, TypeVar
 
 from conan_unified_api.types import ConanPkgRef, ConanRef
 from PySide6.QtCore import Qt, Signal
@@ -61,6 +62,9 @@ class AppGridView(PluginInterfaceV1):
 
         self.model = model
         base_signals.conan_pkg_installed.connect(self.update_conan_info)
+        # instrumentation for the time until the visible tab gets its first package info
+        self._visible_tab_shown_time: Optional[float] = None
+        self.time_to_first_visible_link_s: Optional[float] = None
 
         self.tab_widget.tabBar().setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tab_widget.tabBar().setContentsMargins(0, 0, 0, 0)
@@ -72,6 +76,8 @@ class AppGridView(PluginInterfaceV1):
         self.tab_widget.tabBar().tabMoved.connect(self.on_tab_move)
         if self.tab_widget.count() > 0:  # remove the default tab
             self.tab_widget.removeTab(0)
+        self._previous_tab: Optional[TabListView] = None
+        self.tab_widget.currentChanged.connect(self.on_current_tab_changed)
         self.load_signal.connect(self.load)
 
     def load(self, offset=0):
@@ -85,6 +91,9 @@ class AppGridView(PluginInterfaceV1):
 
         # always show the first tab first
         self.tab_widget.setCurrentIndex(0)
+        self._visible_tab_shown_time = time.monotonic()
+        self.time_to_first_visible_link_s = None
+        self.on_current_tab_changed(self.tab_widget.currentIndex())
 
     def _init_right_menu(self):
         # Right Settings menu
@@ -128,6 +137,11 @@ class AppGridView(PluginInterfaceV1):
             tab.deleteLater()
         self.load(offset)
 
+    def save_pkg_path_cache(self):
+        pkg_path_cache = getattr(self.model, "pkg_path_cache", None)
+        if pkg_path_cache:  # model can still be unloaded
+            pkg_path_cache.save()
+
     def re_init_all_app_links(self, force=False):
         for tab in self.get_tabs():
             tab.redraw(force)
@@ -146,6 +160,36 @@ class AppGridView(PluginInterfaceV1):
         self.model.tabs = reordered_tabs
         self.model.save()
 
+    def on_current_tab_changed(self, index: int):
+        """Resolve the package infos of the visible AppLinks first"""
+        if not app.conan_worker:
+            return
+        current_tab: Optional[TabListView] = self.tab_widget.widget(index)  # type: ignore
+        if self._previous_tab and self._previous_tab is not current_tab:
+            try:
+                app.conan_worker.set_priority(
+                    self._previous_tab.get_conan_refs(), app.conan_worker.PRIORITY_DEFAULT
+                )
+            except RuntimeError:  # tab was already deleted
+                pass
+        self._previous_tab = current_tab
+        if current_tab:
+            app.conan_worker.set_priority(
+                current_tab.get_conan_refs(), app.conan_worker.PRIORITY_HIGH
+            )
+
+    def _record_first_visible_link_resolved(self, conan_ref: str):
+        if self._visible_tab_shown_time is None or self.time_to_first_visible_link_s:
+            return
+        current_tab: Optional[TabListView] = self.tab_widget.currentWidget()  # type: ignore
+        if not current_tab or conan_ref not in current_tab.get_conan_refs():
+            return
+        self.time_to_first_visible_link_s = time.monotonic() - self._visible_tab_shown_time
+        Logger().debug(
+            "Quicklaunch: First visible AppLink resolved after %.2f s",
+            self.time_to_first_visible_link_s,
+        )
+
     def on_tab_context_menu_requested(self, position):
         index = self.tab_widget.tabBar().tabAt(position)
         menu = QMenu()
@@ -277,6 +321,7 @@ class AppGridView(PluginInterfaceV1):
     def update_conan_info(self, conan_ref: str, pkg_id: str):
         if not self.isEnabled():  # the gui is about to shut down
             return
+        self._record_first_visible_link_resolved(conan_ref)
         try:
             for tab in self.get_tabs():
                 for app_link in tab.app_links:
@@ -304,7 +349,8 @@ class AppGridView(PluginInterfaceV1):
                             app_link.model.set_package_folder(
                                 app.conan_api.get_package_folder(
                                     ConanRef.loads(conan_ref), pkg_id
-                                )
+                                ),
+                                pkg_id=pkg_id,
                             )
                         else:
                             app_link.model.load_from_cache()
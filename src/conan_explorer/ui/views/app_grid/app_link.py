@@ -1,13 +1,15 @@
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional
 
+from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import QDialog, QFrame, QMessageBox, QWidget
 from typing_extensions import override
 
+import conan_explorer.app as app  # using global module pattern
 from conan_explorer import ICON_SIZE, INVALID_PATH
 from conan_explorer.app.logger import Logger
 from conan_explorer.app.system import run_file
-from conan_explorer.ui.common import ThemedWidget, measure_font_width
+from conan_explorer.ui.common import ThemedWidget, get_themed_asset_icon, measure_font_width
 from conan_explorer.ui.dialogs.reorder import ReorderDialog
 
 from .dialogs import AppEditDialog
@@ -47,6 +49,7 @@ class ListAppLink(QFrame, ThemedWidget):
         self.setObjectName(repr(self))
         self.icon_size = icon_size
         self.model = model
+        self._icon_request = 0  # only the icon of the last request is shown
         self._parent_tab = parent_tab  # save parent - don't use qt signals ands slots
 
         from .app_link_ui import Ui_Form
@@ -154,7 +157,7 @@ class ListAppLink(QFrame, ThemedWidget):
     def _apply_new_config(self):
         self._ui.app_name_label.setText(self.model.name)
         self._ui.conan_ref_value_label.setText(self.model.conan_ref)
-        self._ui.app_button.set_icon(self.model.get_icon())
+        self._load_icon()
         self._ui.executable_value_label.setText(self.model.executable)
         self._ui.arguments_value_label.setText(self.model.args)
         self._ui.open_shell_checkbox.setChecked(self.model.is_console_application)
@@ -195,14 +198,33 @@ class ListAppLink(QFrame, ThemedWidget):
             self.model.save()
             self._parent_tab.redraw(force=True)
 
+    def _load_icon(self):
+        """Show a placeholder icon, until the icon is loaded in the background"""
+        if self._ui.app_button.icon().isNull():
+            self._ui.app_button.set_icon(get_themed_asset_icon("icons/app.svg"))
+        self._icon_request += 1
+        icon_request = self._icon_request
+
+        def on_icon_loaded(icon: QIcon):
+            if icon_request != self._icon_request:  # superseded by a newer request
+                return
+            try:
+                self._ui.app_button.set_icon(icon)
+            except RuntimeError:  # link was already deleted
+                return
+
+        self.model.load_icon(on_icon_loaded)
+
     def update_icon(self):
-        self._ui.app_button.set_icon(self.model.get_icon())
+        self._load_icon()
         if self.model.get_executable_path() != Path(INVALID_PATH):
             self._ui.app_button.ungrey_icon()
 
     def on_click(self):
         """Callback for opening the executable on click"""
         if not self.model.get_executable_path().is_file():
+            if self.ask_to_cancel_running_install():
+                return
             Logger().error(
                 (
                     "Can't find file in package "
@@ -213,6 +235,36 @@ class ListAppLink(QFrame, ThemedWidget):
             self.model.get_executable_path(), self.model.is_console_application, self.model.args
         )
 
+    def ask_to_cancel_running_install(self) -> bool:
+        """
+        Offer to cancel a stuck install of the package of this link.
+        Returns True, if an install is running.
+        """
+        if not app.conan_worker:
+            return False
+        running_tasks = [
+            task for task in app.conan_worker.get_tasks(self.model.conan_ref) if task.started
+        ]
+        if not running_tasks:
+            return False
+        task = running_tasks[0]
+        message_box = QMessageBox(parent=self)
+        message_box.setWindowTitle("Package installation running")
+        message_box.setText(
+            f"The package for {self.model.conan_ref} is still being processed "
+            f"({task.stage.name}, {int(task.duration_s)} s).\n"
+            "Do you want to cancel the installation?"
+        )
+        message_box.setStandardButtons(
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        message_box.setIcon(QMessageBox.Icon.Question)
+        if message_box.exec() == QMessageBox.StandardButton.Yes:
+            for task in running_tasks:
+                task.cancel()
+            Logger().info(f"Cancelled installation of {self.model.conan_ref}")
+        return True
+
     def apply_conan_info(self):
         """Update with new conan data"""
         self.update_icon()
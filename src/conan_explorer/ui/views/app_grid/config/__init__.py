@@ -4,7 +4,7 @@ this is a bit overblown for this usecase, but it is worth an experiment """
 
 from abc import abstractmethod
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from conan_explorer import INVALID_CONAN_REF, PathLike
 
@@ -51,11 +51,12 @@ class UiConfig():
     app_grid: UiAppGridConfig = field(default_factory=UiAppGridConfig)
 
 
-def ui_config_factory(type: str, source: PathLike) -> "UiConfigInterface":
+def ui_config_factory(type: str, source: PathLike,
+                      local_copy_dir: Optional[PathLike] = None) -> "UiConfigInterface":
 
     if type == UI_CONFIG_JSON_TYPE:
         from .json_file import JsonUiConfig
-        implementation = JsonUiConfig(source)
+        implementation = JsonUiConfig(source, local_copy_dir)
     else:
         raise NotImplementedError
     return implementation
@@ -87,3 +88,13 @@ class UiConfigInterface():
     @abstractmethod
     def save(self, app_config: UiConfig):
         raise NotImplementedError
+
+    @abstractmethod
+    def serialize(self, app_config: UiConfig) -> Dict[str, Any]:
+        """ Convert to a plain structure - call it from the thread owning the models """
+        raise NotImplementedError
+
+    @abstractmethod
+    def write(self, data: Dict[str, Any]):
+        """ Write the serialized structure - can be called from any thread """
+        raise NotImplementedError
@@ -1,7 +1,8 @@
+import hashlib
 import json
 from dataclasses import asdict
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Type, TypeVar
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, List, Optional, Type, TypeVar
 
 import jsonschema
 from packaging.version import Version
@@ -21,6 +22,7 @@ else:
 
 from conan_explorer import PathLike, asset_path
 from conan_explorer.app.logger import Logger
+from conan_explorer.app.system import delete_path, write_file_atomically
 
 # Internal represantation of JSON save format
 
@@ -39,8 +41,24 @@ class ConanOptionConfig(TypedDict):
 
 class JsonUiConfig(UiConfigInterface, metaclass=SignatureCheckMeta):
 
-    def __init__(self, json_file_path: PathLike):
+    # schema and validator are loaded only once
+    _json_schema: ClassVar[Optional[Dict[str, Any]]] = None
+    _schema_validator: ClassVar[Optional[Any]] = None
+    # file path -> content hash of the last successfully validated content
+    _validated_hashes: ClassVar[Dict[str, str]] = {}
+    LOCAL_COPY_VERSION = 1  # increment, if the format changes - old files will be discarded
+
+    def __init__(self, json_file_path: PathLike, local_copy_dir: Optional[PathLike] = None):
+        """
+        With a local copy dir, the parsed and migrated file is stored there and used instead,
+        as long as the file is unchanged. Speeds up loading large files on network drives.
+        """
         self._json_file_path = Path(json_file_path)
+        self._local_copy_path: Optional[Path] = None
+        if local_copy_dir:
+            path_hash = hashlib.sha256(str(self._json_file_path.resolve()).encode("utf-8"))
+            local_copy_name = f"ui_config_{path_hash.hexdigest()[:16]}.json"
+            self._local_copy_path = Path(local_copy_dir) / local_copy_name
 
         # create file, if not available for first start
         if not self._json_file_path.exists():
@@ -53,6 +71,31 @@ class JsonUiConfig(UiConfigInterface, metaclass=SignatureCheckMeta):
     def get_file_ext(cls):
         return ".json"
 
+    @classmethod
+    def get_json_schema(cls) -> Dict[str, Any]:
+        if cls._json_schema is None:
+            with open(asset_path / "config_schema.json") as schema_file:
+                cls._json_schema = json.load(schema_file)
+        return cls._json_schema  # type: ignore
+
+    @classmethod
+    def get_latest_version(cls) -> str:
+        return cls.get_json_schema().get("properties", {}).get("version", {}).get("enum")[-1]
+
+    @classmethod
+    def validate(cls, json_app_config: JsonAppConfig):
+        """ Validate against the schema with a validator, which is compiled only once """
+        if cls._schema_validator is None:
+            json_schema = cls.get_json_schema()
+            validator_type = jsonschema.validators.validator_for(json_schema)
+            validator_type.check_schema(json_schema)
+            cls._schema_validator = validator_type(json_schema)
+        # raise the same error as jsonschema.validate would
+        error = jsonschema.exceptions.best_match(
+            cls._schema_validator.iter_errors(json_app_config))
+        if error is not None:
+            raise error
+
     T = TypeVar('T', bound="UiTabConfig | UiAppLinkConfig")
     @staticmethod
     def _convert_to_config_type(dict: Dict[str, Any], config_type: Type[T]) -> T:
@@ -78,42 +121,92 @@ class JsonUiConfig(UiConfigInterface, metaclass=SignatureCheckMeta):
 
     def load(self) -> UiConfig:
         """ Parse the json config file, validate and convert to object structure """
-        json_app_config: JsonAppConfig = {"version": "0.0.0", "tabs": []}
         Logger().debug("Quicklaunch: Loading file '%s'...", self._json_file_path)
-
-        with open(asset_path / "config_schema.json") as schema_file:
-            json_schema = json.load(schema_file)
-
-        with open(str(self._json_file_path)) as fp:
-            if fp.read():
-                fp.seek(0)
-                try:
-                    json_app_config = json.load(fp)
-                    jsonschema.validate(instance=json_app_config, schema=json_schema)
-                except Exception as e:
-                    Logger().error(f"Quicklaunch: Failed validating:\n{str(e)}")
-                    return UiConfig()
-
-        # implement subsequent migration functions
-        self.migrate_to_0_3_0(json_app_config)
-        self.migrate_to_0_4_0(json_app_config)
-
-        # build the object abstraction and update
+        json_app_config = self._read_local_copy()
+        if json_app_config is None:
+            json_app_config = self._read_file()
+            if json_app_config is None:
+                return UiConfig()
+            self._write_local_copy(json_app_config)
+
+        # build the object abstraction
         tabs_result: List[UiTabConfig] = []
         for tab_dict in json_app_config.get("tabs", {}):
             tab_result = self._convert_to_config_type(tab_dict, UiTabConfig)
             tabs_result.append(tab_result)
+        return UiConfig(UiAppGridConfig(tabs=tabs_result))
 
-        # auto update version to last version
-        json_app_config["version"] = json_schema.get("properties").get("version").get("enum")[-1]
+    def _read_file(self) -> Optional[JsonAppConfig]:
+        """ Read, validate and migrate the file. Writes it back, only if it was updated. """
+        json_app_config: JsonAppConfig = {"version": "0.0.0", "tabs": []}
+        content = self._json_file_path.read_bytes()
+        if content:
+            # skip validation, if the content is unchanged since the last validation
+            content_hash = hashlib.sha256(content).hexdigest()
+            file_key = str(self._json_file_path.resolve())
+            try:
+                json_app_config = json.loads(content)
+                if self._validated_hashes.get(file_key) != content_hash:
+                    self.validate(json_app_config)
+                    self._validated_hashes[file_key] = content_hash
+            except Exception as e:
+                Logger().error(f"Quicklaunch: Failed validating:\n{str(e)}")
+                return None
 
-        # write it back with updates
-        with open(str(self._json_file_path), "w") as config_file:
-            json.dump(json_app_config, config_file, indent=4)
-        return UiConfig(UiAppGridConfig(tabs=tabs_result))
+        # implement subsequent migration functions
+        migrated = self.migrate_to_0_3_0(json_app_config)
+        migrated |= self.migrate_to_0_4_0(json_app_config)
+
+        # auto update version to last version
+        latest_version = self.get_latest_version()
+        if not content or json_app_config["version"] != latest_version:
+            json_app_config["version"] = latest_version
+            migrated = True
+
+        # write it back only with updates
+        if migrated:
+            Logger().debug("Quicklaunch: Writing updated file '%s'", self._json_file_path)
+            write_file_atomically(self._json_file_path, json.dumps(json_app_config, indent=4))
+        return json_app_config
+
+    def _get_file_state(self) -> List[int]:
+        stat = self._json_file_path.stat()
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _read_local_copy(self) -> Optional[JsonAppConfig]:
+        """ Get the already migrated content, if the file did not change since """
+        if not self._local_copy_path or not self._local_copy_path.exists():
+            return None
+        try:
+            local_copy = json.loads(self._local_copy_path.read_text())
+            json_app_config: JsonAppConfig = local_copy["config"]
+            if (local_copy.get("version") == self.LOCAL_COPY_VERSION
+                    and local_copy.get("source") == str(self._json_file_path)
+                    and local_copy.get("file_state") == self._get_file_state()
+                    and json_app_config.get("version") == self.get_latest_version()):
+                Logger().debug("Quicklaunch: Using local copy '%s'", self._local_copy_path)
+                return json_app_config
+        except Exception:  # possibly corrupt, delete local copy
+            Logger().debug("Quicklaunch: Can't read local copy, deleting it.")
+            delete_path(self._local_copy_path)
+        return None
+
+    def _write_local_copy(self, json_app_config: JsonAppConfig):
+        if not self._local_copy_path:
+            return
+        local_copy = {"version": self.LOCAL_COPY_VERSION, "source": str(self._json_file_path),
+                      "file_state": self._get_file_state(), "config": json_app_config}
+        try:
+            write_file_atomically(self._local_copy_path, json.dumps(local_copy))
+        except Exception as e:
+            Logger().debug(f"Quicklaunch: Can't write local copy: {str(e)}")
 
     def save(self, app_config: UiConfig):
         """ Create json dict from model and write it to path. """
+        self.write(self.serialize(app_config))
+
+    def serialize(self, app_config: UiConfig) -> Dict[str, Any]:
+        """ Create json dict from model """
         tabs = app_config.app_grid.tabs
         tabs_data = []
         for tab in tabs:
@@ -126,31 +219,37 @@ class JsonUiConfig(UiConfigInterface, metaclass=SignatureCheckMeta):
                 app_dict["conan_options"] = opt_list
             tabs_data.append(tab_dict)
 
-        # get last version
-        with open(asset_path / "config_schema.json") as schema_file:
-            json_schema = json.load(schema_file)
-        version = json_schema.get("properties").get("version").get("enum")[-1]
-        json_app_config: JsonAppConfig = {"version": version, "tabs": tabs_data}
+        json_app_config: JsonAppConfig = {
+            "version": self.get_latest_version(), "tabs": tabs_data}
+        return json_app_config  # type: ignore
 
-        with open(str(self._json_file_path), "w") as config_file:
-            json.dump(json_app_config, config_file, indent=2)
+    def write(self, data: Dict[str, Any]):
+        """ Write the json dict to path and update the local copy """
+        write_file_atomically(self._json_file_path, json.dumps(data, indent=2))
+        self._write_local_copy(data)  # type: ignore
 
-    def migrate_to_0_3_0(self, app_config: JsonAppConfig):
-        """ Compatibility function to update schema version. """
+    def migrate_to_0_3_0(self, app_config: JsonAppConfig) -> bool:
+        """ Compatibility function to update schema version. Returns, if it changed. """
         if Version(app_config["version"]) >= Version("0.3.0"):
-            return
+            return False
+        changed = False
         for tab in app_config["tabs"]:
             for app in tab["apps"]:
                 if app.get("package_id"):
                     value = app.pop("package_id")
                     app["conan_ref"] = value
+                    changed = True
+        return changed
 
-    def migrate_to_0_4_0(self, app_config: JsonAppConfig):
-        """ Compatibility function to update schema version. """
+    def migrate_to_0_4_0(self, app_config: JsonAppConfig) -> bool:
+        """ Compatibility function to update schema version. Returns, if it changed. """
         if Version(app_config["version"]) >= Version("0.4.0"):
-            return
+            return False
+        changed = False
         for tab in app_config["tabs"]:
             for app in tab["apps"]:
                 if app.get("console_application"):
                     value = app.pop("console_application")
                     app["is_console_application"] = value
+                    changed = True
+        return changed
@@ -1,11 +1,18 @@
 
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from threading import Thread
+from typing import Any, Dict, Optional
+
+from PySide6.QtCore import QTimer
 
 import conan_explorer.app as app  # using global module pattern
 from conan_explorer import (DEFAULT_UI_CFG_FILE_NAME,
                                 LEGACY_UI_CFG_FILE_NAME, legacy_user_save_path,
                                 user_save_path)
+from conan_explorer.app.logger import Logger
+from conan_explorer.app.system import str2bool
 from conan_explorer.settings import AUTO_INSTALL_QUICKLAUNCH_REFS, LAST_CONFIG_FILE
 from . import (UI_CONFIG_JSON_TYPE, UiConfig,
                         UiConfigInterface, get_ui_config_file_ext, ui_config_factory)
@@ -15,6 +22,8 @@ from ..model import UiAppGridModel
 
 class UiApplicationModel(UiConfig):
     CONFIG_TYPE = UI_CONFIG_JSON_TYPE
+    SAVE_DELAY_MS = 500
+    LOCAL_COPY_DIR = user_save_path / "ui_config_cache"
 
     def __init__(self, conan_pkg_installed=None, *args, **kwargs):
         """ Create an empty AppModel on init, so we can load it later"""
@@ -22,11 +31,48 @@ class UiApplicationModel(UiConfig):
         self.app_grid: UiAppGridModel
         self._ui_config_data: Optional[UiConfigInterface] = None
         self.conan_pkg_installed = conan_pkg_installed
+        self._save_pending = False
+        # one writer, so that the writes keep their order
+        self._write_executor = ThreadPoolExecutor(1, "ui_config_writer")
+        self._write_future: Optional[Future] = None
 
     def save(self):
-        """ Save configuration """
-        if self._ui_config_data:
+        """
+        Save configuration. All changes within a short delay are saved at once
+        and the file is written in the background.
+        """
+        if not self._ui_config_data:
+            return
+        if str2bool(os.getenv("DISABLE_ASYNC_LOADER", "")):
             self._ui_config_data.save(self)
+            return
+        if self._save_pending:
+            return
+        self._save_pending = True
+        QTimer.singleShot(self.SAVE_DELAY_MS, self._write_pending_changes)
+
+    def flush(self):
+        """ Write pending changes now and wait until the file is written """
+        self._write_pending_changes()
+        if self._write_future:
+            self._write_future.result()
+            self._write_future = None
+
+    def _write_pending_changes(self):
+        if not self._save_pending or not self._ui_config_data:
+            return
+        self._save_pending = False
+        # serialize here - the models must not be read from another thread
+        data = self._ui_config_data.serialize(self)
+        self._write_future = self._write_executor.submit(
+            self._write, self._ui_config_data, data)
+
+    @staticmethod
+    def _write(ui_config_data: UiConfigInterface, data: Dict[str, Any]):
+        try:
+            ui_config_data.write(data)
+        except Exception as e:
+            Logger().error(f"Quicklaunch: Can't save config file: {str(e)}")
 
     def load(self, ui_config: UiConfig) -> "UiApplicationModel":
         """ Load the model and submodels from the config object """
@@ -37,9 +83,26 @@ class UiApplicationModel(UiConfig):
             app.conan_worker.finish_working(3)
             app.conan_worker.update_all_info(self.app_grid.get_all_conan_worker_elements(),
                                              self.emit_conan_pkg_signal_callback)
-
+        elif app.conan_api:
+            self.revalidate_pkg_paths()
         return self
 
+    def revalidate_pkg_paths(self):
+        """
+        The links start with the package paths of the last run.
+        Check them in the background, so that newer matching packages are picked up.
+        """
+        links = []
+        for tab in self.app_grid.tabs:
+            for app_link in tab.apps:
+                links.append((app_link.conan_ref, dict(app_link.conan_options)))
+        revalidate_args = (app.conan_api, links, self.emit_conan_pkg_signal_callback)
+        if str2bool(os.getenv("DISABLE_ASYNC_LOADER", "")):
+            self.app_grid.pkg_path_cache.revalidate(*revalidate_args)
+            return
+        Thread(target=self.app_grid.pkg_path_cache.revalidate, args=revalidate_args,
+               name="pkg_path_revalidation", daemon=True).start()
+
     def emit_conan_pkg_signal_callback(self, conan_ref: str, pkg_id: str):
         if not self.conan_pkg_installed:
             return
@@ -47,6 +110,7 @@ class UiApplicationModel(UiConfig):
 
     def loadf(self, config_source: str) -> "UiApplicationModel":
         """ Load model and submodels from specified file source """
+        self.flush()  # changes belong to the previous file
         # empty ui config, create it in user path
         file_ext = get_ui_config_file_ext(self.CONFIG_TYPE)
         default_config_file_path = user_save_path / (DEFAULT_UI_CFG_FILE_NAME + file_ext)
@@ -54,7 +118,9 @@ class UiApplicationModel(UiConfig):
             config_source = str(default_config_file_path)
             app.active_settings.set(LAST_CONFIG_FILE, str(config_source))
 
-        self._ui_config_data = ui_config_factory(self.CONFIG_TYPE, config_source)
+        self.LOCAL_COPY_DIR.mkdir(parents=True, exist_ok=True)
+        self._ui_config_data = ui_config_factory(
+            self.CONFIG_TYPE, config_source, self.LOCAL_COPY_DIR)
         ui_config = self._ui_config_data.load()
 
         self.load(ui_config)
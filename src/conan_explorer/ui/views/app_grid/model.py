@@ -1,6 +1,6 @@
 import platform
 from pathlib import Path
-from typing import Callable, List, Optional, Union
+from typing import Callable, List, Optional, Tuple, Union
 
 from conan_unified_api.types import ConanRef
 from PySide6.QtCore import QAbstractListModel, QModelIndex, QObject, QPersistentModelIndex, Qt
@@ -12,14 +12,21 @@ from conan_explorer import (
     INVALID_CONAN_REF,
     INVALID_PATH,
     USE_CONAN_WORKER_FOR_LOCAL_PKG_PATH_AND_INSTALL,
+    user_save_path,
 )
 from conan_explorer.app.logger import Logger
-from conan_explorer.conan_wrapper.conan_worker import ConanWorkerElement
+from conan_explorer.conan_wrapper.pkg_path_cache import ConanPkgPathCache
+from conan_explorer.conan_wrapper.conan_worker import (
+    ConanWorker,
+    ConanWorkerElement,
+    ConanWorkerTask,
+)
 from conan_explorer.settings import AUTO_INSTALL_QUICKLAUNCH_REFS
 from conan_explorer.ui.common import (
     extract_icon,
     get_asset_image_path,
     get_icon_from_image_file,
+    get_icon_loader,
     get_themed_asset_icon,
 )
 
@@ -31,6 +38,8 @@ class UiAppGridModel(UiAppGridConfig, QObject):
         UiAppGridConfig.__init__(self, *args, **kwargs)
         QObject.__init__(self)
         self.tabs: List[UiTabModel]
+        # resolved package paths of the last run - must be available before the links load
+        self.pkg_path_cache = ConanPkgPathCache(user_save_path)
 
     def save(self):
         if self.parent:
@@ -44,11 +53,13 @@ class UiAppGridModel(UiAppGridConfig, QObject):
         for tab_config in self.tabs:
             tabs_model.append(UiTabModel().load(tab_config, self))
         self.tabs = tabs_model
+        self.pkg_path_cache.save()
         return self
 
     def get_all_conan_worker_elements(self) -> List[ConanWorkerElement]:
         """Helper function to generate a unique list of all ConanWorkerElements"""
         conan_refs: List[ConanWorkerElement] = []
+        element_keys = set()
         for tab in self.tabs:
             for app_model in tab.apps:
                 conan_worker_element: ConanWorkerElement = {
@@ -59,7 +70,9 @@ class UiAppGridModel(UiAppGridConfig, QObject):
                     "profile": "",
                     "auto_install": True,
                 }
-                if conan_worker_element not in conan_refs:
+                element_key = ConanWorker.get_element_key(conan_worker_element)
+                if element_key not in element_keys:
+                    element_keys.add(element_key)
                     conan_refs.append(conan_worker_element)
         return conan_refs
 
@@ -159,6 +172,8 @@ class UiAppLinkModel(UiAppLinkConfig):
         self.parent = UiTabModel("default")
         # can be registered from external function to notify when conan infos habe been fetched asynchronnaly
         self._update_cbk_func: Optional[Callable] = None
+        # last request to the conan worker - to be cancelled, if superseded by a new one
+        self._conan_worker_task: Optional[ConanWorkerTask] = None
         # calls public functions, every internal variable needs to initialitzed
         super().__init__(*args, **kwargs)  # empty init
 
@@ -185,6 +200,13 @@ class UiAppLinkModel(UiAppLinkConfig):
         if self.parent:  # delegate to top
             self.parent.save()
 
+    def _get_pkg_path_cache(self) -> Optional[ConanPkgPathCache]:
+        """The cache is held by the app grid, which is not available for unparented links"""
+        try:
+            return self.parent.parent.pkg_path_cache
+        except AttributeError:
+            return None
+
     def load_from_cache(self):
         if not app.conan_api:
             return
@@ -195,8 +217,16 @@ class UiAppLinkModel(UiAppLinkConfig):
             )
         )
 
+        # try the paths resolved in the last run, the worker revalidates them in background
+        pkg_path_cache = self._get_pkg_path_cache()
+        if pkg_path_cache:
+            cached_pkg = pkg_path_cache.get_package(self._conan_ref, self.conan_options)
+            if cached_pkg:
+                self.set_package_folder(cached_pkg[1], quiet=True)
+                return
+
         # try to get from local
-        _, pkg_path = app.conan_api.get_best_matching_local_package_path(
+        pkg_id, pkg_path = app.conan_api.get_best_matching_local_package_path(
             self._conan_file_reference, self.conan_options
         )
         if self.conan_options:
@@ -210,11 +240,11 @@ class UiAppLinkModel(UiAppLinkConfig):
         if (
             not pkg_path.exists() and not USE_CONAN_WORKER_FOR_LOCAL_PKG_PATH_AND_INSTALL
         ):  # last chance to get path
-            _, pkg_path = app.conan_api.get_path_with_auto_install(
+            pkg_id, pkg_path = app.conan_api.get_path_with_auto_install(
                 self._conan_file_reference, self.conan_options
             )
 
-        self.set_package_folder(pkg_path, quiet=True)
+        self.set_package_folder(pkg_path, quiet=True, pkg_id=pkg_id)
 
     def register_update_callback(self, update_func: Callable):
         """This callback can be used to update the gui after new conan info was received"""
@@ -262,9 +292,12 @@ class UiAppLinkModel(UiAppLinkConfig):
                 "update": True,
                 "auto_install": True,
             }
-            app.conan_worker.put_ref_in_install_queue(
+            last_task = self._conan_worker_task
+            self._conan_worker_task = app.conan_worker.put_ref_in_install_queue(
                 conan_worker_element, self.emit_conan_pkg_signal_callback
             )
+            if last_task and last_task is not self._conan_worker_task:
+                app.conan_worker.cancel_request(last_task, self.emit_conan_pkg_signal_callback)
         except Exception as e:
             # errors happen fairly often, keep going
             Logger().warning(f"Conan reference invalid {str(e)}")
@@ -399,9 +432,25 @@ class UiAppLinkModel(UiAppLinkConfig):
     def get_executable_path(self) -> Path:
         if not self._executable or not self.package_folder.exists():
             return Path(INVALID_PATH)
+        pkg_path_cache = self._get_pkg_path_cache()
+        if pkg_path_cache:
+            cached_path = pkg_path_cache.get_executable_path(
+                self._conan_ref, self.conan_options, self.package_folder, self._executable
+            )
+            if cached_path and cached_path.exists():
+                self._executable_path = cached_path
+                return self._executable_path
         path = Path(self._executable)
         full_path = self.resolve_executable_path(path)
         self._executable_path = full_path
+        if pkg_path_cache and full_path != Path(INVALID_PATH):
+            pkg_path_cache.set_executable_path(
+                self._conan_ref,
+                self.conan_options,
+                self.package_folder,
+                self._executable,
+                full_path,
+            )
 
         return self._executable_path
 
@@ -473,15 +522,35 @@ class UiAppLinkModel(UiAppLinkConfig):
             icon_path = Path(get_asset_image_path("icons/" + icon))
         return icon_path
 
+    def get_icon_source(self) -> Tuple[Path, bool]:
+        """File with the icon and if the icon must be extracted from it (the executable)"""
+        if not self._icon:
+            return self.get_executable_path(), True
+        return self._eval_icon_path(), False
+
     def get_icon(self) -> QIcon:
         """Get an icon based on icon path"""
         icon = None
 
-        if not self._icon:
-            icon = extract_icon(self.get_executable_path())
+        icon_path, extract = self.get_icon_source()
+        if extract:
+            icon = extract_icon(icon_path)
         else:
-            icon = get_icon_from_image_file(self._eval_icon_path())
+            icon = get_icon_from_image_file(icon_path)
+        return self._get_icon_or_placeholder(icon)
 
+    def load_icon(self, callback: Callable[[QIcon], None]):
+        """
+        Get the icon like get_icon, but read and decode it in the background.
+        The source is evaluated here, because it changes the model.
+        The callback is called in the GUI thread, when it is loaded.
+        """
+        icon_path, extract = self.get_icon_source()
+        get_icon_loader().load_icon(
+            icon_path, extract, lambda icon: callback(self._get_icon_or_placeholder(icon))
+        )
+
+    def _get_icon_or_placeholder(self, icon: QIcon) -> QIcon:
         # default icon, until package path is updated
         if icon.isNull():
             icon = get_themed_asset_icon("icons/app.svg")
@@ -489,7 +558,7 @@ class UiAppLinkModel(UiAppLinkConfig):
                 Logger().debug("Can't find icon %s for '%s'", self._icon, self.name)
         return icon
 
-    def set_package_folder(self, package_folder: Path, quiet=False):
+    def set_package_folder(self, package_folder: Path, quiet=False, pkg_id=""):
         """
         Sets package path and all dependent paths.
         Use, when conan operation is done and paths can be validated.
@@ -497,6 +566,11 @@ class UiAppLinkModel(UiAppLinkConfig):
         """
 
         self.package_folder = package_folder
+        pkg_path_cache = self._get_pkg_path_cache()
+        if pkg_path_cache:
+            pkg_path_cache.set_package(
+                self._conan_ref, self.conan_options, pkg_id, package_folder
+            )
 
         if not quiet and not package_folder.exists():
             Logger().info(
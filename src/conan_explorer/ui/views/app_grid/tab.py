@@ -53,6 +53,10 @@ class TabListView(QWidget):
         # spacer for compressing app links, when hiding cboxes
         self.tab_layout.addItem(self._v_spacer)
 
+    def get_conan_refs(self) -> List[str]:
+        """All conan refs of the AppLinks in this tab"""
+        return [app_model.conan_ref for app_model in self.model.apps]
+
     def open_app_link_add_dialog(self, new_model: Optional[UiAppLinkModel] = None):
         if not new_model:
             new_model = UiAppLinkModel()
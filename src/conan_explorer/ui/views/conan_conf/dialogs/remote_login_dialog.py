@@ -5,7 +5,6 @@ from conan_unified_api.types import Remote  # using global module pattern
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QDialog, QListWidgetItem, QWidget
 
-import conan_explorer.app as app
 from conan_explorer.app import LoaderGui
 from conan_explorer.ui.common.theming import get_themed_asset_icon
 from conan_explorer.ui.views.conan_conf.remotes_controller import ConanRemoteController
@@ -35,9 +34,9 @@ class RemoteLoginDialog(QDialog):
         self._ui = Ui_Dialog()
         self._ui.setupUi(self)
 
-        # set username, form first name match
+        # set username, form first name match - known from the remotes table
         for remote in remotes:
-            (name, _) = app.conan_api.get_remote_user_info(remote.name)
+            (name, _) = remotes_controller.get_remote_user_info(remote.name)
             if name:
                 self._ui.name_line_edit.setText(name)
                 break
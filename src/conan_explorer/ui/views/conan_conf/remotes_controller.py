@@ -1,17 +1,24 @@
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 from conan_unified_api.types import Remote
 from PySide6.QtCore import QItemSelectionModel, QModelIndex, Qt, SignalInstance
 from PySide6.QtWidgets import QApplication, QDialog, QListWidgetItem, QStyle, QTreeView
 
-import conan_explorer.app as app
 from conan_explorer.app.logger import Logger
 from conan_explorer.ui.dialogs import QuestionWithItemListDialog, ReorderController
 
 from .remotes_model import RemotesModelItem, RemotesTableModel
 
 
+def get_server_url(remote_url: str) -> str:
+    """Scheme, host and port of a remote url - remotes of a server share the credentials"""
+    return "/".join(remote_url.split("/")[0:3])
+
+
 class ConanRemoteController:
+    LOGIN_MAX_WORKERS = 8
+
     def __init__(
         self, view: QTreeView, conan_remotes_updated: Optional[SignalInstance]
     ) -> None:
@@ -86,15 +93,39 @@ class ConanRemoteController:
         self.notify_remotes_updates()
 
     def login_remotes(self, remotes: List[str], user: str, pwd: str):
-        for remote in remotes:
-            # will be canceled after the first error, so no lockout will occur,
-            # because of multiple incorrect logins error is printed on the console
+        """
+        Login to the remotes grouped by their server. The servers are logged in concurrently.
+        The other remotes of a server are logged in concurrently, after the login to its
+        first remote succeeded - so wrong credentials are only tried once per server
+        and no lockout will occur. The results are shown in the table as they complete.
+        """
+        remotes_by_server: Dict[str, List[str]] = {}
+        for remote_name in remotes:
+            remote = self._model.get_remote(remote_name)
+            server_url = get_server_url(remote.url) if remote else remote_name
+            remotes_by_server.setdefault(server_url, []).append(remote_name)
+        if not remotes_by_server:
+            return
+
+        def login(remote_name: str) -> bool:
             try:
-                self._model.update_login_info(remote, user, pwd)
-            except Exception as e:
-                Logger().error(f"Can't sign in to {remote}: {str(e)}")
-                return
-            Logger().info(f"Successfully logged in to {remote}")
+                self._model.update_login_info(remote_name, user, pwd)
+            except Exception as e:  # error is printed on the console
+                Logger().error(f"Can't sign in to {remote_name}: {str(e)}")
+                return False
+            Logger().info(f"Successfully logged in to {remote_name}")
+            return True
+
+        with ThreadPoolExecutor(self.LOGIN_MAX_WORKERS, "remote_login") as executor:
+            first_remotes = [server_remotes[0] for server_remotes in remotes_by_server.values()]
+            logged_in = list(executor.map(login, first_remotes))
+            other_remotes = [
+                remote_name
+                for server_remotes, success in zip(remotes_by_server.values(), logged_in)
+                if success
+                for remote_name in server_remotes[1:]
+            ]
+            list(executor.map(login, other_remotes))
 
     def on_remove(self):
         remote_items = self.get_selected_remotes()
@@ -132,15 +163,16 @@ class ConanRemoteController:
             return
         QApplication.clipboard().setText(remote_item.name)
 
+    def get_remote_user_info(self, remote_name: str) -> Tuple[str, bool]:
+        return self._model.get_user_info(remote_name)
+
     def get_selected_remote(self) -> Optional[Remote]:
         indexes = self._view.selectedIndexes()
         if len(indexes) == 0:  # can be multiple - always get 0
             Logger().debug("No selected item for context action")
             return None
         remote_model: RemotesModelItem = indexes[0].internalPointer()  # type: ignore
-        for remote in app.conan_api.get_remotes(include_disabled=True):
-            if remote.name == remote_model.name:
-                return remote
+        return self._model.get_remote(remote_model.name)
 
     def get_selected_remotes(self) -> List[Remote]:
         indexes = self._view.selectedIndexes()
@@ -150,7 +182,7 @@ class ConanRemoteController:
             if index.column() != 0:  # we only need a row once
                 continue
             remote_model: RemotesModelItem = index.internalPointer()  # type: ignore
-            for remote in app.conan_api.get_remotes(include_disabled=True):
-                if remote.name == remote_model.name:
-                    remotes.append(remote)
+            remote = self._model.get_remote(remote_model.name)
+            if remote:
+                remotes.append(remote)
         return remotes
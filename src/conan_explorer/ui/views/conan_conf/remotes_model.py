@@ -1,12 +1,16 @@
-from typing import List, Optional
+import os
+from concurrent.futures import TimeoutError, as_completed
+from threading import Thread
+from typing import Dict, List, Optional, Tuple
 
 from conan_unified_api.types import ConanException, Remote
-from PySide6.QtCore import QModelIndex, QPersistentModelIndex, Qt
+from PySide6.QtCore import QModelIndex, QPersistentModelIndex, Qt, Signal, SignalInstance
 from PySide6.QtGui import QFont
 from typing_extensions import override
 
 import conan_explorer.app as app  # using global module pattern
 from conan_explorer.app.logger import Logger
+from conan_explorer.app.system import str2bool, submit_to_daemon_threads
 from conan_explorer.ui.common import TreeModel, TreeModelItem
 
 
@@ -51,28 +55,99 @@ class RemotesTableModel(TreeModel):
     """
     Remotes displayed as a table with detail info - implemented as a tree with one level:
     this is necessary, because list model cannot have a header and multiple columns and a
-    table looks like an ugly Excel clone
+    table looks like an ugly Excel clone.
+    The remotes are shown immediately, the user info needs a request to every remote,
+    so it is loaded concurrently in the background and the last known info is shown until then.
     """
 
+    USER_COLUMN = 3
+    AUTH_COLUMN = 4
+    USER_INFO_MAX_WORKERS = 8
+    USER_INFO_TIMEOUT_S = 10.0
+
+    # generation, remote name, user, auth
+    _user_info_loaded: SignalInstance = Signal(int, str, str, bool)  # type: ignore
+
     def __init__(self, *args, **kwargs):
         super(RemotesTableModel, self).__init__(checkable=True, *args, **kwargs)
         self.root_item = TreeModelItem(["Name", "URL", "SSL", "User", "Authenticated"])
+        # remote name -> user, auth
+        self._user_infos: Dict[str, Tuple[str, bool]] = {}
+        self._generation = 0  # results of an older setup are discarded
+        self._user_info_loaded.connect(self._on_user_info_loaded)
         self.setup_model_data()
 
     def setup_model_data(self):
         self.clear_items()
         self.beginResetModel()
+        self._generation += 1
+        remote_names = []
         for remote in app.conan_api.get_remotes(include_disabled=True):
-            user_name = ""
-            auth = False
-            try:
-                user_name, auth = app.conan_api.get_remote_user_info(remote.name)
-            # Throws an error on older conan version, if a remote is disabled
-            except ConanException:
-                Logger().debug("", exc_info=True)
+            user_name, auth = self._user_infos.get(remote.name, ("", False))
             remote_item = RemotesModelItem(remote, user_name, auth, self.root_item)
             self.root_item.append_child(remote_item)
+            remote_names.append(remote.name)
         self.endResetModel()
+        if not remote_names:
+            return
+        # for debug purposes only
+        if str2bool(os.getenv("DISABLE_ASYNC_LOADER", "")):
+            self.load_user_infos(self._generation, remote_names)
+            return
+        Thread(
+            target=self.load_user_infos,
+            args=(self._generation, remote_names),
+            name="remote_user_infos",
+            daemon=True,
+        ).start()
+
+    def load_user_infos(self, generation: int, remote_names: List[str]):
+        """
+        Request the user info of all remotes concurrently. Remotes, which do not answer
+        within the timeout, keep their last known info.
+        """
+        user_info_futures = submit_to_daemon_threads(
+            app.conan_api.get_remote_user_info,
+            remote_names,
+            self.USER_INFO_MAX_WORKERS,
+            "remote_user_info",
+        )
+        futures = dict(zip(user_info_futures, remote_names))
+        try:
+            for future in as_completed(futures, self.USER_INFO_TIMEOUT_S):
+                try:
+                    user_name, auth = future.result()
+                # Throws an error on older conan version, if a remote is disabled
+                except ConanException:
+                    Logger().debug("", exc_info=True)
+                    user_name, auth = "", False
+                except Exception as e:
+                    Logger().debug(f"Can't get user info of {futures[future]}: {str(e)}")
+                    continue
+                self._user_info_loaded.emit(generation, futures[future], user_name, auth)
+        except TimeoutError:
+            for future, remote_name in futures.items():
+                if not future.done():
+                    Logger().debug(f"Timeout while getting user info of {remote_name}")
+        except RuntimeError:  # Qt object is already deleted
+            pass
+        finally:  # don't wait for unreachable remotes
+            for future in futures:
+                future.cancel()
+
+    def _on_user_info_loaded(self, generation: int, remote_name: str, user: str, auth: bool):
+        self._user_infos[remote_name] = (user, auth)
+        if generation != self._generation:
+            return
+        item = self._get_item(remote_name)
+        if not item:
+            return
+        item.user = user
+        item.auth = auth
+        index = self.get_index_from_item(item)
+        self.dataChanged.emit(
+            index.siblingAtColumn(self.USER_COLUMN), index.siblingAtColumn(self.AUTH_COLUMN)
+        )
 
     @override
     def data(self, index, role):
@@ -112,6 +187,7 @@ class RemotesTableModel(TreeModel):
 
     def remove(self, remote_name: str):
         app.conan_api.remove_remote(remote_name)
+        self._user_infos.pop(remote_name, None)
         index = self.get_index_from_ref(remote_name)
         item: RemotesModelItem = index.internalPointer()  # type: ignore
         super().remove_item(item)
@@ -119,6 +195,8 @@ class RemotesTableModel(TreeModel):
 
     def rename(self, remote: Remote, new_name):
         app.conan_api.rename_remote(remote.name, new_name)
+        if remote.name in self._user_infos:
+            self._user_infos[new_name] = self._user_infos.pop(remote.name)
         index = self.get_index_from_ref(remote.name)
         item: RemotesModelItem = index.internalPointer()  # type: ignore
         item.name = new_name
@@ -133,11 +211,9 @@ class RemotesTableModel(TreeModel):
         item.disabled = remote.disabled
 
     def update_login_info(self, remote_name: str, user: str, pwd: str):
+        """Can be called from any thread - the table is updated in the GUI thread"""
         app.conan_api.login_remote(remote_name, user, pwd)
-        index = self.get_index_from_ref(remote_name)
-        item: RemotesModelItem = index.internalPointer()  # type: ignore
-        item.auth = True
-        item.user = user
+        self._user_info_loaded.emit(self._generation, remote_name, user, True)
 
     def save(self):
         """Update every remote with new index and then save to conan remotes file"""
@@ -164,7 +240,24 @@ class RemotesTableModel(TreeModel):
         return super().moveRow(sourceParent, sourceRow, destinationParent, destinationChild)
 
     def get_index_from_ref(self, conan_ref: str) -> Optional[QModelIndex]:
-        for ref in self.items():
-            if ref.name == conan_ref:
-                return self.get_index_from_item(ref)
+        item = self._get_item(conan_ref)
+        if item:
+            return self.get_index_from_item(item)
+        return None
+
+    def _get_item(self, remote_name: str) -> Optional[RemotesModelItem]:
+        for item in self.items():
+            if item.name == remote_name:
+                return item
         return None
+
+    def get_user_info(self, remote_name: str) -> Tuple[str, bool]:
+        """Last known user and auth of a remote, without a request to the remote"""
+        return self._user_infos.get(remote_name, ("", False))
+
+    def get_remote(self, remote_name: str) -> Optional[Remote]:
+        """The remote as it is currently shown, without reading the remotes again"""
+        item = self._get_item(remote_name)
+        if not item:
+            return None
+        return Remote(item.name, item.url, item.verify_ssl, item.disabled)
@@ -31,42 +31,36 @@ class ConanSearchController(QObject):
         self._remote_list = remote_list
         self._detail_view = detail_view
         self._model = PkgSearchModel()
-        self._loader = LoaderGui(self)
+        self._model.search_finished.connect(self._finish_load_search_model)
         self.conan_pkg_installed = conan_pkg_installed
         self.conan_pkg_removed = conan_pkg_removed
 
     def on_search(self):
         """Search for the user entered text by re-initing the model"""
-        # IMPORTANT! if put in async loading, the pyqt signal of the model will be created in another Qt thread
-        # and not be able to emit to the GUI thread.
         if not self._search_button.isEnabled():
             return
+        # a new search supersedes the running one
+        self._model.search_finished.disconnect(self._finish_load_search_model)
+        self._model.cancel_search()
+        # IMPORTANT! The model must be created in the GUI thread, so the results,
+        # which are sent from the search thread are inserted in the GUI thread.
         self._model = PkgSearchModel(self.conan_pkg_installed, self.conan_pkg_removed)
-        self._loader.load(
-            self._view,
-            self._load_search_model,
-            (),
-            self._finish_load_search_model,
-            "Searching for packages...",
-        )
+        self._model.search_finished.connect(self._finish_load_search_model)
+        # show the model immediately - results are inserted as the remotes answer
+        self._view.setModel(self._model.proxy_model)
+        self._view.sortByColumn(1, Qt.SortOrder.AscendingOrder)  # sort by remote at default
+        self._view.selectionModel().selectionChanged.connect(self.on_package_selected)
+        self._model.start_search(self._search_line.text(), self.get_selected_remotes())
 
         # reset info text
         self._detail_view.setText("")
 
-    def _load_search_model(self):
-        """Initialize tree view model by searching in conan"""
-        self._model.setup_model_data(
-            self._search_line.text(),
-            self.get_selected_remotes(),
-            self._loader.loading_string_signal,
-        )
+    def wait_for_search_finished(self):
+        self._model.wait_for_search_finished()
 
-    def _finish_load_search_model(self, ret=None):
+    def _finish_load_search_model(self):
         """After conan search adjust the view"""
-        self._view.setModel(self._model.proxy_model)
         self._resize_search_result_columns()
-        self._view.sortByColumn(1, Qt.SortOrder.AscendingOrder)  # sort by remote at default
-        self._view.selectionModel().selectionChanged.connect(self.on_package_selected)
         self._search_line.load_completion_refs()
 
     def on_package_selected(self):
@@ -1,13 +1,17 @@
-from typing import Dict, List, Optional
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from threading import Event, Thread
+from typing import Dict, List, Optional, Tuple
 
 from conan_unified_api.types import ConanPkg, ConanRef
 from PySide6 import QtCore, QtGui, QtWidgets
-from PySide6.QtCore import Qt, SignalInstance, Slot
+from PySide6.QtCore import Qt, Signal, SignalInstance, Slot
 from typing_extensions import override
 
 import conan_explorer.app as app
-from conan_explorer.app import LoaderGui  # using global module pattern
 from conan_explorer.app.logger import Logger
+from conan_explorer.app.system import str2bool, submit_to_daemon_threads
 from conan_explorer.conan_wrapper import ConanApiFactory
 from conan_explorer.ui.common import (
     TreeModel,
@@ -26,6 +30,8 @@ class SearchedPackageTreeItem(TreeModelItem):
     1. ref/id 2. remote 3. quick profile
     """
 
+    __slots__ = ("type", "pkg_info", "is_installed", "empty", "is_loading")
+
     def __init__(
         self,
         data: List[str],
@@ -41,61 +47,81 @@ class SearchedPackageTreeItem(TreeModelItem):
         self.pkg_info = pkg_info
         self.is_installed = installed
         self.empty = empty  # indicates a "no result" item, which must be handled separately
+        self.is_loading = False  # packages are fetched in the background
         self.child_items: List[SearchedPackageTreeItem] = []
 
     # @override
-    def load_children(self, update_sig):
+    def load_children(self):
         # can't call super method: fetching would finish early
-        self.child_items = []
+        self.child_items = self.get_packages()
+        self.is_loaded = True
 
+    def get_packages(self) -> List["SearchedPackageTreeItem"]:
+        """
+        Get the packages of all remotes of this recipe concurrently and merge them by id.
+        Returns a "No package found" item, if there are none.
+        """
+        recipe_ref = ConanRef.loads(self.data(0))
+        remotes = self.data(1).split(",")
         pkgs_to_be_added: Dict[str, SearchedPackageTreeItem] = {}
-        for remote in self.data(1).split(","):
-            update_sig.emit("Loading from " + str(remote))
-            recipe_ref = self.data(0)
-            # cross reference with installed packages
+        with ThreadPoolExecutor(len(remotes) + 1, thread_name_prefix="conan_pkgs") as executor:
+            # cross reference with installed packages - only needed once for all remotes
+            local_pkgs_future = executor.submit(
+                app.local_pkg_index.get_local_pkgs_from_ref, recipe_ref
+            )
+            remote_pkgs_futures = [
+                executor.submit(
+                    app.remote_query_cache.get_remote_pkgs_from_ref, recipe_ref, remote
+                )
+                for remote in remotes
+            ]
             try:
-                infos = app.conan_api.get_local_pkgs_from_ref(ConanRef.loads(recipe_ref))
+                installed_ids = [info.get("id") for info in local_pkgs_future.result()]
             except Exception:
-                infos = []
-            installed_ids = [info.get("id") for info in infos]
-            packages = app.conan_api.get_remote_pkgs_from_ref(
-                ConanRef.loads(recipe_ref), remote
-            )
-            for pkg in packages:
-                pkg_id = pkg.get("id", "")
-                if pkg_id in pkgs_to_be_added.keys():  # package already found in another remote
-                    pkgs_to_be_added[pkg_id].item_data[1] += "," + remote
+                installed_ids = []
+            # merge in the order of the remotes, regardless which one answered first
+            for remote, remote_pkgs_future in zip(remotes, remote_pkgs_futures):
+                try:
+                    packages = remote_pkgs_future.result()
+                except Exception as e:
+                    Logger().error(f"Error while getting packages from {remote}: {str(e)}")
                     continue
-                installed = False
-                if pkg_id in installed_ids:
-                    installed = True
-                pkgs_to_be_added[pkg_id] = SearchedPackageTreeItem(
-                    [
-                        pkg_id,
-                        remote,
-                        ConanApiFactory().build_conan_profile_name_alias(
-                            pkg.get("settings", {})
-                        ),
-                    ],
-                    self,
-                    pkg,
-                    PROFILE_TYPE,
-                    False,
-                    installed,
-                )
-        for pkg in pkgs_to_be_added.values():
-            self.child_items.append(pkg)
-        if not self.child_items:
-            self.child_items.append(
+                for pkg in packages:
+                    pkg_id = pkg.get("id", "")
+                    # package already found in another remote
+                    if pkg_id in pkgs_to_be_added.keys():
+                        pkgs_to_be_added[pkg_id].item_data[1] += "," + remote
+                        continue
+                    installed = False
+                    if pkg_id in installed_ids:
+                        installed = True
+                    pkgs_to_be_added[pkg_id] = SearchedPackageTreeItem(
+                        [
+                            pkg_id,
+                            remote,
+                            ConanApiFactory().build_conan_profile_name_alias(
+                                pkg.get("settings", {})
+                            ),
+                        ],
+                        self,
+                        pkg,
+                        PROFILE_TYPE,
+                        False,
+                        installed,
+                    )
+        if not pkgs_to_be_added:
+            return [
                 SearchedPackageTreeItem(
                     ["No package found", "", ""], self, {}, PROFILE_TYPE, empty=True
                 )
-            )
-        self.is_loaded = True
+            ]
+        return list(pkgs_to_be_added.values())
 
     @override
     def child_count(self) -> int:
         if self.type == REF_TYPE:
+            if self.parent() is None:  # root item has no dummy child
+                return len(self.child_items)
             return len(self.child_items) if len(self.child_items) > 0 else 1
         elif self.type == PROFILE_TYPE:
             return 0  # no child
@@ -113,6 +139,21 @@ class SearchedPackageTreeItem(TreeModelItem):
 
 
 class PkgSearchModel(TreeModel):
+    """
+    Model for the results of a recipe search in multiple remotes.
+    The search runs in the background and the results of every remote are
+    inserted, as soon as it answers, so the view stays usable while searching.
+    """
+
+    SEARCH_TIMEOUT_S = 30.0  # max. time to wait for the answer of a single remote
+    POLL_INTERVAL_S = 0.1
+
+    search_progress: SignalInstance = Signal(str)  # type: ignore
+    search_finished: SignalInstance = Signal()  # type: ignore
+    # remote, list of (recipe, installed)
+    _search_results_received: SignalInstance = Signal(str, list)  # type: ignore
+    _packages_loaded: SignalInstance = Signal(object, list)  # type: ignore
+
     def __init__(
         self,
         conan_pkg_installed: Optional[SignalInstance] = None,
@@ -125,61 +166,184 @@ class PkgSearchModel(TreeModel):
         self.proxy_model = QtCore.QSortFilterProxyModel()  # for sorting
         self.proxy_model.setDynamicSortFilter(True)
         self.proxy_model.setSourceModel(self)
-        self._loader_widget_parent = None
+        self._search_cancelled = Event()
+        self._search_thread: Optional[Thread] = None
+        self._searched_remotes: List[str] = []
+        self._items_by_key: Dict[str, SearchedPackageTreeItem] = {}  # type: ignore
+        self._status_item: Optional[SearchedPackageTreeItem] = None
+        self.is_searching = False
+        self.search_progress.connect(self._on_search_progress)
+        self._search_results_received.connect(self._add_search_results)
+        self.search_finished.connect(self._on_search_finished)
+        self._packages_loaded.connect(self._on_packages_loaded)
         if conan_pkg_installed:
             conan_pkg_installed.connect(self.mark_pkg_as_installed)
         if conan_pkg_removed:
             conan_pkg_removed.connect(self.mark_pkg_as_not_installed)
 
-    def setup_model_data(self, search_query: str, remotes: List[str], update_sig):
-        # needs to be ConanRef, so we can check with get_all_local_refs directly
-        self.clear_items()
+    def setup_model_data(self, search_query: str, remotes: List[str]):
+        """Search in the remotes and wait, until all of them answered or timed out"""
+        self._init_search(remotes)
+        self.search_in_remotes(search_query, remotes)
+
+    def start_search(self, search_query: str, remotes: List[str]):
+        """Search in the remotes without blocking - results are inserted as they arrive"""
+        self._init_search(remotes)
+        # for debug purposes only
+        if str2bool(os.getenv("DISABLE_ASYNC_LOADER", "")):
+            self.search_in_remotes(search_query, remotes)
+            return
+        self._search_thread = Thread(
+            target=self.search_in_remotes,
+            args=(search_query, remotes),
+            name="conan_search",
+            daemon=True,
+        )
+        self._search_thread.start()
+
+    def wait_for_search_finished(self):
+        while self.is_searching:
+            time.sleep(0.01)
+            QtWidgets.QApplication.processEvents()
+
+    def cancel_search(self):
+        """Stop waiting for remotes, which did not answer yet"""
+        self._search_cancelled.set()
+
+    def _init_search(self, remotes: List[str]):
+        """Clear the results and show a status item while searching"""
         self.beginResetModel()
-        recipes_with_remotes: Dict[ConanRef, str] = {}
-        for remote in remotes:
-            update_sig.emit("Searching in " + str(remote))
-            try:
-                recipe_list = app.conan_api.search_recipes_in_remotes(
-                    f"{search_query}*", remote_name=remote
-                )
-            except Exception as e:
-                Logger().error(f"Error while searching in {remote}: {str(e)}")
-            for recipe in recipe_list:
-                current_value = recipes_with_remotes.get(recipe, "")
-                if current_value:
-                    recipes_with_remotes[recipe] = current_value + "," + remote
-                else:  # element 0
-                    recipes_with_remotes[recipe] = remote
-
-        if not recipes_with_remotes:
-            self.root_item.append_child(
-                SearchedPackageTreeItem(
-                    ["No package found!", "", ""],
-                    self.root_item,
-                    None,
-                    PROFILE_TYPE,
-                    empty=True,
-                )
-            )
+        self.root_item.child_items.clear()
+        self._items_by_key.clear()
+        self._searched_remotes = list(remotes)
+        self._status_item = SearchedPackageTreeItem(
+            ["Searching...", "", ""], self.root_item, None, PROFILE_TYPE, empty=True
+        )
+        self.root_item.append_child(self._status_item)
+        self.is_searching = True
+        self._search_cancelled.clear()
+        self.endResetModel()
+
+    def search_in_remotes(self, search_query: str, remotes: List[str]):
+        """
+        Search in all remotes concurrently, so that the total time is determined
+        by the slowest remote instead of the sum of all.
+        Remotes, which do not answer in time or after a cancel are skipped.
+        The results of every remote are sent to the model, as soon as it answers.
+        """
+        if not remotes:
+            self.search_finished.emit()
             return
+        self.search_progress.emit("Searching in " + ", ".join(remotes))
+        futures = submit_to_daemon_threads(
+            lambda remote: app.remote_query_cache.search_recipes_in_remotes(
+                f"{search_query}*", remote_name=remote
+            ),
+            remotes,
+            len(remotes),
+            "conan_search",
+        )
+        pending: Dict[Future, str] = dict(zip(futures, remotes))
+        deadline = time.monotonic() + self.SEARCH_TIMEOUT_S
+        # add info if it is installed - the remotes are already searching meanwhile
+        try:
+            # the local cache can be changed from the command line, so don't trust the index
+            app.local_pkg_index.invalidate()
+            installed_refs = set(app.local_pkg_index.get_all_local_refs())
+        except Exception as e:
+            Logger().debug(f"Can't get installed recipes: {str(e)}")
+            installed_refs = set()
+        while pending and not self._search_cancelled.is_set():
+            remaining_s = deadline - time.monotonic()
+            if remaining_s <= 0:
+                break
+            done, _ = wait(
+                pending, min(remaining_s, self.POLL_INTERVAL_S), return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                remote = pending.pop(future)
+                try:
+                    recipe_list = future.result()
+                except Exception as e:
+                    Logger().error(f"Error while searching in {remote}: {str(e)}")
+                    continue
+                self._search_results_received.emit(
+                    remote, [(recipe, recipe in installed_refs) for recipe in recipe_list]
+                )
+                if pending:
+                    self.search_progress.emit("Searching in " + ", ".join(pending.values()))
+        for remote in pending.values():
+            if self._search_cancelled.is_set():
+                Logger().info(f"Search in {remote} was cancelled.")
+            else:
+                Logger().error(f"Search in {remote} timed out.")
+        # don't wait for the remotes, which did not answer - their results are discarded
+        for future in pending:
+            future.cancel()
+        self.search_finished.emit()
 
-        # add info if it is installed
-        installed_refs = app.conan_api.get_all_local_refs()
-        for recipe in recipes_with_remotes:
-            recipe_remotes = recipes_with_remotes.get(recipe, "")
-            installed = False
-            if recipe in installed_refs:
-                installed = True
-            conan_item = SearchedPackageTreeItem(
-                [str(recipe), recipe_remotes, ""],
+    @Slot(str, list)
+    def _add_search_results(self, remote: str, recipes: List[Tuple[ConanRef, bool]]):
+        """Insert new recipes and merge the remote into already found ones"""
+        new_items: List[SearchedPackageTreeItem] = []
+        for recipe, installed in recipes:
+            item = self._items_by_key.get(str(recipe))
+            if item:  # already found in another remote
+                # keep the order of the remotes stable, regardless, which one answered first
+                recipe_remotes = item.data(1).split(",") + [remote]
+                recipe_remotes.sort(key=self._get_remote_order)
+                item.item_data[1] = ",".join(recipe_remotes)
+                remote_index = self.index(item.row(), 1, QtCore.QModelIndex())
+                self.dataChanged.emit(remote_index, remote_index)
+                continue
+            item = SearchedPackageTreeItem(
+                [str(recipe), remote, ""],
                 self.root_item,
                 None,
                 REF_TYPE,
                 lazy_loading=True,
                 installed=installed,
             )
-            self.root_item.append_child(conan_item)
-        self.endResetModel()
+            self._items_by_key[str(recipe)] = item
+            new_items.append(item)
+        if not new_items:
+            return
+        first_row = len(self.root_item.child_items)
+        self.beginInsertRows(QtCore.QModelIndex(), first_row, first_row + len(new_items) - 1)
+        self.root_item.child_items.extend(new_items)
+        self.endInsertRows()
+
+    def _get_remote_order(self, remote: str) -> int:
+        try:
+            return self._searched_remotes.index(remote)
+        except ValueError:
+            return len(self._searched_remotes)
+
+    @Slot(str)
+    def _on_search_progress(self, text: str):
+        if not self._status_item:
+            return
+        self._status_item.item_data[0] = text
+        status_index = self.index(self._status_item.row(), 0, QtCore.QModelIndex())
+        self.dataChanged.emit(status_index, status_index)
+
+    @Slot()
+    def _on_search_finished(self):
+        """Remove the status item or replace it with a "No package found!" info"""
+        self.is_searching = False
+        status_item = self._status_item
+        self._status_item = None
+        if not status_item:
+            return
+        if not self._items_by_key:
+            status_item.item_data[0] = "No package found!"
+            status_index = self.index(status_item.row(), 0, QtCore.QModelIndex())
+            self.dataChanged.emit(status_index, status_index)
+            return
+        row = status_item.row()
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        self.root_item.remove_child(status_item)
+        self.endRemoveRows()
 
     @override
     def data(self, index: "QtCore.QModelIndex | QtCore.QPersistentModelIndex", role: int = 0):
@@ -203,10 +367,7 @@ class PkgSearchModel(TreeModel):
         return None
 
     def get_item_from_ref(self, conan_ref: str) -> Optional[SearchedPackageTreeItem]:
-        for item in self.root_item.child_items:
-            if item.item_data[0] == conan_ref:
-                return item
-        return None
+        return self._items_by_key.get(conan_ref)
 
     @Slot(str, str)
     def mark_pkg_as_installed(self, conan_ref: str, pkg_id: str):
@@ -234,13 +395,44 @@ class PkgSearchModel(TreeModel):
 
     @override
     def fetchMore(self, index):
-        item = index.internalPointer()
-        loader = LoaderGui(self)
-        self._loader_widget_parent = QtWidgets.QWidget()
-        loader.load_for_blocking(
-            self._loader_widget_parent,
-            item.load_children,
-            (loader.loading_string_signal,),
-            loading_text="Loading Packages...",
+        """Show a placeholder and load the packages in the background"""
+        item: SearchedPackageTreeItem = index.internalPointer()  # type: ignore
+        if item.is_loading:
+            return
+        item.is_loading = True
+        item.is_loaded = True  # don't fetch again
+        # the placeholder takes the dummy row, so the row count does not change
+        item.child_items = [
+            SearchedPackageTreeItem(
+                ["Loading packages...", "", ""], item, {}, PROFILE_TYPE, empty=True
+            )
+        ]
+        # for debug purposes only
+        if str2bool(os.getenv("DISABLE_ASYNC_LOADER", "")):
+            self._load_packages(item)
+            return
+        Thread(
+            target=self._load_packages, args=(item,), name="conan_pkgs", daemon=True
+        ).start()
+
+    def _load_packages(self, item: SearchedPackageTreeItem):
+        self._packages_loaded.emit(item, item.get_packages())
+
+    @Slot(object, list)
+    def _on_packages_loaded(
+        self, item: SearchedPackageTreeItem, packages: List[SearchedPackageTreeItem]
+    ):
+        """Replace the placeholder with the first package and insert the others after it"""
+        if self.get_item_by_key(item.data(0)) is not item:  # removed or searched again
+            return
+        parent_index = self.index(item.row(), 0, QtCore.QModelIndex())
+        item.child_items[0] = packages[0]
+        self.dataChanged.emit(
+            self.index(0, 0, parent_index),
+            self.index(0, self.root_item.column_count() - 1, parent_index),
         )
-        loader.wait_for_finished()
+        if len(packages) > 1:
+            self.beginInsertRows(parent_index, 1, len(packages) - 1)
+            item.child_items.extend(packages[1:])
+            self.endInsertRows()
+        item.is_loading = False
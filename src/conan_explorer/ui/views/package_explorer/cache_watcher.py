@@ -0,0 +1,154 @@
+import os
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Dict, Optional, Set
+
+from conan_unified_api.types import ConanRef
+from PySide6.QtCore import QFileSystemWatcher, QObject, Signal, SignalInstance
+
+from conan_explorer import conan_version
+from conan_explorer.app.logger import Logger
+from conan_explorer.conan_wrapper.local_pkg_index import query_cache_database_v2
+
+
+class ConanCacheWatcher(QObject):
+    """
+    Watches the conan storage path for added or removed packages, e.g. by an install
+    from the command line. Changes are detected by comparing snapshots, which are taken
+    periodically, and are reported with the changed refs. For Conan V1 the snapshot
+    holds the modification times of the storage folders, for Conan V2 the revisions
+    and packages of all refs in the cache database.
+    A file system watcher on the storage path triggers an immediate check.
+    """
+
+    POLL_INTERVAL_S = 5.0
+    # folder depth to the package ids: name/version/user/channel/package/<id>
+    SNAPSHOT_DEPTH = 5
+    USE_CACHE_DATABASE = conan_version.major == 2  # flat storage: p/<hash>
+
+    # set of the changed refs
+    cache_changed: SignalInstance = Signal(object)  # type: ignore
+
+    def __init__(
+        self, parent: Optional[QObject], storage_path: Path, poll_interval_s=POLL_INTERVAL_S
+    ):
+        super().__init__(parent)
+        self._storage_path = storage_path
+        self.poll_interval_s = poll_interval_s
+        # is kept when stopped, so changes in the meantime are reported after a restart
+        self._snapshot: Optional[Dict[str, str]] = None
+        self._snapshot_lock = Lock()
+        self._wakeup = Event()
+        self._stop = Event()  # every watch thread has its own
+        self._watch_thread: Optional[Thread] = None
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.directoryChanged.connect(self.request_check)
+
+    @property
+    def is_running(self) -> bool:
+        return self._watch_thread is not None and self._watch_thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return
+        if self._storage_path.is_dir():
+            self._fs_watcher.addPath(str(self._storage_path))
+        self._stop = Event()
+        self._watch_thread = Thread(
+            target=self._watch, args=(self._stop,), name="conan_cache_watcher", daemon=True
+        )
+        self._watch_thread.start()
+
+    def stop(self):
+        """Does not wait for a running check - its result is discarded"""
+        if self._fs_watcher.directories():
+            self._fs_watcher.removePaths(self._fs_watcher.directories())
+        self._stop.set()
+        self._wakeup.set()
+        self._watch_thread = None
+
+    def request_check(self):
+        """Don't wait for the next poll"""
+        self._wakeup.set()
+
+    def _watch(self, stop: Event):
+        while not stop.is_set():
+            changed_refs = self.check_for_changes(stop)
+            if changed_refs:
+                try:
+                    self.cache_changed.emit(changed_refs)
+                except RuntimeError:  # Qt object is already deleted
+                    return
+            self._wakeup.wait(self.poll_interval_s)
+            self._wakeup.clear()
+
+    def check_for_changes(self, stop: Optional[Event] = None) -> Set[str]:
+        """
+        Compare a new snapshot to the last one and return the changed refs.
+        The first snapshot is only the base. Nothing is compared, if stop is set meanwhile.
+        """
+        snapshot = self.take_snapshot()
+        with self._snapshot_lock:
+            if snapshot is None or (stop is not None and stop.is_set()):
+                return set()
+            last_snapshot = self._snapshot
+            self._snapshot = snapshot
+        if last_snapshot is None:
+            return set()
+        changed_keys = {
+            key
+            for key in snapshot.keys() | last_snapshot.keys()
+            if snapshot.get(key) != last_snapshot.get(key)
+        }
+        changed_refs = {self._get_ref(key) for key in changed_keys} - {""}
+        if changed_refs:
+            Logger().debug("Conan cache has changed: %s", ", ".join(sorted(changed_refs)))
+        return changed_refs
+
+    def take_snapshot(self) -> Optional[Dict[str, str]]:
+        """
+        Revisions and packages by ref from the cache database or modification times
+        of all entries of the storage path up to the package ids.
+        None, if the cache database can't be read.
+        """
+        snapshot: Dict[str, str] = {}
+        if self.USE_CACHE_DATABASE:
+            rows = query_cache_database_v2(
+                self._storage_path,
+                "SELECT reference, rrev, '', '' FROM recipes "
+                "UNION SELECT reference, rrev, pkgid, prev FROM packages",
+            )
+            if rows is None:
+                return None
+            for reference, *revisions in sorted(rows, key=str):
+                revisions_key = "|".join(str(revision) for revision in revisions)
+                snapshot[reference] = snapshot.get(reference, "") + revisions_key + ";"
+            return snapshot
+        self._scan_entries(str(self._storage_path), 1, snapshot)
+        return snapshot
+
+    def _get_ref(self, key: str) -> str:
+        """The ref of a snapshot key - empty, if it belongs to no ref"""
+        try:
+            if self.USE_CACHE_DATABASE:
+                return str(ConanRef.loads(key))
+            parts = Path(key).relative_to(self._storage_path).parts
+            if len(parts) < 4:  # above the ref folder: name/version/user/channel
+                return ""
+            return str(ConanRef.loads(f"{parts[0]}/{parts[1]}@{parts[2]}/{parts[3]}"))
+        except Exception:
+            return ""
+
+    def _scan_entries(self, folder: str, depth: int, snapshot: Dict[str, str]):
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
+                        snapshot[entry.path] = str(mtime_ns)
+                        if depth < self.SNAPSHOT_DEPTH and entry.is_dir(follow_symlinks=False):
+                            self._scan_entries(entry.path, depth + 1, snapshot)
+                    except OSError:  # removed meanwhile
+                        continue
+        except OSError:
+            return
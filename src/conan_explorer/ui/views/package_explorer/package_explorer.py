@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING
 
 from conan_unified_api.types import ConanPkg, ConanRef, pretty_print_pkg_info
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QAction, QKeySequence, QResizeEvent, QShowEvent
+from PySide6.QtGui import QAction, QHideEvent, QKeySequence, QResizeEvent, QShowEvent
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QAbstractScrollArea,
@@ -88,7 +88,9 @@ class LocalConanPackageExplorer(PluginInterfaceV1):
         self._init_selection_context_menu()
         self._ui.refresh_button.clicked.connect(self._pkg_sel_ctrl.on_pkg_refresh_clicked)
         self._ui.show_sizes_button.clicked.connect(self.on_show_sizes)
-        self._ui.package_filter_edit.textChanged.connect(self._pkg_sel_ctrl.set_filter_wildcard)
+        self._ui.package_filter_edit.textChanged.connect(
+            self._pkg_sel_ctrl.on_filter_text_changed
+        )
         self._ui.expand_all_button.clicked.connect(self.on_expand_all)
 
         self.conan_pkg_selected.connect(self.on_pkg_selection_change)
@@ -121,8 +123,15 @@ class LocalConanPackageExplorer(PluginInterfaceV1):
     def showEvent(self, a0: QShowEvent) -> None:
         # only update the first time
         self._pkg_sel_ctrl.refresh_pkg_selection_view(force_update=False)
+        self._pkg_sel_ctrl.start_cache_watcher()
         return super().showEvent(a0)
 
+    @override
+    def hideEvent(self, a0: QHideEvent) -> None:
+        # no need to update, while the page is not visible - changes are read on next show
+        self._pkg_sel_ctrl.stop_cache_watcher()
+        return super().hideEvent(a0)
+
     @override
     def resizeEvent(self, a0: QResizeEvent) -> None:
         for pkg_file_exp_ctrl in self._pkg_tabs_ctrl:
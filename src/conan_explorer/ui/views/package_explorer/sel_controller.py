@@ -1,8 +1,15 @@
 from enum import Enum
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
 from conan_unified_api.types import ConanPkg, ConanPkgRef, ConanRef
-from PySide6.QtCore import QItemSelectionModel, QModelIndex, QObject, Qt, SignalInstance
+from PySide6.QtCore import (
+    QItemSelectionModel,
+    QModelIndex,
+    QObject,
+    Qt,
+    QTimer,
+    SignalInstance,
+)
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
     QApplication,
@@ -22,6 +29,7 @@ from conan_explorer.ui.common import ConfigHighlighter, show_conanfile
 from conan_explorer.ui.dialogs import ConanInstallDialog, ConanRemoveDialog
 from conan_explorer.ui.dialogs.pkg_diff.diff import PkgDiffDialog
 
+from .cache_watcher import ConanCacheWatcher
 from .sel_model import PackageFilter, PackageTreeItem, PkgSelectionType, PkgSelectModel
 
 if TYPE_CHECKING:
@@ -39,6 +47,11 @@ class MultiPkgSelectionMode(Enum):
 
 
 class PackageSelectionController(QObject):
+    # wait for an install or remove to settle, before the cache is read again
+    CACHE_UPDATE_DELAY_MS = 1000
+    # filter only, when the user pauses typing
+    FILTER_DELAY_MS = 150
+
     def __init__(
         self,
         parent: QWidget,
@@ -56,6 +69,22 @@ class PackageSelectionController(QObject):
         self._page_widgets = page_widgets
         self._view = view
         self._package_filter_edit = package_filter_edit
+        self._cache_watcher: Optional[ConanCacheWatcher] = None
+        self._changed_refs: Set[str] = set()  # collected, until the update is started
+        self._cache_update_timer = QTimer(self)
+        self._cache_update_timer.setSingleShot(True)
+        self._cache_update_timer.setInterval(self.CACHE_UPDATE_DELAY_MS)
+        self._cache_update_timer.timeout.connect(self.update_pkg_selection_view)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self.set_filter_wildcard)
+        # removals are signalled one by one, but applied to the model at once
+        self._removed_pkgs: List[Tuple[str, str]] = []
+        self._removal_timer = QTimer(self)
+        self._removal_timer.setSingleShot(True)
+        self._removal_timer.setInterval(0)
+        self._removal_timer.timeout.connect(self.apply_removed_pkgs)
 
         base_signals.conan_pkg_removed.connect(self.on_conan_pkg_removed)
 
@@ -92,23 +121,33 @@ class PackageSelectionController(QObject):
         conan_refs_with_pkg_ids = self.get_selected_refs_with_pkg_ids()
         if not conan_refs_with_pkg_ids:
             return
+        known_sizes_mb: Dict[Tuple[str, str], float] = {}
+        if self._model:
+            for conan_ref, pkg_ids in conan_refs_with_pkg_ids.items():
+                for pkg_id in pkg_ids:
+                    size_mb = self._model.get_calculated_size_mb(conan_ref, pkg_id)
+                    if size_mb is not None:
+                        known_sizes_mb[(conan_ref, pkg_id)] = size_mb
         dialog = ConanRemoveDialog(
-            self._view, conan_refs_with_pkg_ids, self._base_signals.conan_pkg_removed
+            self._view,
+            conan_refs_with_pkg_ids,
+            self._base_signals.conan_pkg_removed,
+            known_sizes_mb,
         )
         dialog.show()
 
     def on_conan_pkg_removed(self, conan_ref: str, pkg_id: str):
-        """Remove conan reference if in model"""
+        """Remove conan reference or package if in model - batched with the next removals"""
         if not self._model:  # for None usage
             return
-        ref_row = self.find_item_in_pkg_sel_model(conan_ref, pkg_id)
-        if not ref_row:
-            return
-        proxy_index = self._model.index(ref_row, 0, QModelIndex())
-        item: Optional[PackageTreeItem] = proxy_index.internalPointer()  # type: ignore
-        if not item:
-            return
-        self._model.remove_item(item)
+        self._removed_pkgs.append((conan_ref, pkg_id))
+        self._removal_timer.start()
+
+    def apply_removed_pkgs(self):
+        removed_pkgs = self._removed_pkgs
+        self._removed_pkgs = []
+        if self._model and removed_pkgs:
+            self._model.remove_pkgs(removed_pkgs)
 
     def on_show_build_info(self):
         conan_ref, pkg_id = self.get_selected_ref_with_pkg_id()
@@ -257,7 +296,7 @@ class PackageSelectionController(QObject):
         if self._model and not force_update:  # loads only at first init
             return
         if not self._model:
-            self._model = PkgSelectModel(self._loader.loading_string_signal)
+            self._model = PkgSelectModel()
         self._loader.load(
             self._view,
             self._model.setup_model_data,
@@ -272,59 +311,97 @@ class PackageSelectionController(QObject):
             self._view.selectionModel().selectionChanged.connect(self.on_pkg_selection_change)
             self.set_filter_wildcard()  # re-apply package filter query
             self._view.hideColumn(1)  # don't show size on opening view
+            self.start_cache_watcher()
         else:
             Logger().error("Can't load local packages!")
 
+    def start_cache_watcher(self):
+        """Update the view, when packages are changed outside of the application"""
+        if not self._model:  # nothing to update yet
+            return
+        if not self._cache_watcher:
+            try:
+                storage_path = app.conan_api.get_storage_path()
+            except Exception as e:
+                Logger().debug(f"Can't watch local cache: {str(e)}")
+                return
+            self._cache_watcher = ConanCacheWatcher(self, storage_path)
+            self._cache_watcher.cache_changed.connect(self.on_cache_changed)
+        self._cache_watcher.start()
+
+    def stop_cache_watcher(self):
+        self._cache_update_timer.stop()
+        if self._cache_watcher:
+            self._cache_watcher.stop()
+
+    def on_cache_changed(self, changed_refs: Set[str]):
+        self._changed_refs.update(changed_refs)
+        self._cache_update_timer.start()
+
+    def update_pkg_selection_view(self):
+        """Apply only the changes of the local cache, without reloading the whole view"""
+        changed_refs = self._changed_refs
+        self._changed_refs = set()
+        if not self._model or not self._loader.finished:  # full reload is running
+            return
+        self._model.update_from_local_cache(changed_refs)
+
     def on_show_sizes(self):
         if not self._model:
             return
         if not self._model.show_sizes:
             self._model.show_sizes = True
             self._view.showColumn(1)
-            self._loader.load(
-                self._view,
-                self._model.get_all_sizes,
-                (),
-                self.expand_and_sort_for_sizes,
-                "Calculating Sizes. This can take a while...",
-            )
+            # sizes are inserted in the background - keep the biggest on top meanwhile
+            self._model.proxy_model.setDynamicSortFilter(True)
+            self._model.sizes_calculated.connect(self.on_sizes_calculated)
+            self._view.sortByColumn(1, Qt.SortOrder.DescendingOrder)
+            self._view.header().resizeSections(self._view.header().ResizeMode.Stretch)
+            self._model.start_size_calculation()
         else:
             self._model.show_sizes = False
             self._view.collapseAll()
             self._view.hideColumn(1)
 
-    def expand_and_sort_for_sizes(self):
-        self._view.expandAll()
-        self._view.sortByColumn(1, Qt.SortOrder.DescendingOrder)
-        self._view.header().resizeSections(self._view.header().ResizeMode.Stretch)
+    def on_sizes_calculated(self):
+        if not self._model or self._model.is_calculating_sizes:
+            return
+        self._model.sizes_calculated.disconnect(self.on_sizes_calculated)
+        self._model.proxy_model.setDynamicSortFilter(False)  # performance for filtering
+
+    def on_filter_text_changed(self):
+        self._filter_timer.start()  # restarts, while typing
 
     def set_filter_wildcard(self):
+        self._filter_timer.stop()
         # use strip to remove unnecessary whitespace
         text = self._package_filter_edit.text().strip()  # toPlainText
         if self._model:
-            self._model.proxy_model.setFilterWildcard(text)
+            self._model.proxy_model.set_filter_query(text)
 
     def find_item_in_pkg_sel_model(self, conan_ref: str, pkg_id="") -> int:
         # find the row with the matching reference
         if not self._model:
             return False
-        for ref_row in range(self._model.root_item.child_count()):
-            try:  # try for empty model
-                item = self._model.root_item.child_items[ref_row]
-            except Exception:
-                return -1
-            if item.item_data[0] == conan_ref:
-                if pkg_id:
-                    if item.child_count() < 2:  # try to fetch, pkd_id probably not loaded yet
-                        item.load_children()
-                    for pkg_row in range(item.child_count()):
-                        pkg_item: PackageTreeItem = item.child_items[pkg_row]  # type: ignore
-                        if pkg_item.pkg_info.get("id") == pkg_id:
-                            return ref_row
-                    return -1
-                else:
-                    return ref_row
-        return -1
+        item: Optional[PackageTreeItem] = self._model.get_item_by_key(conan_ref)  # type: ignore
+        if not item:  # editables are not indexed
+            for ref_item in self._model.root_item.child_items:
+                ref_item: PackageTreeItem
+                if ref_item.type == PkgSelectionType.editable:
+                    if ref_item.item_data[0] == conan_ref:
+                        item = ref_item
+                        break
+        if not item:
+            return -1
+        if pkg_id:
+            if item.child_count() < 2:  # try to fetch, pkd_id probably not loaded yet
+                item.load_children()
+            for pkg_row in range(item.child_count()):
+                pkg_item: PackageTreeItem = item.child_items[pkg_row]  # type: ignore
+                if pkg_item.pkg_info.get("id") == pkg_id:
+                    return item.row()
+            return -1
+        return item.row()
 
     def select_local_package_from_ref(
         self,
@@ -343,6 +420,7 @@ class PackageSelectionController(QObject):
 
         # Reset filter, otherwise the element to be shown could be hidden
         self._package_filter_edit.setText("*")
+        self.set_filter_wildcard()  # don't wait for the delayed filter
 
         # find out if we need to find a ref or or a package
         error_message_suffix = " in Local Package Explorer for selection."
@@ -1,14 +1,28 @@
+import os
+import re
 from enum import Enum
-from typing import Any, List, Optional, Union
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from threading import Thread
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from conan_unified_api.types import ConanPkg, ConanRef, pretty_print_pkg_info
-from PySide6.QtCore import QModelIndex, QPersistentModelIndex, QSortFilterProxyModel, Qt
+from PySide6.QtCore import (
+    QModelIndex,
+    QPersistentModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+    Signal,
+    SignalInstance,
+    Slot,
+)
 from PySide6.QtGui import QColor, QFont, QIcon
 from typing_extensions import override
 
 import conan_explorer.app as app  # using global module pattern
 from conan_explorer import conan_version
-from conan_explorer.app.system import get_folder_size_mb
+from conan_explorer.app.logger import Logger
+from conan_explorer.app.system import FOLDER_SIZE_MAX_WORKERS, get_folder_size_mb, str2bool
 from conan_explorer.conan_wrapper import ConanApiFactory
 from conan_explorer.conan_wrapper.conan_cleanup import ConanCleanup
 from conan_explorer.ui.common import (
@@ -19,6 +33,9 @@ from conan_explorer.ui.common import (
 )
 
 
+EXPORT_SIZE_KEY = "export"
+
+
 class PkgSelectionType(Enum):
     ref = 0
     pkg = 1
@@ -29,6 +46,8 @@ class PkgSelectionType(Enum):
 class PackageTreeItem(TreeModelItem):
     """Represents a tree item of a Conan pkg. To be used for the parent (ref) and the child (Profile)"""
 
+    __slots__ = ("pkg_info", "type", "invalid", "size_mb", "pkg_sizes")
+
     def __init__(
         self,
         data: List[str],
@@ -41,6 +60,9 @@ class PackageTreeItem(TreeModelItem):
         self.pkg_info: ConanPkg = pkg_info
         self.type = item_type
         self.invalid = invalid
+        self.size_mb = 0.0  # numeric value of the size column for sorting
+        # for ref items: already calculated sizes of the children by pkg id or export
+        self.pkg_sizes: Dict[str, float] = {}
         if item_type == PkgSelectionType.pkg:
             self.item_data[0] = self.get_quick_profile_name()
 
@@ -51,12 +73,16 @@ class PackageTreeItem(TreeModelItem):
         pkg_item = PackageTreeItem(["export", "0"], self, PkgSelectionType.export, ConanPkg())
         pkg_item.is_loaded = True
         self.append_child(pkg_item)
-        infos = app.conan_api.get_local_pkgs_from_ref(ConanRef.loads(self.data(0)))
+        infos = app.local_pkg_index.get_local_pkgs_from_ref(self.data(0))
         for info in infos:
             pkg_item = PackageTreeItem(["package", "0"], self, PkgSelectionType.pkg, info)
             pkg_item.is_loaded = True
 
             self.append_child(pkg_item)
+        for pkg_item in self.child_items:  # sizes can be calculated before loading
+            size = self.pkg_sizes.get(pkg_item.get_size_key())
+            if size is not None:
+                pkg_item.set_size(size)
         self.is_loaded = True
 
     @override
@@ -65,6 +91,16 @@ class PackageTreeItem(TreeModelItem):
             return len(self.child_items) if len(self.child_items) > 0 else 1
         return 0  # for safety
 
+    def get_size_key(self) -> str:
+        """Identifies a child in pkg_sizes of its parent"""
+        if self.type == PkgSelectionType.export:
+            return EXPORT_SIZE_KEY
+        return self.pkg_info.get("id", "")
+
+    def set_size(self, size_mb: float):
+        self.size_mb = size_mb
+        self.item_data[1] = f"{size_mb:.3f}"
+
     def get_quick_profile_name(self) -> str:
         return ConanApiFactory().build_conan_profile_name_alias(
             self.pkg_info.get("settings", {})
@@ -72,60 +108,142 @@ class PackageTreeItem(TreeModelItem):
 
 
 class PackageFilter(QSortFilterProxyModel):
-    """Filter packages but always showing the parent (ref) of the packages"""
+    """
+    Filter packages but always showing the parent (ref) of the packages
+    and all packages of a matching ref. Supports the wildcards * and ?.
+    The lower-cased names of all loaded items are indexed once, so that a new query is a
+    single scan over the index. The matches of a query are remembered, so typing
+    further only needs to check the matches of the shorter query.
+    """
+
+    MAX_CACHED_QUERIES = 64
 
     def __init__(self):
         super().__init__()
         self.setFilterKeyColumn(0)
+        self._query = ""
+        self._query_pattern: Optional[re.Pattern] = None  # only for queries with wildcards
+        self._search_index: Optional[List[Tuple[PackageTreeItem, str]]] = None
+        self._indexed_items: Set[int] = set()
+        self._matches_by_query: Dict[str, List[Tuple[PackageTreeItem, str]]] = {}
+        # ids of the items to be shown for the current query
+        self._accepted_items: Optional[Set[int]] = None
+
+    @override
+    def setSourceModel(self, source_model: "PkgSelectModel"):  # type: ignore
+        super().setSourceModel(source_model)
+        source_model.modelReset.connect(self.invalidate_search_index)
+        source_model.rowsInserted.connect(self.invalidate_search_index)
+        source_model.rowsRemoved.connect(self.invalidate_search_index)
+
+    def invalidate_search_index(self):
+        self._search_index = None
+        self._indexed_items = set()
+        self._matches_by_query = {}
+        self._accepted_items = None
+
+    def set_filter_query(self, query: str):
+        """Filter with a case insensitive query, which can contain the wildcards * and ?"""
+        query = query.strip().lower()
+        if not query.strip("*"):
+            query = ""
+        if query == self._query:
+            return
+        self._query = query
+        self._query_pattern = None
+        if "*" in query or "?" in query:
+            pattern = re.escape(query).replace(r"\*", ".*").replace(r"\?", ".")
+            self._query_pattern = re.compile(pattern, re.DOTALL)
+        self._accepted_items = None
+        self.invalidateRowsFilter()
+
+    def filter_query(self) -> str:
+        return self._query
 
     @override
     def filterAcceptsRow(self, row_num, source_parent) -> bool:
-        # Check if the current row matches
-        if self.filter_accepts_row_itself(row_num, source_parent):
+        if not self._query:
             return True
+        if self._accepted_items is None:
+            self._accepted_items = self._get_accepted_items()
+        parent_item: Optional[PackageTreeItem] = source_parent.internalPointer()  # type: ignore
+        if parent_item is None:  # top level
+            parent_item = self.sourceModel().root_item  # type: ignore
+        assert parent_item
+        if row_num >= len(parent_item.child_items):
+            # dummy item of a not yet loaded ref - must be shown to be able to expand it
+            return id(parent_item) in self._accepted_items
+        item: PackageTreeItem = parent_item.child_items[row_num]  # type: ignore
+        if id(item) in self._indexed_items:
+            return id(item) in self._accepted_items
+        # loaded after the index was built: show it, if itself or its ref matches
+        return id(parent_item) in self._accepted_items or self.matches_query(
+            self._get_filter_text(item)
+        )
 
-        # Traverse up all the way to root and check if any of them match
-        if self.filter_accepts_any_parent(source_parent):
-            return True
+    def matches_query(self, text: str) -> bool:
+        if self._query_pattern:
+            return self._query_pattern.search(text) is not None
+        return self._query in text
 
-        # Finally, check if any of the children match
-        return self.has_accepted_children(row_num, source_parent)
+    @staticmethod
+    def _get_filter_text(item: PackageTreeItem) -> str:
+        """Lower-cased text of the filtered column"""
+        text = item.item_data[0]
+        if item.type == PkgSelectionType.editable:
+            text += " (editable)"
+        return text.lower()
 
-    def filter_accepts_row_itself(self, row_num, parent):
-        return super(PackageFilter, self).filterAcceptsRow(row_num, parent)
+    def _get_search_index(self) -> List[Tuple[PackageTreeItem, str]]:
+        if self._search_index is None:
+            search_index = []
+            root_item: PackageTreeItem = self.sourceModel().root_item  # type: ignore
+            for ref_item in root_item.child_items:
+                search_index.append((ref_item, self._get_filter_text(ref_item)))
+                for pkg_item in ref_item.child_items:
+                    search_index.append((pkg_item, self._get_filter_text(pkg_item)))
+            self._indexed_items = {id(item) for item, _ in search_index}
+            self._search_index = search_index
+        return self._search_index
 
-    def filter_accepts_any_parent(self, parent):
+    def _get_matches(self) -> List[Tuple[PackageTreeItem, str]]:
         """
-        Traverse to the root node and check if any of the
-        ancestors match the filter
+        A match of a query also matches every prefix of the query,
+        so only the matches of the longest already known prefix need to be checked.
         """
-        while parent.isValid():
-            if self.filter_accepts_row_itself(parent.row(), parent.parent()):
-                return True
-            parent = parent.parent()
-        return False
+        candidates = self._get_search_index()
+        for length in range(len(self._query), 0, -1):
+            known_matches = self._matches_by_query.get(self._query[:length])
+            if known_matches is not None:
+                candidates = known_matches
+                break
+        matches = [(item, text) for item, text in candidates if self.matches_query(text)]
+        if len(self._matches_by_query) >= self.MAX_CACHED_QUERIES:  # drop the oldest
+            self._matches_by_query.pop(next(iter(self._matches_by_query)))
+        self._matches_by_query[self._query] = matches
+        return matches
 
-    def has_accepted_children(self, row_num, parent):
-        """
-        Starting from the current node as root, traverse all
-        the descendants and test if any of the children match
-        """
-        model = self.sourceModel()
-        source_index = model.index(row_num, 0, parent)
-        source_item: Optional[PackageTreeItem] = source_index.internalPointer()  # type: ignore
-        if source_item is None:
-            return False
-        children_count = len(source_item.child_items)
-        for i in range(children_count):
-            if self.filterAcceptsRow(i, source_index):
-                return True
-        return False
+    def _get_accepted_items(self) -> Set[int]:
+        """A matching package shows its ref and a matching ref shows all of its packages"""
+        accepted_items: Set[int] = set()
+        for item, _ in self._get_matches():
+            accepted_items.add(id(item))
+            if item.type in [PkgSelectionType.pkg, PkgSelectionType.export]:
+                accepted_items.add(id(item.parent()))
+            else:
+                accepted_items.update(id(pkg_item) for pkg_item in item.child_items)
+        return accepted_items
 
     def lessThan(
         self,
         source_left: Union[QModelIndex, QPersistentModelIndex],
         source_right: Union[QModelIndex, QPersistentModelIndex],
     ) -> bool:
+        if source_left.column() == 1 and source_right.column() == 1:  # size
+            left_item: PackageTreeItem = source_left.internalPointer()  # type: ignore
+            right_item: PackageTreeItem = source_right.internalPointer()  # type: ignore
+            if left_item and right_item:
+                return left_item.size_mb < right_item.size_mb
         role = Qt.ItemDataRole.DisplayRole
         left_data = self.sourceModel().data(source_left, role)
         right_data = self.sourceModel().data(source_right, role)
@@ -147,11 +265,16 @@ class PackageFilter(QSortFilterProxyModel):
 
 
 class PkgSelectModel(TreeModel):
-    def __init__(self, loader_signal):
+    # generation of the model data, conan_ref, pkg id or export, size in MB
+    _size_calculated: SignalInstance = Signal(int, str, str, float)  # type: ignore
+    sizes_calculated: SignalInstance = Signal(int)  # type: ignore
+    # generation of the model data, conan refs, pkgs by conan ref, changed refs or None for all
+    _local_cache_read: SignalInstance = Signal(int, list, dict, object)  # type: ignore
+    local_cache_updated: SignalInstance = Signal()  # type: ignore
+
+    def __init__(self):
         super(PkgSelectModel, self).__init__()
         # header
-        self._loader_signal = loader_signal
-        self._acc_size = 0
         self.root_item = PackageTreeItem(["Packages", "Size (MB)"])
         self.proxy_model = PackageFilter()
         self.proxy_model.setDynamicSortFilter(False)  # performance, should work without this
@@ -159,18 +282,38 @@ class PkgSelectModel(TreeModel):
         self.proxy_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
         self.proxy_model.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
         self.show_sizes = False
+        self.is_calculating_sizes = False
+        # sizes of an older generation belong to already replaced items
+        self._generation = 0
+        # refs, whose sizes are calculated or are being calculated
+        self._size_refs: Set[str] = set()
+        self._running_size_calculations = 0
+        # refs by name - editables are not included
+        self._items_by_key: Dict[str, PackageTreeItem] = {}  # type: ignore
+        self.is_updating = False
+        self._update_pending = False
+        # refs to read again in the pending update - None for all
+        self._pending_changed_refs: Optional[Set[str]] = set()
+        self._size_calculated.connect(self._on_size_calculated)
+        self.sizes_calculated.connect(self._on_sizes_calculated)
+        self._local_cache_read.connect(self._on_local_cache_read)
 
     def setup_model_data(self):
         self.clear_items()
         self.beginResetModel()
+        self._generation += 1
+        self._size_refs = set()
         # get invalid remotes refs
         invalid_refs = []
         if conan_version.major == 1:
             invalid_refs = ConanCleanup().gather_invalid_remote_metadata()  # type: ignore
-        for conan_ref in app.conan_api.get_all_local_refs():
+        # read all packages at once, so expanding the refs is instant
+        app.local_pkg_index.build()
+        for conan_ref in app.local_pkg_index.get_all_local_refs():
             invalid = str(conan_ref) in invalid_refs
             conan_item = PackageTreeItem([str(conan_ref), "0"], self.root_item, invalid=invalid)
             self.root_item.append_child(conan_item)
+            self._items_by_key[str(conan_ref)] = conan_item
         for conan_ref in app.conan_api.get_editable_references():
             conan_item = PackageTreeItem(
                 [str(conan_ref), "0"], self.root_item, PkgSelectionType.editable
@@ -178,40 +321,272 @@ class PkgSelectModel(TreeModel):
             self.root_item.append_child(conan_item)
         self.endResetModel()
 
-    def get_all_sizes(self):
-        self.beginResetModel()
-        for row in range(self.rowCount(QModelIndex())):
-            item: PackageTreeItem = (self.index(row, 0, QModelIndex())).internalPointer()  # type: ignore
-            if item.type == PkgSelectionType.editable:
+    def update_from_local_cache(self, changed_refs: Optional[Iterable[str]] = None):
+        """
+        Re-read the local cache in the background and apply only the differences
+        to the model, so expansion and selection in the view are kept.
+        Only the packages of the changed refs are read again - of all refs, if not given.
+        """
+        if self.is_updating:  # read again, when the current update is done
+            self._update_pending = True
+            if changed_refs is None or self._pending_changed_refs is None:
+                self._pending_changed_refs = None
+            else:
+                self._pending_changed_refs.update(changed_refs)
+            return
+        self.is_updating = True
+        changed_refs = None if changed_refs is None else set(changed_refs)
+        # for debug purposes only
+        if str2bool(os.getenv("DISABLE_ASYNC_LOADER", "")):
+            self.read_local_cache(self._generation, changed_refs)
+            return
+        Thread(
+            target=self.read_local_cache,
+            args=(self._generation, changed_refs),
+            name="pkg_sel_update",
+            daemon=True,
+        ).start()
+
+    def read_local_cache(self, generation: int, changed_refs: Optional[Set[str]] = None):
+        conan_refs: List[str] = []
+        pkgs: Dict[str, List[ConanPkg]] = {}
+        try:
+            if changed_refs is None:
+                app.local_pkg_index.build()
+            else:
+                app.local_pkg_index.refresh(changed_refs)
+            for conan_ref in app.local_pkg_index.get_all_local_refs():
+                conan_refs.append(str(conan_ref))
+                pkgs[str(conan_ref)] = app.local_pkg_index.get_local_pkgs_from_ref(conan_ref)
+        except Exception as e:
+            Logger().debug(f"Can't read local cache: {str(e)}")
+            generation = -1  # don't apply an incomplete state
+        self._local_cache_read.emit(generation, conan_refs, pkgs, changed_refs)
+
+    @Slot(int, list, dict, object)
+    def _on_local_cache_read(
+        self,
+        generation: int,
+        conan_refs: List[str],
+        pkgs: Dict[str, List[ConanPkg]],
+        changed_refs: Optional[Set[str]],
+    ):
+        self.is_updating = False
+        if generation == self._generation:  # otherwise the model was reloaded meanwhile
+            self._remove_missing_refs(set(conan_refs))
+            new_refs = self._add_new_refs(conan_refs)
+            for conan_ref, ref_item in self._items_by_key.items():
+                if ref_item.is_loaded:
+                    self._update_pkgs(ref_item, pkgs.get(conan_ref, []))
+            if self.show_sizes:
+                self.start_size_calculation(
+                    None if changed_refs is None else set(new_refs) | changed_refs
+                )
+            elif changed_refs is None:  # calculate the missing sizes on the next start
+                self._size_refs = set()
+            else:
+                self._size_refs -= changed_refs
+            self.local_cache_updated.emit()
+        if self._update_pending:
+            self._update_pending = False
+            changed_refs = self._pending_changed_refs
+            self._pending_changed_refs = set()
+            self.update_from_local_cache(changed_refs)
+
+    def remove_pkgs(self, conan_refs_with_pkg_ids: List[Tuple[str, str]]):
+        """
+        Remove already removed refs (empty pkg id) or pkgs from the model at once.
+        Pkgs are only removed from expanded refs, the others will read them on expanding.
+        """
+        removed_refs = {ref for ref, pkg_id in conan_refs_with_pkg_ids if not pkg_id}
+        self._remove_refs(removed_refs)
+        removed_pkg_ids: Dict[str, Set[str]] = {}
+        for conan_ref, pkg_id in conan_refs_with_pkg_ids:
+            if pkg_id and conan_ref not in removed_refs:
+                removed_pkg_ids.setdefault(conan_ref, set()).add(pkg_id)
+        for conan_ref, pkg_ids in removed_pkg_ids.items():
+            ref_item = self._items_by_key.get(conan_ref)
+            if ref_item and ref_item.is_loaded:
+                self._remove_pkg_items(ref_item, pkg_ids)
+
+    def _remove_missing_refs(self, conan_refs: Set[str]):
+        self._remove_refs({ref for ref in self._items_by_key.keys() if ref not in conan_refs})
+
+    def _remove_refs(self, conan_refs: Set[str]):
+        removed_refs = [ref for ref in conan_refs if ref in self._items_by_key]
+        rows = sorted([self._items_by_key.pop(ref).row() for ref in removed_refs], reverse=True)
+        for row in rows:  # from the bottom, so the rows above stay valid
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.root_item.child_items.pop(row)
+            self.endRemoveRows()
+
+    def _remove_pkg_items(self, ref_item: PackageTreeItem, pkg_ids: Set[str]):
+        ref_index = self.index(ref_item.row(), 0, QModelIndex())
+        for row in reversed(range(len(ref_item.child_items))):
+            pkg_item: PackageTreeItem = ref_item.child_items[row]  # type: ignore
+            if pkg_item.type != PkgSelectionType.pkg or pkg_item.get_size_key() not in pkg_ids:
                 continue
-            item.load_children()  # load without expanding
-            for child_item in item.child_items:
-                self.get_size(child_item)
-        self.endResetModel()
+            self.beginRemoveRows(ref_index, row, row)
+            ref_item.child_items.pop(row)
+            self.endRemoveRows()
+            size = ref_item.pkg_sizes.pop(pkg_item.get_size_key(), None)
+            if size is not None:
+                ref_item.set_size(ref_item.size_mb - size)
+
+    def _add_new_refs(self, conan_refs: List[str]) -> List[str]:
+        new_refs = [ref for ref in conan_refs if ref not in self._items_by_key]
+        if not new_refs:
+            return new_refs
+        row = len(self._items_by_key)  # refs are before the editables
+        self.beginInsertRows(QModelIndex(), row, row + len(new_refs) - 1)
+        for i, conan_ref in enumerate(new_refs):
+            conan_item = PackageTreeItem([conan_ref, "0"], self.root_item)
+            self.root_item.child_items.insert(row + i, conan_item)
+            self._items_by_key[conan_ref] = conan_item
+        self.endInsertRows()
+        return new_refs
 
-    def get_size(self, item: PackageTreeItem):
-        if item.parent_item is None:
+    def _update_pkgs(self, ref_item: PackageTreeItem, pkgs: List[ConanPkg]):
+        """Remove and add the changed packages of an already expanded ref"""
+        pkg_ids = {pkg.get("id", "") for pkg in pkgs}
+        self._remove_pkg_items(
+            ref_item,
+            {item.get_size_key() for item in ref_item.child_items} - pkg_ids,  # type: ignore
+        )
+        ref_index = self.index(ref_item.row(), 0, QModelIndex())
+        loaded_ids = [pkg_item.get_size_key() for pkg_item in ref_item.child_items]
+        new_pkgs = [pkg for pkg in pkgs if pkg.get("id", "") not in loaded_ids]
+        if not new_pkgs:
+            return
+        row = len(ref_item.child_items)
+        self.beginInsertRows(ref_index, row, row + len(new_pkgs) - 1)
+        for info in new_pkgs:
+            pkg_item = PackageTreeItem(["package", "0"], ref_item, PkgSelectionType.pkg, info)
+            pkg_item.is_loaded = True
+            ref_item.append_child(pkg_item)
+        self.endInsertRows()
+
+    def start_size_calculation(self, changed_refs: Optional[Iterable[str]] = None):
+        """
+        Calculate the sizes of the packages in the background, which are not calculated yet:
+        of all refs, which were not calculated before, or of the given changed or added refs.
+        The sizes are inserted one by one, so the view stays usable.
+        """
+        if changed_refs is None:
+            conan_refs = [ref for ref in self._items_by_key if ref not in self._size_refs]
+        else:
+            conan_refs = [ref for ref in changed_refs if ref in self._items_by_key]
+        if not conan_refs:
             return
-        if item.type not in [PkgSelectionType.pkg, PkgSelectionType.export]:
+        self._size_refs.update(conan_refs)
+        known_size_keys = {
+            conan_ref: set(self._items_by_key[conan_ref].pkg_sizes.keys())
+            for conan_ref in conan_refs
+        }
+        self._running_size_calculations += 1
+        self.is_calculating_sizes = True
+        # for debug purposes only
+        if str2bool(os.getenv("DISABLE_ASYNC_LOADER", "")):
+            self.calculate_sizes(self._generation, conan_refs, known_size_keys)
             return
-        if not item.item_data:
+        Thread(
+            target=self.calculate_sizes,
+            args=(self._generation, conan_refs, known_size_keys),
+            name="pkg_sizes",
+            daemon=True,
+        ).start()
+
+    def calculate_sizes(
+        self,
+        generation: int,
+        conan_refs: List[str],
+        known_size_keys: Optional[Dict[str, Set[str]]] = None,
+    ):
+        """
+        Measure the export and package folders of the refs concurrently - without the
+        already known size keys of a ref.
+        Finished sizes are already sent, while the folders of the next refs are resolved.
+        """
+        known_size_keys = known_size_keys or {}
+        pending: Dict[Future, Tuple[str, str]] = {}
+
+        def send_sizes(futures: Iterable[Future]):
+            for future in futures:
+                conan_ref, size_key = pending.pop(future)
+                try:
+                    size = future.result()
+                except Exception:
+                    size = 0.0
+                self._size_calculated.emit(generation, conan_ref, size_key, size)
+
+        with ThreadPoolExecutor(FOLDER_SIZE_MAX_WORKERS, "pkg_sizes") as pool:
+            for conan_ref in conan_refs:
+                for size_key, pkg_path in self.get_size_paths(conan_ref):
+                    if size_key in known_size_keys.get(conan_ref, set()):
+                        continue
+                    future = pool.submit(get_folder_size_mb, pkg_path)
+                    pending[future] = (conan_ref, size_key)
+                send_sizes([future for future in pending if future.done()])
+            send_sizes(as_completed(list(pending.keys())))
+        self.sizes_calculated.emit(generation)
+
+    def get_size_paths(self, conan_ref: str) -> List[Tuple[str, Path]]:
+        """Return the export and package folders of a ref with their size keys"""
+        size_paths: List[Tuple[str, Path]] = []
+        try:
+            ref = ConanRef.loads(conan_ref)
+            size_paths.append((EXPORT_SIZE_KEY, app.conan_api.get_export_folder(ref)))
+            for info in app.local_pkg_index.get_local_pkgs_from_ref(ref):
+                pkg_id = info.get("id", "")
+                size_paths.append((pkg_id, app.conan_api.get_package_folder(ref, pkg_id)))
+        except Exception as e:
+            Logger().debug(f"Can't get folders of {conan_ref}: {str(e)}")
+        return size_paths
+
+    def get_calculated_size_mb(self, conan_ref: str, pkg_id: str) -> Optional[float]:
+        """
+        Already calculated size of a package or of a whole ref for an empty pkg id.
+        None, if the size of the package, the export or of a package of the ref is missing.
+        """
+        ref_item = self._items_by_key.get(conan_ref)
+        if not ref_item:
+            return None
+        if pkg_id:
+            return ref_item.pkg_sizes.get(pkg_id)
+        size_keys = {EXPORT_SIZE_KEY} | {
+            pkg.get("id", "") for pkg in app.local_pkg_index.get_local_pkgs_from_ref(conan_ref)
+        }
+        if not size_keys <= ref_item.pkg_sizes.keys():
+            return None
+        return sum(ref_item.pkg_sizes[size_key] for size_key in size_keys)
+
+    @Slot(int, str, str, float)
+    def _on_size_calculated(self, generation: int, conan_ref: str, size_key: str, size: float):
+        """Update the size of the package and add it to the size of its ref"""
+        ref_item = self._items_by_key.get(conan_ref)
+        if generation != self._generation or not ref_item:
             return
-        if item.item_data[1] != "0":
+        try:
+            ref_row = ref_item.row()
+        except ValueError:  # ref was removed meanwhile
             return
+        # the size can be calculated again, e.g. while a changed ref was being calculated
+        old_size = ref_item.pkg_sizes.get(size_key, 0.0)
+        ref_item.pkg_sizes[size_key] = size
+        ref_item.set_size(ref_item.size_mb - old_size + size)
+        ref_index = self.index(ref_row, 1, QModelIndex())
+        self.dataChanged.emit(ref_index, ref_index)
+        for pkg_row, pkg_item in enumerate(ref_item.child_items):
+            if pkg_item.get_size_key() == size_key:
+                pkg_item.set_size(size)
+                pkg_index = self.index(pkg_row, 1, self.index(ref_row, 0, QModelIndex()))
+                self.dataChanged.emit(pkg_index, pkg_index)
+                break
 
-        conan_ref = ConanRef.loads(item.parent_item.data(0))
-        if item.type == PkgSelectionType.export:
-            pkg_path = app.conan_api.get_export_folder(conan_ref)
-        else:
-            pkg_path = app.conan_api.get_package_folder(conan_ref, item.pkg_info.get("id", ""))
-        self._loader_signal.emit(
-            f"Calculating size for\n {str(conan_ref)}\n{self._acc_size:.1f} MB read"
-        )
-        size = get_folder_size_mb(pkg_path)
-        item.item_data[1] = f"{size:.3f}"
-        acc_size = float(item.parent_item.item_data[1]) + size
-        self._acc_size += size
-        item.parent_item.item_data[1] = f"{acc_size:.3f}"
+    @Slot(int)
+    def _on_sizes_calculated(self, generation: int):
+        self._running_size_calculations -= 1
+        self.is_calculating_sizes = self._running_size_calculations > 0
 
     @override
     def data(self, index: Union[QModelIndex, QPersistentModelIndex], role: int = 0) -> Any:
@@ -130,7 +130,8 @@ class ConanRefLineEdit(QLineEdit):
             or self.is_valid
         ):
             return
-        recipes = app.conan_api.search_recipes_in_remotes(f"{text}*")  # can take very long time
+        # can take very long time
+        recipes = app.remote_query_cache.search_recipes_in_remotes(f"{text}*")
         if app.conan_api:  # program can shut down and conan_api destroyed
             try:
                 app.conan_api.info_cache.update_remote_package_list(recipes)  # add to cache
@@ -1,18 +1,25 @@
 import json
 import os
 import platform
+import sqlite3
 import tempfile
+import threading
 import time
 from pathlib import Path
-from test.conftest import TEST_REF, conan_install_ref, conan_remove_ref
+from test.conftest import TEST_REF, ConcurrencyCounter, conan_install_ref, conan_remove_ref
 from typing import List
 
 import pytest
 
+from conan_explorer import conan_version
 from conan_explorer.conan_wrapper import ConanApiFactory as ConanApi
 from conan_explorer.conan_wrapper.conan_cleanup import ConanCleanup
+from conan_explorer.conan_wrapper.local_pkg_index import ConanLocalPkgIndex
+from conan_explorer.conan_wrapper.pkg_path_cache import ConanPkgPathCache
+from conan_explorer.conan_wrapper.remote_query_cache import ConanRemoteQueryCache
 from conan_explorer.conan_wrapper.conan_worker import (ConanWorker,
-                                                       ConanWorkerElement)
+                                                       ConanWorkerElement,
+                                                       ConanWorkerTaskStage)
 from conan_unified_api.types import ConanRef
 from conan_unified_api.base.helper import create_key_value_pair_list
 
@@ -254,6 +261,630 @@ def test_conan_worker(base_fixture, mocker):
     assert conan_worker._conan_install_queue.qsize() == 0
 
 
+class FakeLatencyConanApi():
+    """ Stand-in for ConanUnifiedApi, which simulates the latency of an install """
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.installed_refs: List[str] = []
+        self.installs = ConcurrencyCounter()
+
+    def get_path_with_auto_install(self, conan_ref, conan_options=None, update=False):
+        with self.installs.count(str(conan_ref)):
+            time.sleep(self.latency_s)
+            self.installed_refs.append(str(conan_ref))
+        return "1234", Path("NA")
+
+    def generate_canonical_ref(self, conan_ref):
+        return str(conan_ref)
+
+
+def test_conan_worker_pool():
+    """
+    Feed 200 synthetic elements through a fake api with latency: the sequential worker
+    (1 thread) installs one at a time, the pool works on several at once, but never on
+    more than its maximum. The same reference must never be worked on concurrently.
+    """
+    import conan_explorer.app as app
+    conan_refs: List[ConanWorkerElement] = [
+        {"ref_pkg_id": f"example{i % 50}/1.0.{i}@user/channel", "options": {},
+         "settings": {}, "update": False, "auto_install": True, "profile": ""}
+        for i in range(200)]
+
+    for max_workers in [1, 8]:
+        conan_api = FakeLatencyConanApi(0.01)
+        results = []
+        conan_worker = ConanWorker(conan_api, app.active_settings,  # type: ignore
+                                   max_workers=max_workers)
+        start = time.monotonic()
+        conan_worker.update_all_info(
+            conan_refs, lambda conan_ref, pkg_id: results.append((conan_ref, pkg_id)))
+        while len(results) < len(conan_refs) and time.monotonic() - start < 30:
+            time.sleep(0.001)
+        conan_worker.finish_working(3)
+
+        assert len(results) == len(conan_refs)
+        assert all(pkg_id == "1234" for _, pkg_id in results)
+        assert not conan_api.installs.concurrent_same_key
+        if max_workers == 1:
+            assert conan_api.installs.max_running == 1
+        else:
+            assert 1 < conan_api.installs.max_running <= max_workers
+
+
+def test_conan_worker_same_ref_does_not_block_workers():
+    """
+    Queued elements of a reference, which is already worked on, are set aside and
+    don't occupy a worker - other references are worked on meanwhile.
+    Nothing is kept for the reference, after its last element is finished.
+    """
+    import conan_explorer.app as app
+    conan_api = FakeLatencyConanApi(0.1)
+    conan_worker = ConanWorker(conan_api, app.active_settings, max_workers=2)  # type: ignore
+    conan_refs: List[ConanWorkerElement] = [
+        {"ref_pkg_id": "same/1.0.0@user/channel", "options": {"variant": str(i)},
+         "settings": {}, "update": False, "auto_install": True, "profile": ""}
+        for i in range(4)]
+    conan_refs.append({"ref_pkg_id": "other/1.0.0@user/channel", "options": {},
+                       "settings": {}, "update": False, "auto_install": True, "profile": ""})
+    tasks = conan_worker.update_all_info(conan_refs, None)
+    assert all(task.wait(5) for task in tasks)
+    start = time.monotonic()  # the reference is released after the task is done
+    while conan_worker._running_refs and time.monotonic() - start < 5:
+        time.sleep(0.01)
+    assert conan_worker._running_refs == set()
+    assert conan_worker._deferred_entries == {}
+    conan_worker.finish_working(3)
+
+    assert "other/1.0.0@user/channel" in conan_api.installed_refs[:2]
+    assert conan_api.installed_refs.count("same/1.0.0@user/channel") == 4
+    assert not conan_api.installs.concurrent_same_key
+
+
+def test_conan_worker_coalesce_and_cancel():
+    """
+    Identical elements are installed once and the result is sent to every callback.
+    A request which was cancelled before it started never reaches the api.
+    """
+    import conan_explorer.app as app
+    conan_api = FakeLatencyConanApi(0.2)
+    conan_worker = ConanWorker(conan_api, app.active_settings, max_workers=1)  # type: ignore
+    element: ConanWorkerElement = {"ref_pkg_id": "example/1.0.0@user/channel", "options": {},
+        "settings": {}, "update": False, "auto_install": True, "profile": ""}
+    superseded_element: ConanWorkerElement = {**element,  # type: ignore
+                                              "ref_pkg_id": "example/0.9.0@user/channel"}
+    results = []
+    callbacks = [lambda conan_ref, pkg_id, i=i: results.append(i) for i in range(3)]
+
+    tasks = [conan_worker.put_ref_in_install_queue(element, callback)  # type: ignore
+             for callback in callbacks]
+    assert tasks[0] is tasks[1] is tasks[2]
+    superseded_task = conan_worker.put_ref_in_install_queue(superseded_element, callbacks[0])
+    conan_worker.cancel_request(superseded_task, callbacks[0])
+    assert superseded_task.cancelled
+
+    start = time.monotonic()
+    while len(results) < 3 and time.monotonic() - start < 10:
+        time.sleep(0.01)
+    time.sleep(0.3)
+    conan_worker.finish_working(3)
+
+    assert sorted(results) == [0, 1, 2]
+    assert conan_api.installed_refs == ["example/1.0.0@user/channel"]
+
+
+def test_conan_worker_priority():
+    """
+    Elements with higher priority are worked on first, also when the priority
+    of an already queued element is raised. Same priorities are worked on in FIFO order.
+    """
+    import conan_explorer.app as app
+    conan_api = FakeLatencyConanApi(0.1)
+    conan_worker = ConanWorker(conan_api, app.active_settings, max_workers=1)  # type: ignore
+    refs = ["blocker/1.0.0@user/channel", "low1/1.0.0@user/channel",
+            "low2/1.0.0@user/channel", "bumped/1.0.0@user/channel", "high/1.0.0@user/channel"]
+    priorities = [ConanWorker.PRIORITY_DEFAULT, ConanWorker.PRIORITY_LOW,
+                  ConanWorker.PRIORITY_LOW, ConanWorker.PRIORITY_LOW, ConanWorker.PRIORITY_HIGH]
+    for ref, priority in zip(refs, priorities):
+        element: ConanWorkerElement = {"ref_pkg_id": ref, "options": {}, "settings": {},
+            "update": False, "auto_install": True, "profile": ""}
+        conan_worker.put_ref_in_install_queue(element, None, priority)
+    conan_worker.set_priority(["bumped/1.0.0@user/channel"], ConanWorker.PRIORITY_HIGH)
+
+    start = time.monotonic()
+    while len(conan_api.installed_refs) < len(refs) and time.monotonic() - start < 10:
+        time.sleep(0.01)
+    conan_worker.finish_working(3)
+
+    assert conan_api.installed_refs == [
+        "blocker/1.0.0@user/channel", "high/1.0.0@user/channel",
+        "bumped/1.0.0@user/channel", "low1/1.0.0@user/channel", "low2/1.0.0@user/channel"]
+
+
+def test_conan_worker_task_timeout_and_cancel():
+    """
+    A task, which exceeds its deadline before it is started, is reported as timed out,
+    never reaches the api and notifies nobody. A cancelled running task notifies nobody,
+    but keeps its worker until the conan command returns, so the limit of
+    concurrent installs is kept. Progress stages are recorded.
+    """
+    import conan_explorer.app as app
+    conan_api = FakeLatencyConanApi(0.3)
+    conan_worker = ConanWorker(conan_api, app.active_settings, max_workers=1)  # type: ignore
+    element: ConanWorkerElement = {"ref_pkg_id": "example/1.0.0@user/channel", "options": {},
+        "settings": {}, "update": False, "auto_install": True, "profile": ""}
+    other_element: ConanWorkerElement = {**element,  # type: ignore
+                                         "ref_pkg_id": "other/1.0.0@user/channel"}
+    results = []
+    stages = []
+    blocking_task = conan_worker.put_ref_in_install_queue(element, None)
+    task = conan_worker.put_ref_in_install_queue(
+        other_element, lambda conan_ref, pkg_id: results.append(pkg_id), timeout_s=0.1)
+    task.add_progress_callback(lambda task: stages.append(task.stage))
+    assert task.wait(3)
+    time.sleep(0.1)
+    assert blocking_task.done() and task.timed_out
+    assert results == []
+    assert stages == [ConanWorkerTaskStage.timed_out]
+    assert conan_api.installed_refs == ["example/1.0.0@user/channel"]
+
+    task = conan_worker.put_ref_in_install_queue(
+        other_element, lambda conan_ref, pkg_id: results.append(pkg_id))
+    while not task.started:
+        time.sleep(0.01)
+    assert task.cancel()
+    next_task = conan_worker.put_ref_in_install_queue(element, None)
+    assert next_task.wait(3)
+    conan_worker.finish_working(3)
+    assert task.cancelled
+    assert results == []
+    assert conan_api.installs.max_running == 1
+    assert not conan_api.installs.concurrent_same_key
+
+
+def test_conan_worker_hanging_task_timeout():
+    """
+    A running task is timed out at its deadline, even if the conan command hangs.
+    Its worker is replaced, so the queue goes on, and finishing does not wait for it.
+    """
+    import conan_explorer.app as app
+    conan_api = FakeLatencyConanApi(3)
+    conan_worker = ConanWorker(conan_api, app.active_settings, max_workers=1)  # type: ignore
+    element: ConanWorkerElement = {"ref_pkg_id": "example/1.0.0@user/channel", "options": {},
+        "settings": {}, "update": False, "auto_install": True, "profile": ""}
+    other_element: ConanWorkerElement = {**element,  # type: ignore
+                                         "ref_pkg_id": "other/1.0.0@user/channel"}
+    results = []
+    hanging_task = conan_worker.put_ref_in_install_queue(
+        element, lambda conan_ref, pkg_id: results.append(pkg_id), timeout_s=0.2)
+    while not conan_api.installs.max_running:
+        time.sleep(0.01)
+    hanging_worker = conan_worker._install_workers[0]
+    conan_api.latency_s = 0.01  # only the running call hangs
+    assert hanging_task.wait(2)
+    assert hanging_task.timed_out
+
+    task = conan_worker.put_ref_in_install_queue(
+        other_element, lambda conan_ref, pkg_id: results.append(pkg_id))
+    start = time.monotonic()  # callbacks are notified after the task is done
+    while not results and time.monotonic() - start < 2:
+        time.sleep(0.01)
+    assert results == ["1234"]
+    assert hanging_worker not in conan_worker._install_workers
+
+    conan_worker.finish_working(0.1)
+    assert hanging_worker.is_alive()
+
+
+def test_pkg_path_cache(tmp_path: Path):
+    """
+    Resolved package paths are persisted and are valid as long as
+    the package folder is not modified. Other format versions are discarded.
+    """
+    package_folder = tmp_path / "package"
+    (package_folder / "bin").mkdir(parents=True)
+    executable = package_folder / "bin" / "app"
+    executable.touch()
+    options = {"shared": "True"}
+    cache = ConanPkgPathCache(tmp_path)
+    cache.set_package(TEST_REF, options, "1234", package_folder)
+    cache.set_executable_path(TEST_REF, options, package_folder, "bin/app", executable)
+    cache.save()
+
+    cache = ConanPkgPathCache(tmp_path)
+    assert cache.get_package(TEST_REF, options) == ("1234", package_folder)
+    assert cache.get_package(TEST_REF, {}) is None
+    assert cache.get_executable_path(
+        TEST_REF, options, package_folder, "bin/app") == executable
+
+    # modifying the package folder invalidates the entry
+    time.sleep(0.01)
+    (package_folder / "new_file").touch()
+    assert cache.get_package(TEST_REF, options) is None
+
+    cache.set_package(TEST_REF, options, "1234", package_folder)
+    cache.save()
+    cache_file = tmp_path / ConanPkgPathCache.CACHE_FILE_NAME
+    cache_content = json.loads(cache_file.read_text())
+    cache_content["version"] = 0
+    cache_file.write_text(json.dumps(cache_content))
+    assert ConanPkgPathCache(tmp_path).get_package(TEST_REF, options) is None
+    assert [path.name for path in tmp_path.glob("*.tmp")] == []
+
+
+class FakeLocalPkgApi():
+    """ Stand-in for ConanUnifiedApi, which returns a fixed best matching local package """
+
+    def __init__(self, pkg_id: str, package_folder: Path):
+        self.pkg_id = pkg_id
+        self.package_folder = package_folder
+
+    def get_best_matching_local_package_path(self, conan_ref, conan_options=None):
+        return self.pkg_id, self.package_folder
+
+
+def test_pkg_path_cache_revalidate(tmp_path: Path):
+    """
+    A cached package, which is not the best matching local package anymore
+    (e.g. a newer revision was installed), is removed and reported.
+    """
+    old_folder = tmp_path / "old"
+    new_folder = tmp_path / "new"
+    old_folder.mkdir()
+    new_folder.mkdir()
+    cache = ConanPkgPathCache(tmp_path)
+    cache.set_package(TEST_REF, {}, "1234", old_folder)
+    changed = []
+    links = [(TEST_REF, {}), ("other/1.0.0@user/channel", {})]
+
+    cache.revalidate(FakeLocalPkgApi("1234", old_folder), links,  # type: ignore
+                     lambda conan_ref, pkg_id: changed.append((conan_ref, pkg_id)))
+    assert changed == []
+    assert cache.get_package(TEST_REF, {}) == ("1234", old_folder)
+
+    cache.revalidate(FakeLocalPkgApi("5678", new_folder), links,  # type: ignore
+                     lambda conan_ref, pkg_id: changed.append((conan_ref, pkg_id)))
+    assert changed == [(TEST_REF, "5678")]
+    assert cache.get_package(TEST_REF, {}) is None
+
+
+class FakeRemoteApi():
+    """ Stand-in for ConanUnifiedApi, which counts the remote queries """
+
+    def __init__(self):
+        self.queries = 0
+
+    def search_recipes_in_remotes(self, query, remote_name="all"):
+        self.queries += 1
+        return [ConanRef.loads(TEST_REF)]
+
+    def get_remote_pkgs_from_ref(self, conan_ref, remote_name):
+        self.queries += 1
+        return [
+            {"id": "1234", "options": {}, "settings": {}, "requires": [], "outdated": False}
+        ]
+
+    def get_options_with_default_values(self, conan_ref, remote_name=None):
+        self.queries += 1
+        return {"shared": ["True", "False"]}, {"shared": "True"}
+
+
+def test_remote_query_cache(tmp_path: Path, mocker):
+    """
+    Repeated remote queries are answered from the cache, until they expire or are invalidated.
+    The least recently used entries are dropped and entries can be persisted.
+    """
+    settings = mocker.MagicMock()
+    settings.get_float.return_value = 60.0
+    settings.get_bool.return_value = True
+    conan_api = FakeRemoteApi()
+    cache = ConanRemoteQueryCache(conan_api, settings, tmp_path, max_entries=3)  # type: ignore
+    for _ in range(2):
+        refs = cache.search_recipes_in_remotes("example*", "local")
+        assert refs == [ConanRef.loads(TEST_REF)]
+        assert cache.get_remote_pkgs_from_ref(TEST_REF, "local")[0]["id"] == "1234"
+        assert cache.get_options_with_default_values(TEST_REF) == (
+            {"shared": ["True", "False"]}, {"shared": "True"})
+    assert conan_api.queries == 3
+    assert (cache.hits, cache.misses) == (3, 3)
+
+    # results are copies - changing them does not change the cached result
+    cache.get_remote_pkgs_from_ref(TEST_REF, "local")[0]["id"] = "changed"
+    cache.get_options_with_default_values(TEST_REF)[1]["shared"] = "False"
+    assert cache.get_remote_pkgs_from_ref(TEST_REF, "local")[0]["id"] == "1234"
+    assert cache.get_options_with_default_values(TEST_REF)[1] == {"shared": "True"}
+    assert conan_api.queries == 3
+
+    # different remote is a different query - the oldest entry is dropped
+    cache.get_remote_pkgs_from_ref(TEST_REF, "other")
+    assert conan_api.queries == 4
+    cache.search_recipes_in_remotes("example*", "local")
+    assert conan_api.queries == 5
+
+    # install or remove of a ref invalidates its queries, also searches with wildcards
+    cache.search_recipes_in_remotes("*xam*", "local")
+    assert conan_api.queries == 6
+    cache.invalidate(TEST_REF + ":1234")
+    cache.get_remote_pkgs_from_ref(TEST_REF, "other")
+    cache.search_recipes_in_remotes("*xam*", "local")
+    assert conan_api.queries == 8
+    cache.save()
+
+    # persisted entries are loaded, if not expired
+    cache = ConanRemoteQueryCache(conan_api, settings, tmp_path)  # type: ignore
+    cache.get_remote_pkgs_from_ref(TEST_REF, "other")
+    assert conan_api.queries == 8
+    settings.get_float.return_value = 0.01
+    cache = ConanRemoteQueryCache(conan_api, settings, tmp_path)  # type: ignore
+    time.sleep(0.02)
+    cache.get_remote_pkgs_from_ref(TEST_REF, "other")
+    assert conan_api.queries == 9
+    assert [path.name for path in tmp_path.glob("*.tmp")] == []
+
+
+class FakeLocalCacheApi():
+    """ Stand-in for ConanUnifiedApi, which simulates the latency of reading the local cache """
+
+    def __init__(self, ref_count: int, latency_s: float):
+        self.conan_refs = [ConanRef.loads(f"example{i}/1.0.0@user/testing")
+                           for i in range(ref_count)]
+        self.latency_s = latency_s
+        self.pkgs_queries = ConcurrencyCounter()
+
+    def get_all_local_refs(self):
+        return list(self.conan_refs)
+
+    def get_local_pkgs_from_ref(self, conan_ref):
+        with self.pkgs_queries.count():
+            time.sleep(self.latency_s)
+        return [{"id": str(conan_ref).split("/")[0]}]
+
+
+def test_local_pkg_index():
+    """
+    The index reads the packages of all refs concurrently in one pass and
+    answers from memory afterwards, until it is invalidated.
+    """
+    conan_api = FakeLocalCacheApi(200, 0.005)
+    index = ConanLocalPkgIndex(conan_api)  # type: ignore
+    index.build()
+    assert conan_api.pkgs_queries.calls == 200
+    assert conan_api.pkgs_queries.max_running > 1
+
+    conan_api.pkgs_queries = ConcurrencyCounter()
+    assert len(index.get_all_local_refs()) == 200
+    assert index.get_local_pkgs_from_ref("example3/1.0.0@user/testing") == [{"id": "example3"}]
+    assert index.get_local_pkgs_from_ref(conan_api.conan_refs[3]) == [{"id": "example3"}]
+    assert conan_api.pkgs_queries.calls == 0
+
+    # invalidated refs and unknown refs are read on demand
+    index.invalidate("example3/1.0.0@user/testing:1234")
+    conan_api.conan_refs.append(ConanRef.loads("new/1.0.0@user/testing"))
+    assert len(index.get_all_local_refs()) == 201
+    assert index.get_local_pkgs_from_ref("example3/1.0.0@user/testing") == [{"id": "example3"}]
+    assert index.get_local_pkgs_from_ref("new/1.0.0@user/testing") == [{"id": "new"}]
+    assert conan_api.pkgs_queries.calls == 2
+
+    # resolved packages are known, packages of refs missing in the index are not
+    assert index.has_local_pkg("example3/1.0.0@user/testing", "example3")
+    assert not index.has_local_pkg("example3/1.0.0@user/testing", "1234")
+    conan_api.conan_refs.append(ConanRef.loads("other/1.0.0@user/testing"))
+    assert not index.has_local_pkg("other/1.0.0@user/testing", "other")
+
+
+class FakeCleanupCacheApi():
+    """ Stand-in for ConanUnifiedApi with a Conan 2 like storage folder """
+
+    def __init__(self, storage_path: Path, ref_count: int):
+        self.storage_path = storage_path
+        self.conan_refs = [ConanRef.loads(f"example{i}/1.0.0@user/testing")
+                           for i in range(ref_count)]
+        self._conan = self  # for cache.source_path / build_path
+        self.cache = self
+        for i in range(ref_count):
+            for folder in ["e", "s", "d"]:
+                (storage_path / "p" / f"ref{i}" / folder).mkdir(parents=True)
+            for folder in ["p", "b", "d"]:
+                (storage_path / "p" / f"pkg{i}" / folder).mkdir(parents=True)
+            (storage_path / "p" / f"ref{i}" / "s" / "source.cpp").write_text("x" * 1024)
+
+    def _get_ref_folder(self, conan_ref: ConanRef):
+        return self.storage_path / "p" / f"ref{str(conan_ref).split('/')[0][7:]}"
+
+    def get_editable_references(self):
+        return [self.conan_refs[0]]
+
+    def get_all_local_refs(self):
+        return list(self.conan_refs)
+
+    def get_local_pkgs_from_ref(self, conan_ref):
+        return [{"id": str(conan_ref).split("/")[0][7:]}]
+
+    def get_export_folder(self, conan_ref):
+        return self._get_ref_folder(conan_ref) / "e"
+
+    def get_package_folder(self, conan_ref, pkg_id):
+        return self.storage_path / "p" / f"pkg{pkg_id}" / "p"
+
+    def get_storage_path(self):
+        return self.storage_path
+
+    def source_path(self, conan_ref):
+        source_path = self._get_ref_folder(conan_ref) / "s"
+        if not source_path.exists():
+            raise Exception("No source folder")
+        return str(source_path)
+
+    def build_path(self, pkg_ref):
+        build_path = self.storage_path / "p" / f"pkg{pkg_ref.package_id}" / "b"
+        if not build_path.exists():
+            raise Exception("No build folder")
+        return str(build_path)
+
+
+@pytest.mark.conanv2
+@pytest.mark.skipif(conan_version.major == 1, reason="Tests the Conan 2 cache layout")
+def test_conan_cleanup(base_fixture, tmp_path: Path, mocker):
+    """
+    The temporary folders of all refs are found concurrently and reported to the callback,
+    editables are skipped. Not deleted folders are kept in the journal and found again.
+    Of unfinished builds only the build folder is found, if the package is not in the
+    cache database and the build is not running anymore.
+    """
+    storage_path = tmp_path / "storage"
+    conan_api = FakeCleanupCacheApi(storage_path, 20)
+    mocker.patch("conan_explorer.app.conan_api", conan_api)
+    (storage_path / "t" / "tmp_export").mkdir(parents=True)
+    for layout in ["failed_build", "known_build", "running_build"]:
+        for folder in ["b", "p"]:
+            (storage_path / "b" / layout / folder).mkdir(parents=True)
+    old_mtime = time.time() - 2 * ConanCleanup.BUILD_MIN_AGE_S
+    for layout in ["failed_build", "known_build"]:
+        for path in [storage_path / "b" / layout, *(storage_path / "b" / layout).iterdir()]:
+            os.utime(path, (old_mtime, old_mtime))
+    with sqlite3.connect(storage_path / "cache.sqlite3") as connection:
+        connection.execute("CREATE TABLE packages (path text)")
+        connection.execute("INSERT INTO packages VALUES ('b/known_build')")
+    connection.close()
+
+    found = []
+    cleaner = ConanCleanup(tmp_path)
+    cleanup_info = cleaner.get_cleanup_cache_info(
+        lambda ref, paths: found.append((ref, paths)))
+    assert len(cleanup_info) == 20  # 19 refs + temporary folders
+    assert "example0/1.0.0@user/testing" not in cleanup_info
+    assert cleanup_info["example3/1.0.0@user/testing"] == {
+        "source": str(storage_path / "p" / "ref3" / "s"),
+        "download": str(storage_path / "p" / "ref3" / "d"),
+        "build 3": str(storage_path / "p" / "pkg3" / "b"),
+        "download 3": str(storage_path / "p" / "pkg3" / "d"),
+    }
+    assert cleanup_info["Temporary"] == {
+        "temp": str(storage_path / "t"),
+        "build failed_build": str(storage_path / "b" / "failed_build" / "b"),
+    }
+    assert sorted(found) == sorted(cleanup_info.items())
+
+    # simulate an interrupted cleanup: the folders of one ref are not deleted
+    interrupted_info = {"example3/1.0.0@user/testing": cleanup_info[
+        "example3/1.0.0@user/testing"]}
+    from conan_explorer.app.system import delete_path
+    mocker.patch("conan_explorer.conan_wrapper.conan_cleanup.delete_path",
+                 lambda path: None if "ref3" in str(path) or "pkg3" in str(path)
+                 else delete_path(path))
+    write_journal_spy = mocker.spy(cleaner, "_write_journal")
+    assert cleaner.delete_cleanup_paths(cleanup_info) == 4 * 18 + 2
+    assert write_journal_spy.call_count < 4 * 18 + 2  # batched, not after every folder
+    assert {ref: paths for ref, paths in write_journal_spy.call_args.args[0].items()
+            if paths} == interrupted_info
+    assert (storage_path / "p" / "ref3" / "s").exists()
+    assert not (storage_path / "p" / "ref4" / "s").exists()
+    assert not (storage_path / "t").exists()
+    assert not (storage_path / "b" / "failed_build" / "b").exists()
+    assert (storage_path / "b" / "failed_build" / "p").exists()
+    assert (storage_path / "b" / "known_build" / "b").exists()
+    assert (tmp_path / ConanCleanup.JOURNAL_FILE_NAME).exists()
+    mocker.stopall()
+    mocker.patch("conan_explorer.app.conan_api", conan_api)
+
+    # no temporary folders are left - only the journal entries are found again
+    mocker.patch.object(conan_api, "get_all_local_refs", return_value=[])
+    cleanup_info = ConanCleanup(tmp_path).get_cleanup_cache_info()
+    assert cleanup_info == interrupted_info
+    progress = []
+    assert cleaner.delete_cleanup_paths(cleanup_info, progress.append) == 4
+    assert progress[-1].startswith("Deleted 4/4 folders")
+    assert not (tmp_path / ConanCleanup.JOURNAL_FILE_NAME).exists()
+
+
+class FakeMetadataApi():
+    """
+    Stand-in for ConanUnifiedApi with Conan 1 like metadata and remotes with latency.
+    Only the last remote answers right away, the others wait, until they are released.
+    """
+
+    def __init__(self, cache_path: Path, ref_count: int, latency_s: float):
+        self.cache_path = cache_path
+        self.latency_s = latency_s
+        self.conan_refs = [ConanRef.loads(f"example{i}/1.0.0@user/testing")
+                           for i in range(ref_count)]
+        self.remotes = [type("Remote", (), {"name": f"remote{i}"}) for i in range(4)]
+        self.metadata_loads = ConcurrencyCounter()
+        self.inspects = ConcurrencyCounter()
+        self.release_slow_remotes = threading.Event()
+        self._client_cache = self  # for package_layout
+        self._conan = self  # for inspect
+        for i in range(ref_count):
+            self.set_remote(self.conan_refs[i], "remote0" if i % 2 else "invalid")
+
+    def set_remote(self, conan_ref: ConanRef, remote: str):
+        metadata_file = self.cache_path / str(conan_ref).split("/")[0] / "metadata.json"
+        metadata_file.parent.mkdir(parents=True, exist_ok=True)
+        metadata_file.write_text(remote)
+        mtime_ns = metadata_file.stat().st_mtime_ns + 1000000  # make sure it changes
+        os.utime(metadata_file, ns=(mtime_ns, mtime_ns))
+
+    def get_remotes(self, include_disabled=False):
+        return self.remotes
+
+    def get_all_local_refs(self):
+        return list(self.conan_refs)
+
+    def package_layout(self, conan_ref):
+        base_folder = self.cache_path / str(conan_ref).split("/")[0]
+        api = self
+
+        class FakeLayout():
+            def base_folder(self):
+                return str(base_folder)
+
+            def load_metadata(self):
+                with api.metadata_loads.count():
+                    time.sleep(api.latency_s)
+                remote = (base_folder / "metadata.json").read_text()
+                return type("Metadata", (), {"recipe": type("Recipe", (), {"remote": remote})})
+        return FakeLayout()
+
+    def inspect(self, conan_ref, attributes, remote_name):
+        with self.inspects.count():
+            if remote_name != "remote3":
+                self.release_slow_remotes.wait(5)
+            if remote_name not in ["remote1", "remote3"]:
+                raise Exception("Not found")
+            self.set_remote(ConanRef.loads(conan_ref), remote_name)
+
+
+def test_gather_and_repair_invalid_metadata(tmp_path: Path, mocker):
+    """
+    The metadata of all refs is read concurrently and only read again, if it has changed.
+    Repairing probes all remotes at once and stops at the first one, which has the ref.
+    """
+    conan_api = FakeMetadataApi(tmp_path, 100, 0.005)
+    mocker.patch("conan_explorer.app.conan_api", conan_api, create=True)
+    mocker.patch.object(ConanCleanup, "_metadata_remotes", {})
+
+    invalid_refs = ConanCleanup().gather_invalid_remote_metadata()
+    assert len(invalid_refs) == 50
+    assert "example0/1.0.0@user/testing" in invalid_refs
+    assert conan_api.metadata_loads.calls == 100
+    assert conan_api.metadata_loads.max_running > 1
+
+    # the last remote answers first - the slower ones are not waited for
+    assert ConanCleanup().repair_invalid_remote_metadata(invalid_refs[0]) == "remote3"
+    assert conan_api.inspects.running == 3
+    conan_api.release_slow_remotes.set()
+    deadline = time.monotonic() + 5
+    while conan_api.inspects.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # only the repaired metadata is read again
+    conan_api.metadata_loads = ConcurrencyCounter()
+    invalid_refs = ConanCleanup().gather_invalid_remote_metadata()
+    assert len(invalid_refs) == 49
+    assert "example0/1.0.0@user/testing" not in invalid_refs
+    assert conan_api.metadata_loads.calls == 1
+
+
 @pytest.mark.conanv1
 def test_repair_metadata(base_fixture):
     conan_install_ref(TEST_REF)
@@ -141,3 +141,62 @@ def test_write_config_file(base_fixture: PathSetup, ui_config_fixture: Path, tmp
     # can omit values, so test_dict is a superset of ref_dict
     # so test, that all all values from ref_dict are equal and the new ones are empty
     check_config(ref_dict, test_dict)
+
+
+def test_load_skips_validation_and_rewrite(base_fixture: PathSetup, tmp_path: Path, mocker):
+    """
+    Tests, that an unchanged file is validated only once and
+    that a file with the latest version is not rewritten on loading.
+    """
+    test_file = tmp_path / "app_config.json"
+    copyfile(str(base_fixture.testdata_path / "app_config.json"), str(test_file))
+    content = test_file.read_bytes()
+    validate_mock = mocker.spy(JsonUiConfig, "validate")
+
+    JsonUiConfig(test_file).load()
+    JsonUiConfig(test_file).load()
+    assert validate_mock.call_count == 1
+    assert test_file.read_bytes() == content  # not rewritten
+
+    # a changed file must be validated again
+    json_data = json.loads(content)
+    json_data["tabs"][0]["name"] = "Changed"
+    test_file.write_text(json.dumps(json_data))
+    tabs = JsonUiConfig(test_file).load().app_grid.tabs
+    assert validate_mock.call_count == 2
+    assert tabs[0].name == "Changed"
+
+
+def test_load_from_local_copy(base_fixture: PathSetup, tmp_path: Path, mocker):
+    """
+    Tests, that an unchanged file is loaded from the local copy
+    and that the local copy is updated, when the file changes or is saved.
+    """
+    test_file = tmp_path / "app_config.json"
+    copyfile(str(base_fixture.testdata_path / "app_config.json"), str(test_file))
+    local_copy_dir = tmp_path / "local"
+    local_copy_dir.mkdir()
+    read_file_mock = mocker.spy(JsonUiConfig, "_read_file")
+
+    config = JsonUiConfig(test_file, local_copy_dir).load()
+    assert read_file_mock.call_count == 1
+    assert len(list(local_copy_dir.iterdir())) == 1
+    tabs = JsonUiConfig(test_file, local_copy_dir).load().app_grid.tabs
+    assert read_file_mock.call_count == 1  # from local copy
+    assert tabs[0].name == "Basics"
+    assert tabs[0].apps[1].conan_options == {"shared": "True", "Option2": "Value2"}
+
+    # saving updates the local copy
+    config.app_grid.tabs[0].name = "Saved"
+    JsonUiConfig(test_file, local_copy_dir).save(config)
+    assert JsonUiConfig(test_file, local_copy_dir).load().app_grid.tabs[0].name == "Saved"
+    assert read_file_mock.call_count == 1
+
+    # changed from outside
+    json_data = json.loads(test_file.read_text())
+    json_data["tabs"][0]["name"] = "Changed outside"
+    test_file.write_text(json.dumps(json_data))
+    tabs = JsonUiConfig(test_file, local_copy_dir).load().app_grid.tabs
+    assert read_file_mock.call_count == 2
+    assert tabs[0].name == "Changed outside"
+    assert [path.name for path in tmp_path.glob("*.tmp")] == []
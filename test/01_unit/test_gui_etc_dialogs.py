@@ -3,9 +3,10 @@ Test the self written qt gui base, which can be instantiated without
 using the whole application (standalone).
 """
 import sys
+import time
 import traceback
 from pathlib import Path
-from test.conftest import TEST_REF, PathSetup, conan_install_ref
+from test.conftest import TEST_REF, ConcurrencyCounter, PathSetup, conan_install_ref
 from unittest.mock import Mock
 
 import pytest
@@ -402,3 +403,51 @@ def test_conan_remove_dialog(qtbot, mocker, ui_config_fixture, base_fixture):
     found_pkg = app.conan_api.find_best_matching_local_package(cfr)
     assert not found_pkg.get("id", "")
 
+
+class FakeRemoveApi():
+    """ Records concurrent removals - removing takes a while """
+
+    def __init__(self):
+        self.removed = []
+        self.removals = ConcurrencyCounter()
+
+    def remove_reference(self, conan_ref, pkg_id):
+        with self.removals.count(str(conan_ref)):
+            time.sleep(0.05)
+            self.removed.append((str(conan_ref), pkg_id))
+
+
+def test_conan_remove_dialog_batch(qtbot, mocker, base_fixture):
+    """
+    Different refs are removed concurrently, the pkgs of one ref one after another.
+    Unchecked items are not removed. The removed signal is emitted for every item
+    after all removals are finished. Count and freed size of the known sizes are returned.
+    """
+    fake_api = FakeRemoveApi()
+    mocker.patch.object(app, "conan_api", fake_api)
+    refs_with_pkg_ids = {f"example{i}/1.0.0@user/channel": ["pkg1", "pkg2"] for i in range(4)}
+    known_sizes_mb = {(conan_ref, pkg_id): 1.0
+                      for conan_ref, pkg_ids in refs_with_pkg_ids.items() for pkg_id in pkg_ids}
+    removed_signal = Mock()
+    removed_signal.emit.side_effect = lambda conan_ref, pkg_id: check.equal(
+        len(fake_api.removed), 7)  # all removed before the first signal
+    dialog = ConanRemoveDialog(None, refs_with_pkg_ids, removed_signal, known_sizes_mb)
+    dialog.item_list_widget.item(0).setCheckState(QtCore.Qt.CheckState.Unchecked)
+    dialog.loader = Mock()
+
+    removed_count, freed_mb = dialog.remove()
+    assert removed_count == 7
+    assert freed_mb == pytest.approx(7.0)
+    assert ("example0/1.0.0@user/channel", "pkg1") not in fake_api.removed
+    assert fake_api.removals.max_running > 1
+    assert not fake_api.removals.concurrent_same_key
+    assert removed_signal.emit.call_count == 7
+    dialog.loader.loading_string_signal.emit.assert_called_with(
+        "Removed 7/7 packages (7.0 MB freed)")
+
+    # without a known size no freed size is reported - the folders are not walked
+    dialog = ConanRemoveDialog(None, {"example0/1.0.0@user/channel": ["pkg1", ""]}, None,
+                               known_sizes_mb)
+    dialog.loader = Mock()
+    assert dialog.remove() == (2, None)
+    dialog.loader.loading_string_signal.emit.assert_called_with("Removed 2/2 packages")
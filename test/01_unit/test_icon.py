@@ -1,7 +1,20 @@
+import os
 import sys
+import threading
+import time
 from pathlib import Path
+from shutil import copy2
 
+from PySide6.QtCore import QModelIndex, Qt
+from PySide6.QtWidgets import QTreeView
+
+import conan_explorer.app as app
+from conan_explorer.settings import GUI_MODE, GUI_MODE_DARK
+from conan_explorer.ui.common import TreeModel, TreeModelItem
+from conan_explorer.ui.common import theming
 from conan_explorer.ui.common.icon import extract_icon
+from conan_explorer.ui.common.icon_loader import IconLoader
+from conan_explorer.ui.common.theming import get_themed_asset_icon
 
 
 def test_extract_icon_from_exe(tmp_path, qtbot):
@@ -23,3 +36,106 @@ def test_extract_icon_from_exe(tmp_path, qtbot):
     # non existant file -> null pointer icon
     icon = extract_icon(Path(tmp_path) / "nonexistant")
     assert icon.isNull()
+
+
+class IconTreeModel(TreeModel):
+
+    def __init__(self, rows: int):
+        super().__init__()
+        self.root_item = TreeModelItem(["Packages"])
+        for i in range(rows):
+            self.root_item.append_child(TreeModelItem([f"example{i}/1.0.0"], self.root_item))
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DecorationRole:
+            return get_themed_asset_icon("icons/global/linux.svg")
+        if role == Qt.ItemDataRole.DisplayRole:
+            return index.internalPointer().data(index.column())
+        return None
+
+
+def test_themed_icon_cache(qtbot, base_fixture, mocker):
+    """
+    Themed icons are created once per theme and are recolored in memory in dark mode.
+    Scrolling a tree with 5000 rows in dark mode does not recolor or write any icon.
+    """
+    app.active_settings.set(GUI_MODE, GUI_MODE_DARK)
+    write_mock = mocker.spy(Path, "write_bytes")
+    icon = get_themed_asset_icon("icons/global/linux.svg")
+    assert icon is get_themed_asset_icon("icons/global/linux.svg")
+    assert icon is not get_themed_asset_icon("icons/global/linux.svg", force_light_mode=True)
+    pixmap = icon.pixmap(32, 32)
+    assert pixmap.size().width() == 32
+    assert pixmap.toImage().pixelColor(16, 16).name() == "#ffffff"
+    assert icon.pixmap(32, 32).cacheKey() == pixmap.cacheKey()
+    write_mock.assert_not_called()
+
+    recolor_spy = mocker.spy(theming, "get_svg_icon_with_color")
+    model = IconTreeModel(5000)
+    view = QTreeView()
+    qtbot.addWidget(view)
+    view.setUniformRowHeights(True)
+    view.resize(400, 600)
+    view.setModel(model)
+    view.show()
+    qtbot.waitExposed(view)
+    assert model.rowCount(QModelIndex()) == 5000
+    scroll_bar = view.verticalScrollBar()
+    for value in range(0, scroll_bar.maximum(), max(1, scroll_bar.maximum() // 50)):
+        scroll_bar.setValue(value)
+        view.viewport().grab()  # repaint does not paint on the offscreen platform
+    view.close()
+    recolor_spy.assert_not_called()
+    write_mock.assert_not_called()
+    assert icon.pixmap(32, 32).cacheKey() == pixmap.cacheKey()
+
+
+def test_icon_loader(qtbot, base_fixture, tmp_path: Path, monkeypatch, mocker):
+    """
+    Icons are decoded in the background and passed to the callback in the GUI thread.
+    They are cached as thumbnails, which are invalidated by changing the file.
+    Executable icons are extracted only once.
+    """
+    monkeypatch.delenv("DISABLE_ASYNC_LOADER")
+    icon_file = tmp_path / "icon.ico"
+    copy2(str(app.asset_path / "icons" / "icon.ico"), str(icon_file))
+    cache_dir = tmp_path / "cache"
+    loader = IconLoader(cache_dir=cache_dir)
+    loaded = []
+
+    def load_icon(path: Path, extract=False):
+        loaded.clear()
+        loader.load_icon(path, extract,
+                         lambda icon: loaded.append((icon, threading.current_thread())))
+        qtbot.waitUntil(lambda: len(loaded) == 1)
+        assert loaded[0][1] is threading.main_thread()
+        return loaded[0][0]
+
+    decode_spy = mocker.spy(loader, "decode_image")
+    icon = load_icon(icon_file)
+    assert not icon.isNull()
+    assert len(list(cache_dir.glob("*.png"))) == 1
+    assert decode_spy.call_count == 1
+
+    # from thumbnail
+    assert not load_icon(icon_file).isNull()
+    assert decode_spy.call_count == 1
+
+    # changed file
+    os.utime(icon_file, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+    assert not load_icon(icon_file).isNull()
+    assert decode_spy.call_count == 2
+    assert len(list(cache_dir.glob("*.png"))) == 2
+
+    # extract from executable
+    extract_mock = mocker.patch("conan_explorer.ui.common.icon_loader.extract_icon",
+                                side_effect=extract_icon)
+    assert not load_icon(Path(sys.executable), extract=True).isNull()
+    qtbot.waitUntil(lambda: len(list(cache_dir.glob("*.png"))) == 3)
+    assert not load_icon(Path(sys.executable), extract=True).isNull()
+    assert extract_mock.call_count == 1
+
+    # not existing file
+    assert load_icon(tmp_path / "nonexistant.ico").isNull()
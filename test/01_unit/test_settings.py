@@ -1,11 +1,15 @@
 import configparser
+import gc
 import os
 import shutil
 import tempfile
+import time
+import weakref
 from pathlib import Path
 from test.conftest import PathSetup
 
 from conan_explorer.settings import *
+from conan_explorer.settings import ini_file
 from conan_explorer.settings.ini_file import PLUGINS_SECTION_NAME, IniSettings
 
 
@@ -67,3 +71,40 @@ def test_add__remove_setting():
     sets = IniSettings(Path(temp_ini_path))
     # node should still be there
     assert len(sets._values["TestNode"]) == 0
+
+
+def test_delayed_save(monkeypatch, mocker):
+    """
+    Tests, that with a save delay 1000 set calls are coalesced into one write
+    in the background, that nothing is lost on flush and that the settings
+    are not kept alive for the flush on exit.
+    """
+    monkeypatch.delenv("DISABLE_ASYNC_LOADER", raising=False)
+    temp_ini_path = Path(tempfile.mktemp())
+    write_mock = mocker.spy(ini_file, "write_file_atomically")
+    for save_delay_s, expected_writes in [(0.0, 1000), (10.0, 1)]:
+        sets = IniSettings(temp_ini_path, save_delay_s=save_delay_s)
+        write_mock.reset_mock()
+        for i in range(1000):
+            sets.set(FONT_SIZE, i)
+        sets.flush()
+        assert write_mock.call_count == expected_writes
+        assert IniSettings(temp_ini_path).get_int(FONT_SIZE) == 999
+    sets_ref = weakref.ref(sets)
+    del sets
+    gc.collect()
+    assert sets_ref() is None
+
+    sets = IniSettings(temp_ini_path, save_delay_s=0.1)
+    sets.set(LAST_CONFIG_FILE, "D:/file.ini")
+    sets.add("str_setting", "str_value", "TestNode")
+    assert IniSettings(temp_ini_path).get(LAST_CONFIG_FILE) != "D:/file.ini"  # not yet
+    start = time.monotonic()
+    while sets._save_timer is not None and time.monotonic() - start < 5:
+        time.sleep(0.05)
+    sets.flush()  # waits for a running write
+    read_sets = IniSettings(temp_ini_path)
+    assert read_sets.get(LAST_CONFIG_FILE) == "D:/file.ini"
+    assert read_sets.get_string("str_setting") == "str_value"
+    assert [path.name for path in temp_ini_path.parent.glob(temp_ini_path.name + "*.tmp")] == []
+    os.remove(temp_ini_path)
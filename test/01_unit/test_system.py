@@ -4,6 +4,7 @@ import stat
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 from pathlib import Path
 from shutil import rmtree
@@ -11,14 +12,18 @@ from subprocess import check_output
 from test.conftest import check_if_process_running, get_window_pid, is_ci_job
 
 import psutil
+import pytest
 
 import conan_explorer  # for mocker
+from conan_explorer.app import system
 from conan_explorer import INVALID_PATH, PKG_NAME
 from conan_explorer.app.system import (calc_paste_same_dir_name,
                                        copy_path_with_overwrite, delete_path,
                                        execute_app, find_program_in_windows,
-                                       open_cmd_in_path, open_file,
-                                       open_in_file_manager, run_file)
+                                       get_folder_size, get_folder_size_mb,
+                                       get_folder_sizes_mb, open_cmd_in_path,
+                                       open_file, open_in_file_manager, run_file,
+                                       submit_to_daemon_threads)
 
 
 def test_choose_run_file(tmp_path, mocker):
@@ -367,6 +372,88 @@ def test_delete():
     assert not test_dir.exists()
 
 
+def test_folder_size(tmp_path: Path, mocker):
+    """
+    1. Size of nested files, where symlinks are skipped and hard links are counted once
+    2. Cached size is used, until the folder is modified, unless uncached is requested
+    3. Sizes of multiple folders with progress and a bounded cache
+    """
+    # 1. Size of nested files
+    pkg_dir = tmp_path / "pkg"
+    (pkg_dir / "lib" / "sub").mkdir(parents=True)
+    (pkg_dir / "lib" / "a.so").write_bytes(b"0" * 1000)
+    (pkg_dir / "lib" / "sub" / "b.txt").write_bytes(b"0" * 24)
+    if platform.system() == "Linux":
+        os.link(pkg_dir / "lib" / "a.so", pkg_dir / "lib" / "a_link.so")
+        os.symlink(pkg_dir / "lib" / "a.so", pkg_dir / "lib" / "a_sym.so")
+        os.symlink(pkg_dir / "lib", pkg_dir / "lib_sym")
+    assert get_folder_size(pkg_dir) == 1024
+    assert get_folder_size(tmp_path / "not_existing") == 0
+
+    # 2. Cached size is used, until the folder is modified
+    assert get_folder_size_mb(pkg_dir) == 1024 / pow(1024, 2)
+    mock_size = mocker.patch("conan_explorer.app.system.get_folder_size", return_value=0)
+    assert get_folder_size_mb(pkg_dir) == 1024 / pow(1024, 2)
+    mock_size.assert_not_called()
+    time.sleep(0.01)
+    (pkg_dir / "new_file").write_bytes(b"0" * 1024)
+    assert get_folder_size_mb(pkg_dir) == 0
+    mock_size.assert_called_once()
+    assert get_folder_size_mb(pkg_dir, cached=False) == 0
+    assert mock_size.call_count == 2
+    mocker.stopall()
+
+    # 3. Sizes of multiple folders with progress
+    folders = []
+    for i in range(20):
+        folder = tmp_path / "pkgs" / str(i)
+        folder.mkdir(parents=True)
+        (folder / "file").write_bytes(b"0" * i)
+        folders.append(folder)
+    progress = []
+    mocker.patch("conan_explorer.app.system.FOLDER_SIZE_CACHE_MAX_ENTRIES", 5)
+    sizes = get_folder_sizes_mb(folders, lambda path, size: progress.append(path))
+    assert len(progress) == 20
+    assert sizes[folders[10]] == 10 / pow(1024, 2)
+    assert len(system._folder_size_cache) == 5
+
+
+def test_submit_to_daemon_threads():
+    """
+    The calls run in a bounded number of daemon threads and the futures keep the order
+    of the args. Cancelled futures are not started and a hanging call is not waited for.
+    """
+    release = threading.Event()
+    threads = set()
+
+    def call(arg):
+        threads.add(threading.current_thread())
+        if arg == "hanging":
+            release.wait(5)
+        if arg == "error":
+            raise ValueError(arg)
+        return arg * 2
+
+    try:
+        futures = submit_to_daemon_threads(call, ["hanging", 1, 2, "error", 3], 2, "test")
+        assert [future.result(5) for future in futures[1:3]] == [2, 4]
+        with pytest.raises(ValueError):
+            futures[3].result(5)
+        assert futures[4].result(5) == 6
+        assert not futures[0].done()
+        assert len(threads) == 2
+        assert all(thread.daemon for thread in threads)
+
+        # the only thread hangs - the next call is still pending
+        futures = submit_to_daemon_threads(call, ["hanging", 1], 1, "test")
+        assert futures[1].cancel()
+        release.set()
+        assert futures[0].result(5) == "hanginghanging"
+        assert futures[1].cancelled()
+    finally:
+        release.set()
+
+
 def test_find_program_in_registry():
 
     found_path = find_program_in_windows("Git", True)
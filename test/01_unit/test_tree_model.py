@@ -0,0 +1,87 @@
+import pytest
+from PySide6.QtCore import QModelIndex
+from PySide6.QtWidgets import QTreeView
+
+from conan_explorer.ui.common import TreeModel, TreeModelItem
+
+
+class ExampleTreeModel(TreeModel):
+
+    def __init__(self, refs: int, pkgs_per_ref: int):
+        super().__init__()
+        self.root_item = TreeModelItem(["Packages"])
+        for i in range(refs):
+            ref_item = TreeModelItem([f"example{i}/1.0.0@user/channel"], self.root_item)
+            self.root_item.append_child(ref_item)
+            self._items_by_key[ref_item.data(0)] = ref_item
+            for j in range(pkgs_per_ref):
+                ref_item.append_child(TreeModelItem([f"pkg{j}"], ref_item))
+
+    def data(self, index, role=0):
+        if not index.isValid() or role != 0:
+            return None
+        return index.internalPointer().data(index.column())
+
+
+def test_tree_model_rows(base_fixture):
+    """
+    The remembered rows stay correct, even if the child items are changed directly.
+    Items can be found by their key and their index can be created from the item.
+    """
+    model = ExampleTreeModel(10, 3)
+    ref_item = model.get_item_by_key("example5/1.0.0@user/channel")
+    assert ref_item and ref_item.row() == 5
+    model.root_item.child_items.pop(2)
+    model.root_item.child_items.insert(0, TreeModelItem(["new"], model.root_item))
+    assert ref_item.row() == 5
+    model.root_item.child_items.pop(0)
+    assert ref_item.row() == 4
+    pkg_item = ref_item.child_items[1]
+    index = model.get_index_from_item(pkg_item)
+    assert index.row() == 1 and index.internalPointer() is pkg_item
+    assert model.parent(index).internalPointer() is ref_item
+
+    model.remove_item(ref_item)
+    assert model.get_item_by_key("example5/1.0.0@user/channel") is None
+    assert not model.get_index_from_item(pkg_item).isValid()
+    with pytest.raises(ValueError):
+        ref_item.row()
+    assert not hasattr(ref_item, "__dict__")  # slots
+
+
+def test_tree_model_big_tree_rows(qtbot, base_fixture, mocker):
+    """
+    Build a tree with 50k nodes (10k refs with 4 packages). index() / parent() and
+    scrolling through the expanded view use the remembered rows without searching them.
+    After the child items are changed directly, the rows are updated once.
+    """
+    model = ExampleTreeModel(10000, 4)
+    update_rows_spy = mocker.spy(TreeModelItem, "update_child_rows")
+
+    def check_parents():
+        for ref_row in range(0, model.rowCount(QModelIndex()), 10):
+            ref_index = model.index(ref_row, 0, QModelIndex())
+            for pkg_row in range(model.rowCount(ref_index)):
+                pkg_index = model.index(pkg_row, 0, ref_index)
+                assert model.parent(pkg_index) == ref_index
+
+    check_parents()
+
+    view = QTreeView()
+    qtbot.addWidget(view)
+    view.setUniformRowHeights(True)
+    view.resize(400, 600)
+    view.setModel(model)
+    view.expandAll()
+    view.show()
+    qtbot.waitExposed(view)
+    scroll_bar = view.verticalScrollBar()
+    for value in range(0, scroll_bar.maximum(), max(1, scroll_bar.maximum() // 50)):
+        scroll_bar.setValue(value)
+        view.viewport().grab()  # repaint does not paint on the offscreen platform
+    view.close()
+    assert update_rows_spy.call_count == 0
+
+    model.root_item.child_items.insert(0, TreeModelItem(["new"], model.root_item))
+    check_parents()
+    assert update_rows_spy.call_count == 1
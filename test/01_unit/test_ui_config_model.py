@@ -1,3 +1,4 @@
+import json
 import sys
 from pathlib import Path
 from shutil import copy2
@@ -7,6 +8,8 @@ from conan_explorer import INVALID_PATH, asset_path
 from conan_unified_api.types import ConanRef
 from conan_explorer.conan_wrapper import ConanUnifiedApi
 from conan_explorer.settings import GUI_STYLE_MATERIAL
+from conan_explorer.ui.views.app_grid.config.json_file import JsonUiConfig
+from conan_explorer.ui.views.app_grid.config.model import UiApplicationModel
 from conan_explorer.ui.views.app_grid.model import (UiAppLinkConfig,
                                                     UiAppLinkModel)
 
@@ -98,3 +101,33 @@ def test_official_release(base_fixture: PathSetup):
     app_link.version = "1.1.0"
     assert app_link.channel == UiAppLinkModel.OFFICIAL_RELEASE
     assert app_link.conan_file_reference.user in [None, "_"]
+
+
+def test_delayed_save(
+    qtbot, base_fixture: PathSetup, ui_config_fixture: Path, monkeypatch, mocker
+):
+    """
+    Tests, that multiple edits are coalesced into one write in the background
+    and that flushing writes pending changes immediately.
+    """
+    monkeypatch.delenv("DISABLE_ASYNC_LOADER")
+    write_mock = mocker.spy(JsonUiConfig, "write")
+    model = UiApplicationModel().loadf(str(ui_config_fixture))
+    content = ui_config_fixture.read_text()
+
+    for i in range(10):
+        app_link = model.app_grid.tabs[0].apps[0]
+        app_link.name = f"App {i}"
+        app_link.save()
+    assert ui_config_fixture.read_text() == content  # not yet written
+    qtbot.waitUntil(lambda: write_mock.call_count == 1)
+    model.flush()
+    assert json.loads(ui_config_fixture.read_text())["tabs"][0]["apps"][0]["name"] == "App 9"
+
+    model.app_grid.tabs[0].name = "Flushed"
+    model.app_grid.save()
+    model.flush()
+    assert write_mock.call_count == 2
+    assert json.loads(ui_config_fixture.read_text())["tabs"][0]["name"] == "Flushed"
+    qtbot.wait(UiApplicationModel.SAVE_DELAY_MS + 100)
+    assert write_mock.call_count == 2  # nothing left to write
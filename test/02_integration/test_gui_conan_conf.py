@@ -1,7 +1,10 @@
 
 from test.conftest import (TEST_REF, TEST_REMOTE_NAME, TEST_REMOTE_URL,
-                           PathSetup, add_remote, login_test_remote,
+                           ConcurrencyCounter, PathSetup, add_remote, login_test_remote,
                            logout_all_remotes, remove_remote)
+import base64
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from time import sleep
 
 import pytest
@@ -17,6 +20,9 @@ from conan_explorer.ui import main_window
 from conan_explorer.ui.views.conan_conf import ConanConfigView
 from conan_explorer.ui.views.conan_conf.editable_model import EditableModel
 from conan_explorer.ui.views.conan_conf.profiles_model import ProfilesModel
+from conan_explorer.ui.views.conan_conf.remotes_controller import ConanRemoteController
+from conan_explorer.ui.views.conan_conf.remotes_model import RemotesTableModel
+from conan_unified_api.types import Remote
 
 Qt = QtCore.Qt
 
@@ -35,6 +41,141 @@ def start_main_and_switch_to_config_view(ui_no_refs_config_fixture, qtbot):
     return conan_conf_view, main_gui
 
 
+class FakeRemotesApi():
+    """
+    Stand-in for ConanUnifiedApi with a slow and an unreachable remote.
+    Their requests are held, until the test releases them.
+    """
+
+    def __init__(self):
+        self.remotes = [Remote("fast", "http://127.0.0.1:1", False, False),
+                        Remote("slow", "http://127.0.0.1:2", False, False),
+                        Remote("unreachable", "http://127.0.0.1:3", False, True)]
+        self.held_remotes = {"slow": threading.Event(), "unreachable": threading.Event()}
+        self.user_info_requests = 0
+
+    def get_remotes(self, include_disabled=False):
+        return self.remotes
+
+    def get_remote_user_info(self, remote_name: str):
+        self.user_info_requests += 1
+        if remote_name in self.held_remotes:
+            self.held_remotes[remote_name].wait()
+        return (f"user_{remote_name}", True)
+
+
+def test_remotes_model_user_info(qtbot, base_fixture, mocker, monkeypatch):
+    """
+    The remotes are shown immediately and the user infos are filled in concurrently.
+    An unreachable remote times out and the loaded user infos are shown on the next setup.
+    """
+    monkeypatch.delenv("DISABLE_ASYNC_LOADER")
+    conan_api = FakeRemotesApi()
+    mocker.patch("conan_explorer.app.conan_api", conan_api)
+    mocker.patch.object(RemotesTableModel, "USER_INFO_TIMEOUT_S", 1.0)
+
+    try:
+        model = RemotesTableModel()
+        load_thread = next(thread for thread in threading.enumerate()
+                           if thread.name == "remote_user_infos")
+        assert [item.name for item in model.items()] == ["fast", "slow", "unreachable"]
+        assert all(item.user == "" for item in model.items())
+        qtbot.waitUntil(lambda: model.items()[0].user == "user_fast")
+        assert model.items()[1].user == ""
+        conan_api.held_remotes["slow"].set()
+        qtbot.waitUntil(lambda: model.items()[1].user == "user_slow")
+        assert model.get_remote("unreachable") == conan_api.remotes[2]
+        # loading ends with the timeout, while the unreachable remote is still held
+        load_thread.join(5)
+        assert not load_thread.is_alive()
+        QtWidgets.QApplication.processEvents()
+        assert model.items()[2].user == ""
+    finally:
+        conan_api.held_remotes["unreachable"].set()
+
+    conan_api.remotes.pop(0)
+    model.setup_model_data()
+    assert [item.user for item in model.items()] == ["user_slow", ""]
+
+
+class StandInConanServer():
+    """
+    Local HTTP server, which answers the login requests of conan like an Artifactory server
+    with multiple remotes. Logins take some time, so that concurrent logins overlap.
+    """
+    LOGIN_LATENCY_S = 0.3
+    all_logins = ConcurrencyCounter()  # logins on all servers
+
+    def __init__(self, user: str, password: str):
+        server = self
+        self.logins = ConcurrencyCounter()  # logins on this server
+        credentials = base64.b64encode(f"{user}:{password}".encode()).decode()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if not self.path.endswith("/users/authenticate"):
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                with server.logins.count(), StandInConanServer.all_logins.count():
+                    sleep(server.LOGIN_LATENCY_S)
+                if self.headers.get("Authorization") != f"Basic {credentials}":
+                    self.send_response(401)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(b"stand_in_token")
+
+            def log_message(self, *args):
+                pass
+
+        self._http_server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._http_server.server_address[1]}/artifactory"
+        threading.Thread(target=self._http_server.serve_forever, daemon=True).start()
+
+    def shutdown(self):
+        self._http_server.shutdown()
+        self._http_server.server_close()
+
+
+@pytest.mark.conanv2
+def test_remotes_controller_batch_login(qtbot, base_fixture, monkeypatch):
+    """
+    Login to 3 remotes on each of 2 stand-in servers. The servers are logged in concurrently
+    and the other remotes of a server, after the first login succeeded.
+    With a wrong password every server only gets one login attempt.
+    """
+    servers = [StandInConanServer("demo", "demo"), StandInConanServer("demo", "demo")]
+    remote_names = [f"stand_in{i}_{j}" for i in range(2) for j in range(3)]
+    try:
+        for i, server in enumerate(servers):
+            for j in range(3):
+                app.conan_api.add_remote(f"stand_in{i}_{j}", f"{server.url}/api/conan/repo{j}",
+                                         False)
+        controller = ConanRemoteController(QtWidgets.QTreeView(), None)
+        model = controller._model
+
+        StandInConanServer.all_logins = ConcurrencyCounter()
+        controller.login_remotes(remote_names, "demo", "demo")
+        assert [server.logins.calls for server in servers] == [3, 3]
+        # the first login of a server runs alone, then the other 2 remotes at once
+        assert [server.logins.max_running for server in servers] == [2, 2]
+        assert StandInConanServer.all_logins.max_running == 4
+        qtbot.waitUntil(lambda: all(model.get_user_info(remote_name) == ("demo", True)
+                                    for remote_name in remote_names))
+        assert all(model._get_item(remote_name).user == "demo" for remote_name in remote_names)
+        assert app.conan_api.get_remote_user_info("stand_in1_2") == ("demo", True)
+
+        controller.login_remotes(remote_names, "demo", "wrong")
+        assert [server.logins.calls for server in servers] == [4, 4]
+    finally:
+        for remote_name in remote_names:
+            app.conan_api.remove_remote(remote_name)
+        for server in servers:
+            server.shutdown()
+
+
 @pytest.mark.conanv2
 def test_conan_config_view_remotes(qtbot, base_fixture: PathSetup, ui_no_refs_config_fixture, mocker):
     """
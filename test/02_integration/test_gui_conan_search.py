@@ -1,17 +1,22 @@
 
-from test.conftest import TEST_REF
+from test.conftest import TEST_REF, ConcurrencyCounter
 
 import random
+import time
 import string
+import threading
+from typing import Dict
 import pytest
 from PySide6 import QtCore
 
 import conan_explorer  # for mocker
 import conan_explorer.app as app
 from conan_unified_api.types import ConanRef
+from conan_explorer.conan_wrapper import ConanLocalPkgIndex, ConanRemoteQueryCache
 from conan_explorer.settings import FILE_EDITOR_EXECUTABLE
 from conan_explorer.ui.main_window import MainWindow
 from conan_explorer.ui.views import ConanSearchView, LocalConanPackageExplorer
+from conan_explorer.ui.views.conan_search.model import PkgSearchModel
 
 Qt = QtCore.Qt
 
@@ -74,7 +79,7 @@ def test_conan_search_view(qtbot, base_fixture, mock_clipboard, mocker):
     search_dialog._ui.search_button.clicked.emit()
 
     # wait for loading
-    search_dialog._search_controller._loader.wait_for_finished()
+    search_dialog._search_controller.wait_for_search_finished()
 
     # assert basic view
     model = search_dialog._search_controller._model
@@ -97,7 +102,7 @@ def test_conan_search_view(qtbot, base_fixture, mock_clipboard, mocker):
     ref_view_index = proxy_view_model.mapFromSource(index)
     search_dialog._ui.search_results_tree_view.expand(ref_view_index)
 
-    while not ref_item.child_items:
+    while ref_item.is_loading:
         _qapp_instance.processEvents()
 
     # check in child items that installed pkg id is highlighted
@@ -183,3 +188,203 @@ def test_conan_search_view(qtbot, base_fixture, mock_clipboard, mocker):
 
     search_dialog.hide()
     main_window.close()
+
+
+class FakeRemoteSearchApi():
+    """
+    Stand-in for ConanUnifiedApi, where every remote answers with its own delay.
+    Held remotes answer only after their event is set.
+    """
+
+    def __init__(self, remote_delays_s, remote_recipes):
+        self.remote_delays_s = remote_delays_s
+        self.remote_recipes = remote_recipes
+        self.local_refs = ["example/1.0.0@user/testing"]
+        self.held_remotes: Dict[str, threading.Event] = {}
+        self.remote_requests = ConcurrencyCounter()
+
+    def _query_remote(self, remote_name: str):
+        with self.remote_requests.count():
+            time.sleep(self.remote_delays_s[remote_name])
+            if remote_name in self.held_remotes:
+                self.held_remotes[remote_name].wait(5)
+
+    def search_recipes_in_remotes(self, query, remote_name="all"):
+        self._query_remote(remote_name)
+        if remote_name == "broken":
+            raise Exception("Remote not reachable")
+        return [ConanRef.loads(ref) for ref in self.remote_recipes[remote_name]]
+
+    def get_all_local_refs(self):
+        return [ConanRef.loads(ref) for ref in self.local_refs]
+
+    def get_local_pkgs_from_ref(self, conan_ref):
+        self.local_pkgs_calls = getattr(self, "local_pkgs_calls", 0) + 1
+        return [{"id": "pkg1"}]
+
+    def get_remote_pkgs_from_ref(self, conan_ref, remote):
+        self._query_remote(remote)
+        return [{"id": pkg_id, "settings": {"os": "Linux"}}
+                for pkg_id in self.remote_recipes[remote]]
+
+
+def patch_conan_api(mocker, fake_api):
+    """ Replace the conan api and the caches in front of it """
+    mocker.patch.object(app, "conan_api", fake_api)
+    mocker.patch.object(app, "remote_query_cache",
+                        ConanRemoteQueryCache(fake_api, app.active_settings))  # type: ignore
+    mocker.patch.object(app, "local_pkg_index", ConanLocalPkgIndex(fake_api))  # type: ignore
+
+
+def test_conan_search_installed_from_cli(qtbot, base_fixture, mocker):
+    """ Tests, that packages installed outside of the app are marked in the next search """
+    fake_api = FakeRemoteSearchApi({"remote1": 0}, {"remote1": ["example/2.0.0@user/testing"]})
+    patch_conan_api(mocker, fake_api)
+    model = PkgSearchModel()
+    model.setup_model_data("example", ["remote1"])
+    assert not model.root_item.child_items[0].is_installed
+
+    fake_api.local_refs.append("example/2.0.0@user/testing")  # installed from the CLI
+    model.setup_model_data("example", ["remote1"])
+    assert model.root_item.child_items[0].is_installed
+
+
+def test_conan_search_concurrent_remotes(qtbot, base_fixture, mocker, caplog):
+    """ Tests, that the search in multiple remotes:
+    - runs concurrently
+    - merges the results of all remotes with a stable remote order
+    - skips remotes with errors and remotes, which exceed the timeout
+    - can be cancelled
+    """
+    remote_delays_s = {"remote1": 0.5, "remote2": 0.3, "remote3": 0.4, "broken": 0.1}
+    remote_recipes = {
+        "remote1": ["example/1.0.0@user/testing", "example/2.0.0@user/testing"],
+        "remote2": ["example/2.0.0@user/testing"],
+        "remote3": ["example/2.0.0@user/testing", "example/3.0.0@user/testing"],
+    }
+    fake_api = FakeRemoteSearchApi(remote_delays_s, remote_recipes)
+    patch_conan_api(mocker, fake_api)
+    model = PkgSearchModel()
+    model.setup_model_data("example", list(remote_delays_s.keys()))
+    assert fake_api.remote_requests.max_running > 1
+
+    results = {item.data(0): item for item in model.root_item.child_items}
+    assert results["example/1.0.0@user/testing"].data(1) == "remote1"
+    assert results["example/1.0.0@user/testing"].is_installed
+    assert results["example/2.0.0@user/testing"].data(1) == "remote1,remote2,remote3"
+    assert not results["example/2.0.0@user/testing"].is_installed
+    assert results["example/3.0.0@user/testing"].data(1) == "remote3"
+    assert len(results) == 3
+
+    # held remote exceeds the timeout
+    mocker.patch.object(PkgSearchModel, "SEARCH_TIMEOUT_S", 1.0)
+    fake_api = FakeRemoteSearchApi({"remote1": 0, "remote2": 0}, remote_recipes)
+    fake_api.held_remotes["remote1"] = threading.Event()
+    patch_conan_api(mocker, fake_api)  # no cache
+    try:
+        model = PkgSearchModel()
+        model.setup_model_data("example", ["remote1", "remote2"])
+    finally:
+        fake_api.held_remotes["remote1"].set()
+    results = {item.data(0): item for item in model.root_item.child_items}
+    assert list(results.keys()) == ["example/2.0.0@user/testing"]
+    assert results["example/2.0.0@user/testing"].data(1) == "remote2"
+    assert "Search in remote1 timed out." in caplog.messages
+
+    # cancel before any remote answered
+    patch_conan_api(mocker, FakeRemoteSearchApi(remote_delays_s, remote_recipes))  # no cache
+    model = PkgSearchModel()
+    model.search_progress.connect(model.cancel_search)
+    model.setup_model_data("example", ["remote1"])
+    assert model.root_item.child_items[0].empty
+
+
+def test_conan_search_incremental_results(qtbot, base_fixture, mocker, monkeypatch):
+    """ Tests, that the results of a fast remote are shown, while a slow remote is still
+    searched and that the late results are merged into the already shown recipes.
+    """
+    monkeypatch.delenv("DISABLE_ASYNC_LOADER")
+    remote_delays_s = {"fast": 0.1, "slow": 0.1}
+    remote_recipes = {
+        "fast": ["example/1.0.0@user/testing"],
+        "slow": ["example/1.0.0@user/testing", "example/2.0.0@user/testing"],
+    }
+    fake_api = FakeRemoteSearchApi(remote_delays_s, remote_recipes)
+    fake_api.held_remotes["slow"] = threading.Event()
+    patch_conan_api(mocker, fake_api)
+    model = PkgSearchModel()
+    inserted_rows = []
+    model.rowsInserted.connect(
+        lambda parent, first, last: inserted_rows.append(last - first + 1)
+    )
+    model.start_search("example", ["slow", "fast"])
+    assert model.is_searching
+    # status item is shown while searching
+    assert model.root_item.child_items[0].empty
+
+    qtbot.waitUntil(lambda: model.get_item_from_ref("example/1.0.0@user/testing") is not None)
+    assert model.is_searching
+    assert model.proxy_model.rowCount() == 2  # status item + first result
+
+    fake_api.held_remotes["slow"].set()
+    model.wait_for_search_finished()
+    assert inserted_rows == [1, 1]
+    results = {item.data(0): item for item in model.root_item.child_items}
+    assert len(results) == 2
+    assert results["example/1.0.0@user/testing"].data(1) == "slow,fast"
+    assert results["example/1.0.0@user/testing"].is_installed
+    assert results["example/2.0.0@user/testing"].data(1) == "slow"
+
+
+def test_conan_search_concurrent_pkg_listing(qtbot, base_fixture, mocker, monkeypatch):
+    """ Tests, that expanding a recipe:
+    - does not block and shows a placeholder, until the packages are loaded
+    - lists the packages of all remotes concurrently and merges them by id
+    - looks up the installed packages only once
+    """
+    monkeypatch.delenv("DISABLE_ASYNC_LOADER")
+    remote_delays_s = {"remote1": 0.3, "remote2": 0.2, "remote3": 0.1}
+    remote_pkgs = {"remote1": ["pkg1", "pkg2"], "remote2": ["pkg2"], "remote3": ["pkg3"]}
+    fake_api = FakeRemoteSearchApi(remote_delays_s, remote_pkgs)
+    release_remotes = threading.Event()
+    fake_api.held_remotes = {remote: release_remotes for remote in remote_delays_s}
+    patch_conan_api(mocker, fake_api)
+    model = PkgSearchModel()
+    model._add_search_results("remote1,remote2,remote3",
+                              [(ConanRef.loads("example/1.0.0@user/testing"), True)])
+    ref_item = model.get_item_from_ref("example/1.0.0@user/testing")
+    assert ref_item
+    ref_index = model.get_index_from_item(ref_item)
+    assert model.canFetchMore(ref_index)
+
+    model.fetchMore(ref_index)
+    assert not model.canFetchMore(ref_index)
+    assert ref_item.is_loading
+    assert model.rowCount(ref_index) == 1
+    assert ref_item.child_items[0].empty  # placeholder
+
+    # all remotes are listed at the same time
+    qtbot.waitUntil(lambda: fake_api.remote_requests.max_running == len(remote_delays_s))
+    release_remotes.set()
+    qtbot.waitUntil(lambda: not ref_item.is_loading)
+    assert fake_api.local_pkgs_calls == 1
+    assert model.rowCount(ref_index) == 3
+    pkgs = {item.data(0): item for item in ref_item.child_items}
+    assert pkgs["pkg1"].data(1) == "remote1"
+    assert pkgs["pkg1"].is_installed
+    assert pkgs["pkg2"].data(1) == "remote1,remote2"
+    assert not pkgs["pkg2"].is_installed
+    assert pkgs["pkg3"].data(1) == "remote3"
+
+    # packages, which arrive after the recipe was removed by a new search, are discarded
+    new_ref = ConanRef.loads("example/2.0.0@user/testing")
+    model._add_search_results("remote1", [(new_ref, False)])
+    ref_item = model.get_item_from_ref("example/2.0.0@user/testing")
+    assert ref_item
+    model.fetchMore(model.get_index_from_item(ref_item))
+    model._init_search(["remote1"])
+    inserted_rows = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted_rows.append(first))
+    qtbot.wait(1000)
+    assert inserted_rows == []
+    assert ref_item.child_items[0].empty  # placeholder was not replaced
@@ -1,6 +1,8 @@
 import os
 import platform
+import sqlite3
 from pathlib import Path
+from threading import Event
 from time import sleep
 from typing import Generator, Tuple
 
@@ -15,12 +17,14 @@ import conan_explorer  # for mocker
 import conan_explorer.app as app  # using global module pattern
 from conan_explorer import conan_version
 from conan_explorer.app.system import delete_path
+from conan_explorer.conan_wrapper import ConanLocalPkgIndex
 from conan_explorer.settings import FILE_EDITOR_EXECUTABLE
 from conan_explorer.ui import main_window
 from conan_explorer.ui.views import LocalConanPackageExplorer
 from conan_explorer.ui.views.app_grid.tab import AppEditDialog
+from conan_explorer.ui.views.package_explorer.cache_watcher import ConanCacheWatcher
 from conan_explorer.ui.views.package_explorer.file_controller import NEW_FOLDER_NAME
-from conan_explorer.ui.views.package_explorer.sel_model import PkgSelectionType
+from conan_explorer.ui.views.package_explorer.sel_model import PkgSelectionType, PkgSelectModel
 from test.conftest import (
     TEST_REF,
     PathSetup,
@@ -344,11 +348,297 @@ def test_sizes_calculation(
     conan_install_ref(TEST_REF, profile="windows")
     lpe.on_show_sizes()
     assert not lpe._pkg_sel_ctrl._view.isColumnHidden(1)
+    qtbot.waitUntil(lambda: not lpe._pkg_sel_ctrl._model.is_calculating_sizes)
     row = lpe._pkg_sel_ctrl.find_item_in_pkg_sel_model(TEST_REF)
     size = lpe._pkg_sel_ctrl._model.index(row, 1, QtCore.QModelIndex()).data(0)
     assert float(size) > 0.05
 
 
+class FakeLocalPkgsApi():
+    """
+    Stand-in for ConanUnifiedApi with package folders in a temporary directory
+    in the Conan 1 layout: name/version/user/channel
+    """
+
+    def __init__(self, base_path: Path, pkg_sizes):
+        self.base_path = base_path
+        self.pkg_sizes = pkg_sizes  # conan_ref -> {pkg_id: size}
+        for conan_ref, sizes in pkg_sizes.items():
+            self.get_export_folder(conan_ref).mkdir(parents=True)
+            for pkg_id, size in sizes.items():
+                pkg_folder = self.get_package_folder(conan_ref, pkg_id)
+                pkg_folder.mkdir(parents=True)
+                (pkg_folder / "lib").write_bytes(b"0" * size)
+
+    def get_all_local_refs(self):
+        return [ConanRef.loads(conan_ref) for conan_ref in self.pkg_sizes]
+
+    def get_storage_path(self):
+        return self.base_path
+
+    def get_editable_references(self):
+        return []
+
+    def get_export_folder(self, conan_ref):
+        return self.base_path / str(conan_ref).replace("@", "/") / "export"
+
+    def get_package_folder(self, conan_ref, pkg_id):
+        return self.get_export_folder(conan_ref).parent / "package" / pkg_id
+
+    def get_local_pkgs_from_ref(self, conan_ref):
+        return [{"id": pkg_id, "settings": {}, "options": {}, "requires": []}
+                for pkg_id in self.pkg_sizes[str(conan_ref)]]
+
+
+def test_sizes_calculation_incremental(
+    qtbot, base_fixture, tmp_path: Path, mocker, monkeypatch
+):
+    """
+    Sizes are calculated in the background and inserted item by item.
+    The sizes of not yet loaded packages are applied, when the ref is expanded.
+    The size column is sorted numerically.
+    """
+    monkeypatch.delenv("DISABLE_ASYNC_LOADER")
+    pkg_sizes = {"example/1.0.0@user/testing": {"pkg1": 9 * 1024, "pkg2": 1024},
+                 "example/2.0.0@user/testing": {"pkg1": 100 * 1024}}
+    fake_api = FakeLocalPkgsApi(tmp_path, pkg_sizes)
+    mocker.patch.object(app, "conan_api", fake_api)
+    mocker.patch.object(app, "local_pkg_index", ConanLocalPkgIndex(fake_api))  # type: ignore
+    model = PkgSelectModel()
+    model.setup_model_data()
+    first_ref_item = model.root_item.child_items[0]
+    first_ref_item.load_children()
+    changed_rows = []
+    model.dataChanged.connect(lambda top_left, bottom_right: changed_rows.append(top_left))
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+
+    model.start_size_calculation()
+    qtbot.waitUntil(lambda: not model.is_calculating_sizes)
+    assert not resets
+    assert len(changed_rows) == 5 + 3  # ref for every pkg and export + loaded pkgs
+    assert first_ref_item.size_mb == 10 / 1024
+    assert first_ref_item.child_items[1].size_mb == 9 / 1024
+    assert first_ref_item.child_items[1].data(1) == f"{9 / 1024:.3f}"
+
+    # sizes are applied to lazy loaded packages
+    second_ref_item = model.root_item.child_items[1]
+    second_ref_item.load_children()
+    assert second_ref_item.child_items[1].size_mb == 100 / 1024
+
+    # calculated sizes are reused for the freed size of a removal
+    assert model.get_calculated_size_mb("example/1.0.0@user/testing", "pkg2") == 1 / 1024
+    assert model.get_calculated_size_mb("example/1.0.0@user/testing", "") == pytest.approx(
+        10 / 1024)
+    assert model.get_calculated_size_mb("example/1.0.0@user/testing", "pkg3") is None
+
+    # numerical sort - string sort would put "0.098" before "0.010"
+    model.proxy_model.sort(1, Qt.SortOrder.AscendingOrder)
+    first_index = model.proxy_model.index(0, 0, QtCore.QModelIndex())
+    assert model.proxy_model.mapToSource(first_index).internalPointer() == first_ref_item
+
+    # second start does not add the sizes again
+    model.start_size_calculation()
+    assert first_ref_item.size_mb == 10 / 1024
+
+    # only the sizes of added refs and packages are calculated
+    model.show_sizes = True
+    new_ref = "example/3.0.0@user/testing"
+    for conan_ref, pkg_id in [(new_ref, "pkg1"), ("example/1.0.0@user/testing", "pkg3")]:
+        pkg_folder = fake_api.get_package_folder(conan_ref, pkg_id)
+        pkg_folder.mkdir(parents=True)
+        (pkg_folder / "lib").write_bytes(b"0" * 2 * 1024)
+        pkg_sizes.setdefault(conan_ref, {})[pkg_id] = 2 * 1024
+    calculated = []
+    model._size_calculated.connect(
+        lambda generation, conan_ref, size_key, size: calculated.append((conan_ref, size_key)))
+    model.update_from_local_cache({"example/1.0.0@user/testing"})
+    qtbot.waitUntil(lambda: not model.is_updating and not model.is_calculating_sizes)
+    assert sorted(calculated) == [
+        ("example/1.0.0@user/testing", "pkg3"), (new_ref, "export"), (new_ref, "pkg1")]
+    assert first_ref_item.size_mb == pytest.approx(12 / 1024)
+    assert model.get_item_by_key(new_ref).size_mb == pytest.approx(2 / 1024)
+
+
+def test_package_filter(base_fixture, tmp_path: Path, mocker):
+    """
+    A matching ref shows all of its packages, a matching package shows its ref.
+    Wildcards can be used, case is ignored. The matches of a query are remembered
+    and only they are checked again, when the query gets longer.
+    """
+    pkg_sizes = {"example/1.0.0@user/testing": {"pkg1": 1, "pkg2": 1},
+                 "other/1.0.0@user/testing": {"pkg1": 1},
+                 "otherlib/2.0.0@user/testing": {}}
+    fake_api = FakeLocalPkgsApi(tmp_path, pkg_sizes)
+    mocker.patch.object(app, "conan_api", fake_api)
+    mocker.patch.object(app, "local_pkg_index", ConanLocalPkgIndex(fake_api))  # type: ignore
+    model = PkgSelectModel()
+    model.setup_model_data()
+    model.root_item.child_items[0].load_children()
+    proxy_model = model.proxy_model
+    root_index = QtCore.QModelIndex()
+
+    def visible_refs():
+        return [proxy_model.index(row, 0, root_index).data()
+                for row in range(proxy_model.rowCount(root_index))]
+
+    proxy_model.set_filter_query("OTHER")
+    assert visible_refs() == ["other/1.0.0@user/testing", "otherlib/2.0.0@user/testing"]
+    proxy_model.set_filter_query("otherl")
+    assert proxy_model._matches_by_query["otherl"] == [  # only matches of "other" checked
+        item for item in proxy_model._matches_by_query["other"] if "otherl" in item[1]]
+    assert visible_refs() == ["otherlib/2.0.0@user/testing"]
+    # not loaded ref keeps its dummy item, to be expandable
+    assert proxy_model.rowCount(proxy_model.index(0, 0, root_index)) == 1
+
+    proxy_model.set_filter_query("*/1.?.0@")
+    assert visible_refs() == ["example/1.0.0@user/testing", "other/1.0.0@user/testing"]
+    example_index = proxy_model.index(0, 0, root_index)
+    assert proxy_model.rowCount(example_index) == 3  # export and both packages
+
+    # package matches - only the package and its ref are shown
+    proxy_model.set_filter_query("export")
+    assert visible_refs() == ["example/1.0.0@user/testing"]
+    assert proxy_model.rowCount(proxy_model.index(0, 0, root_index)) == 1
+
+    proxy_model.set_filter_query("*")
+    assert len(visible_refs()) == 3
+
+
+def test_local_cache_watcher_update(qtbot, base_fixture, tmp_path: Path, mocker):
+    """
+    Changes in the storage path are detected by the watcher and only the changed
+    refs and packages are read again and inserted or removed - the existing items are kept.
+    """
+    pkg_sizes = {"example/1.0.0@user/testing": {"pkg1": 1024},
+                 "example/2.0.0@user/testing": {"pkg1": 1024}}
+    fake_api = FakeLocalPkgsApi(tmp_path, pkg_sizes)
+    mocker.patch.object(app, "conan_api", fake_api)
+    mocker.patch.object(app, "local_pkg_index", ConanLocalPkgIndex(fake_api))  # type: ignore
+    model = PkgSelectModel()
+    model.setup_model_data()
+    first_ref_item = model.root_item.child_items[0]
+    first_ref_item.load_children()
+    mocker.patch.object(ConanCacheWatcher, "USE_CACHE_DATABASE", False)
+    watcher = ConanCacheWatcher(None, fake_api.get_storage_path())
+    assert not watcher.check_for_changes()  # first snapshot
+    assert not watcher.check_for_changes()
+
+    # install a new ref and a new package, remove a ref
+    new_ref = "example/3.0.0@user/testing"
+    fake_api.get_package_folder(new_ref, "pkg1").mkdir(parents=True)
+    fake_api.get_package_folder("example/1.0.0@user/testing", "pkg2").mkdir()
+    delete_path(fake_api.get_export_folder("example/2.0.0@user/testing").parent)
+    pkg_sizes[new_ref] = {"pkg1": 0}
+    pkg_sizes["example/1.0.0@user/testing"]["pkg2"] = 0
+    pkg_sizes.pop("example/2.0.0@user/testing")
+    changed_refs = watcher.check_for_changes()
+    assert changed_refs == {new_ref, "example/1.0.0@user/testing", "example/2.0.0@user/testing"}
+
+    read_pkgs_spy = mocker.spy(fake_api, "get_local_pkgs_from_ref")
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    removed = []
+    model.rowsAboutToBeRemoved.connect(lambda parent, first, last: removed.append(first))
+    model.update_from_local_cache(changed_refs)
+    assert sorted(str(call.args[0]) for call in read_pkgs_spy.call_args_list) == [
+        "example/1.0.0@user/testing", new_ref]
+    assert not model.is_updating
+    assert not resets
+    assert removed == [1]
+    assert inserted == [(1, 1), (2, 2)]  # new ref and new package
+    assert model.root_item.child_items[0] is first_ref_item
+    assert model.root_item.child_items[1].data(0) == new_ref
+    assert [item.get_size_key() for item in first_ref_item.child_items] == [
+        "export", "pkg1", "pkg2"]
+
+    # nothing changed - nothing to do
+    model.update_from_local_cache()
+    assert len(inserted) == 2 and len(removed) == 1
+
+    # removals of the remove dialog are applied at once
+    model.remove_pkgs([(new_ref, ""), ("example/1.0.0@user/testing", "pkg1")])
+    assert removed == [1, 1, 1]  # new ref, pkg1 of first ref
+    assert not resets
+    assert model.get_item_by_key(new_ref) is None
+    assert [item.get_size_key() for item in first_ref_item.child_items] == ["export", "pkg2"]
+
+
+def test_local_cache_watcher_database(base_fixture, tmp_path: Path, mocker):
+    """
+    With the Conan V2 cache database, added or removed revisions and packages
+    are reported with their ref - other refs are not.
+    """
+    mocker.patch.object(ConanCacheWatcher, "USE_CACHE_DATABASE", True)
+    with sqlite3.connect(tmp_path / "cache.sqlite3") as connection:
+        connection.execute("CREATE TABLE recipes (reference, rrev, path, timestamp, lru)")
+        connection.execute(
+            "CREATE TABLE packages (reference, rrev, pkgid, prev, path, timestamp, "
+            "build_id, lru)"
+        )
+        connection.execute(
+            "INSERT INTO recipes VALUES ('example/1.0.0', 'rrev1', 'r1', 0, 0), "
+            "('example/2.0.0@user/testing', 'rrev1', 'r2', 0, 0)"
+        )
+    connection.close()
+    watcher = ConanCacheWatcher(None, tmp_path)
+    assert not watcher.check_for_changes()  # first snapshot
+
+    with sqlite3.connect(tmp_path / "cache.sqlite3") as connection:
+        connection.execute(
+            "INSERT INTO packages VALUES ('example/1.0.0', 'rrev1', 'pkg1', 'prev1', 'b/p1', "
+            "0, NULL, 0)"
+        )
+    connection.close()
+    assert watcher.check_for_changes() == {"example/1.0.0"}
+
+    with sqlite3.connect(tmp_path / "cache.sqlite3") as connection:
+        connection.execute("DELETE FROM recipes WHERE reference = 'example/2.0.0@user/testing'")
+    connection.close()
+    assert watcher.check_for_changes() == {"example/2.0.0@user/testing"}
+    assert not watcher.check_for_changes()
+
+
+def test_local_cache_watcher_stop_does_not_block(qtbot, base_fixture, tmp_path: Path, mocker):
+    """
+    Stopping the watcher does not wait for a running check and its result is discarded.
+    """
+    mocker.patch.object(ConanCacheWatcher, "USE_CACHE_DATABASE", False)
+    watcher = ConanCacheWatcher(None, tmp_path, poll_interval_s=0.01)
+    watcher.check_for_changes()  # first snapshot
+    (tmp_path / "example").mkdir()
+
+    snapshot_started = Event()
+    release_snapshot = Event()
+    take_snapshot = watcher.take_snapshot
+
+    def held_snapshot():
+        snapshot_started.set()
+        release_snapshot.wait()
+        return take_snapshot()
+
+    mocker.patch.object(watcher, "take_snapshot", held_snapshot)
+    changes = []
+    watcher.cache_changed.connect(changes.append)
+    watch_thread = None
+    try:
+        watcher.start()
+        watch_thread = watcher._watch_thread
+        assert snapshot_started.wait(5)
+        watcher.stop()  # returns while the snapshot is still held
+        assert not watcher.is_running
+        assert watch_thread is not None and watch_thread.is_alive()
+    finally:
+        release_snapshot.set()
+    assert watch_thread is not None
+    watch_thread.join(5)
+    assert not watch_thread.is_alive()
+    qtbot.wait(10)
+    assert not changes
+
+
 @pytest.mark.conanv2
 def test_local_package_explorer_tabs(
     qtbot,
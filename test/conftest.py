@@ -10,7 +10,7 @@ from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 from subprocess import CalledProcessError, check_output
-from threading import Thread
+from threading import Lock, Thread
 from typing import Generator
 from unittest import mock
 
@@ -22,7 +22,8 @@ import conan_explorer.app as app  # resolve circular dependencies
 from conan_explorer import SETTINGS_FILE_NAME, base_path, conan_version, user_save_path
 from conan_explorer.app.system import str2bool
 from conan_explorer.conan_wrapper import ConanApiFactory as ConanApi
-from conan_explorer.conan_wrapper import ConanInfoCache, ConanWorker
+from conan_explorer.conan_wrapper import (ConanInfoCache, ConanLocalPkgIndex,
+                                          ConanRemoteQueryCache, ConanWorker)
 from conan_explorer.settings import *
 from conan_explorer.ui.common import remove_qt_logger
 from conan_explorer.ui.main_window import MainWindow
@@ -62,6 +63,38 @@ class PathSetup:
         self.testdata_path = self.test_path / "testdata"
 
 
+class ConcurrencyCounter:
+    """
+    Counts the calls of a fake api, which run at the same time. To be used around the
+    simulated work: with counter.count(conan_ref): ...
+    Calls with the same key, which overlap, are flagged.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0  # most calls seen at the same time
+        self.concurrent_same_key = False
+        self._running_keys = set()
+        self._lock = Lock()
+
+    @contextmanager
+    def count(self, key=""):
+        with self._lock:
+            if key and key in self._running_keys:
+                self.concurrent_same_key = True
+            self._running_keys.add(key)
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.running -= 1
+                self._running_keys.discard(key)
+
+
 def check_if_process_running(
     process_name, cmd_contains=[], kill=False, cmd_narg=1, timeout_s=10
 ) -> bool:
@@ -356,6 +389,8 @@ def base_fixture() -> Generator[PathSetup, None, None]:
     app.conan_api = ConanApi()
     app.conan_api.init_api()
     app.conan_worker = ConanWorker(app.conan_api, app.active_settings)
+    app.remote_query_cache = ConanRemoteQueryCache(app.conan_api, app.active_settings)
+    app.local_pkg_index = ConanLocalPkgIndex(app.conan_api)
 
     yield paths
     # Teardown
@@ -376,6 +411,8 @@ def base_fixture() -> Generator[PathSetup, None, None]:
 
     # reset singletons
     app.conan_worker = None
+    app.remote_query_cache = None
+    app.local_pkg_index = None
     app.conan_api = None
     app.active_settings = None
 